@@ -0,0 +1,411 @@
+# bench_org_chart.py
+# -*- coding: utf-8 -*-
+"""
+Organizasyon şeması performans ölçümleri (sentetik veriyle).
+
+    python bench_org_chart.py --rows 100000
+
+    python bench_org_chart.py --model 10000 100000 1000000
+
+    python bench_org_chart.py --suite 1000 10000 100000 --depth 8 --json sonuc.json
+    python bench_org_chart.py --suite 1000 10000 100000 --depth 8 --compare onceki.json
+
+    python bench_org_chart.py --startup
+
+Ölçülenler: tablo yükleme (CSV) ve departman filtresi; model (bellek/süre).
+"önce" sütunları eski astype/replace + iterrows ve dict-of-dataclass yolunun
+birebir kopyasıdır.
+
+--suite: boru hattının her aşaması ayrı ölçülür (load_table, build_people,
+build_tree, compute_layout, sahne, görünüm render'ı, draw_chart, save_png,
+save_pdf, vektör export_pdf, _pil_to_tk). Tam görüntü aşamaları --max-pixels
+bütçesine ve IMAGE_MAX_SIDE kenar sınırına sığacak ölçekte çizilir (ölçek sonuca
+yazılır); export_pdf sahneyi 1.0 ölçekte yazar; _pil_to_tk ekran (Tk) yoksa atlanır.
+Hata veren aşama olursa çıkış kodu 1'dir. Sonuçlar --json ile makinece okunur biçimde yazılır;
+--compare önceki bir sonuç dosyasıyla karşılaştırıp yavaşlayan aşamaları bildirir
+(varsa çıkış kodu 1). Aynı parametreler (seed dahil) aynı tabloyu üretir.
+
+--startup: uygulama yeni bir süreçte açılır; süreç başlangıcından pencerenin ilk
+çizimine kadar geçen süre STARTUP_TARGET_S ile karşılaştırılır (aşılırsa çıkış kodu 1).
+Ekran yoksa pencere yerine org_chart_app'in içe aktarılması ölçülür. Pencereden önce
+yüklenmemesi gereken modüller tests/test_startup.py'de denetlenir.
+"""
+
+import os, sys, json, time, random, platform, tempfile, argparse, subprocess, tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import pandas as pd
+import PIL
+
+import org_chart_core
+from org_chart_core import (
+    REQ_COLS, ChartScene, load_table, build_people, build_tree, compute_layout, layout_forest, draw_chart,
+    save_png, save_pdf,
+)
+from org_chart_vector import export_pdf
+
+try:
+    import resource   # tepe RSS (Unix); Windows'ta yok
+except ImportError:
+    resource = None
+
+def make_table(rows: int, fanout: int = 6, depts: int = 40, titles: int = 120, seed: int = 7,
+               depth: Optional[int] = None) -> pd.DataFrame:
+    """
+    REQ_COLS şemasında sentetik personel tablosu. Ağaç genişlik öncelikli dolar (her
+    yönetici ~fanout kişi); depth verilirse en çok depth düzey olur, taşan kişiler son
+    yönetici düzeyine sırayla dağıtılır (alt düzeyler genişler).
+    """
+    rnd = random.Random(seed)
+    users = [f"user{i:07d}" for i in range(rows)]
+    level, pool = [0] * rows, None
+    data = {c: [] for c in REQ_COLS}
+    for i, u in enumerate(users):
+        mgr = ""
+        if i and (depth is None or depth > 1):
+            p = (i-1)//fanout
+            if depth is not None and level[p] + 1 >= depth:
+                if pool is None: pool = [j for j in range(i) if level[j] == depth - 2]
+                p = pool[i % len(pool)]
+            level[i] = level[p] + 1; mgr = users[p]
+        data["Kullanıcı Adı"].append(u)
+        data["Ad Soyad"].append(f"Ad{i} Soyad{rnd.randrange(10**6)}")
+        data["Departman"].append(f"Departman {i % depts:02d}")
+        data["Pozisyon"].append(f"Pozisyon {rnd.randrange(titles):03d}")
+        data["Üst Kademe"].append(mgr)
+        data["Mail"].append(f"{u}@firma.com")
+    return pd.DataFrame(data)
+
+# ---- eski yol (karşılaştırma için) ----
+@dataclass
+class _LegacyPerson:
+    username: str
+    full_name: str
+    dept: str
+    title: str
+    manager: Optional[str]
+    mail: str
+
+def _legacy_load_table(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    for c in REQ_COLS:
+        df[c] = df[c].astype(str).str.strip().replace({"nan":None,"None":None,"":None})
+    return df[REQ_COLS].copy()
+
+def _s(v) -> str:
+    return v.strip() if isinstance(v, str) else ""
+
+def _legacy_build_people(df: pd.DataFrame, dept=None):
+    if dept and dept != "Tümü": df = df.loc[df["Departman"]==dept].copy()
+    out = {}
+    for _,r in df.iterrows():
+        u = _s(r["Kullanıcı Adı"])
+        if not u or u.lower()=="none": continue
+        out[u] = _LegacyPerson(username=u, full_name=_s(r["Ad Soyad"]), dept=_s(r["Departman"]), title=_s(r["Pozisyon"]),
+                        manager=(_s(r["Üst Kademe"]) or None), mail=_s(r["Mail"]))
+    return out
+
+def _legacy_build_tree(people):
+    children = {u:[] for u in people}
+    has_mgr = set()
+    for u,p in people.items():
+        if p.manager and p.manager in people:
+            children[p.manager].append(u); has_mgr.add(u)
+    for k in children: children[k].sort(key=lambda x: people[x].full_name.lower())
+    roots = [u for u in people if u not in has_mgr]; roots.sort(key=lambda x: people[x].full_name.lower())
+    return children, roots
+
+def timed(fn, *a, **kw):
+    t = time.perf_counter(); out = fn(*a, **kw)
+    return out, time.perf_counter() - t
+
+def bench_load(rows: int, switches: int = 5):
+    df = make_table(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "personel.csv")
+        df.to_csv(path, index=False)
+        old_df, t_old_load = timed(_legacy_load_table, path)
+        new_df, t_new_load = timed(load_table, path)
+
+    depts = sorted({d for d in new_df["Departman"] if d})[:switches]
+    _, t_old_all = timed(_legacy_build_people, old_df)
+    _, t_old_flt = timed(lambda: [_legacy_build_people(old_df, d) for d in depts])
+
+    everyone, t_group = timed(build_people, new_df)
+    # ilk ziyarette alt model + ağaç kurulur; sonraki değişimler sözlük araması
+    _, t_new_flt = timed(lambda: [build_tree(everyone.subset(everyone.dept_members(d))) for d in depts])
+
+    print(f"{rows} satır, {len(depts)} departman değişimi")
+    print(f"{'adım':<28}{'önce (s)':>12}{'sonra (s)':>12}")
+    print(f"{'load_table (CSV)':<28}{t_old_load:>12.3f}{t_new_load:>12.3f}")
+    print(f"{'build_people (tümü)':<28}{t_old_all:>12.3f}{t_group:>12.3f}")
+    print(f"{'departman filtresi':<28}{t_old_flt:>12.3f}{t_new_flt:>12.6f}")
+    assert len(everyone) == rows
+
+def _measure(fn):
+    """(sonuç, süre, tutulan bellek MB) — bellek tracemalloc ile, sonuç canlıyken ölçülür."""
+    tracemalloc.start()
+    t = time.perf_counter(); out = fn(); dt = time.perf_counter() - t
+    cur, _ = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    return out, dt, cur / 2**20
+
+def bench_model(sizes):
+    """dict-of-dataclass + children dict'i ile OrgModel (id/CSR) karşılaştırması."""
+    print(f"{'düğüm':>9}{'eski MB':>10}{'yeni MB':>10}{'eski kur s':>12}{'yeni kur s':>12}{'layout s':>10}")
+    for n in sizes:
+        df = make_table(n, depts=40)
+        old_df = df.replace({"": None})
+        (_, _), t_old, mb_old = _measure(lambda: (lambda p: (p, _legacy_build_tree(p)))(_legacy_build_people(old_df)))
+        model, t_new, mb_new = _measure(lambda: build_tree(build_people(df)))
+        _, t_lay = timed(compute_layout, model, model.roots[0])
+        print(f"{n:>9}{mb_old:>10.1f}{mb_new:>10.1f}{t_old:>12.2f}{t_new:>12.2f}{t_lay:>10.2f}")
+
+# ---- Aşama aşama ölçüm (--suite) ----
+FULL_RENDER_MAX_PX = 40_000_000   # draw_chart / save_png / save_pdf tam görüntüsü bu piksele sığacak ölçekte çizilir
+FULL_RENDER_MIN_SCALE = 0.1       # sığdırmak için gereken ölçek bundan küçükse bu aşamalar atlanır
+IMAGE_MAX_SIDE = 65500            # save_pdf görüntüyü JPEG olarak gömer; JPEG kenarı en çok 65500 px
+VIEW_SIZE = (1400, 900)           # render_view ve _pil_to_tk için ekran bölgesi
+TILE = 256
+STAGES = ["load_table", "build_people", "build_tree", "compute_layout", "scene", "render_view",
+          "draw_chart", "save_png", "save_pdf", "export_pdf", "pil_to_tk"]
+
+def _rss_mb() -> Optional[float]:
+    """Sürecin şimdiye kadarki tepe RSS'i (MB); ölçülemiyorsa None."""
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)   # macOS bayt, Linux KB
+
+def _title_colors(titles: int) -> Dict[str, tuple]:
+    """Pozisyonların yarısına renk (renkli ve beyaz kartlar birlikte çizilsin)."""
+    rnd = random.Random(titles)
+    return {f"Pozisyon {t:03d}": (rnd.randrange(80, 250), rnd.randrange(80, 250), rnd.randrange(80, 250)) for t in range(0, titles, 2)}
+
+def _cold_caches():
+    """Süreç geneli metin önbelleklerini boşaltır: her tur yeni açılmış uygulamadaki gibi soğuk başlar."""
+    with org_chart_core._text_lock:
+        org_chart_core._text_masks.clear(); org_chart_core._text_bytes = 0
+    org_chart_core.wrap_text.cache_clear()
+
+def _tk_converter():
+    """org_chart_app._pil_to_tk ve gizli Tk kökü; ekran yoksa (None, neden)."""
+    try:
+        import tkinter as tk
+        from org_chart_app import OrgChartApp
+        root = tk.Tk(); root.withdraw()
+        return (root, OrgChartApp._pil_to_tk), None
+    except Exception as e:
+        return None, f"Tk yok: {e}".splitlines()[0]
+
+def run_stages(df: pd.DataFrame, fmt: str, titles: int, max_px: int, tk_conv, trace: bool = False) -> Dict[str, dict]:
+    """
+    Tabloyu diske yazıp boru hattını aşama aşama koşturur. Aşama başına {"s": süre,
+    "rss_mb": o ana dek tepe RSS}; trace=True ise tracemalloc tepe değeri de ("py_peak_mb",
+    Python ayırmaları; Pillow görüntü tamponları dahil değil). Atlanan: {"skipped": neden};
+    hata veren kaydetme aşaması: {"error": ileti} (main çıkış kodunu 1 yapar).
+    """
+    res: Dict[str, dict] = {}
+    _cold_caches()
+    def stage(name, fn, soft=False, **extra):
+        if trace: tracemalloc.start()
+        t = time.perf_counter()
+        try: out = fn()
+        except Exception as e:
+            if trace: tracemalloc.stop()
+            if not soft: raise
+            res[name] = {"error": f"{type(e).__name__}: {e}"}; return None
+        dt = time.perf_counter() - t
+        rec = {"s": round(dt, 6), **extra}
+        if trace:
+            rec["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2); tracemalloc.stop()
+        rss = _rss_mb()
+        if rss is not None: rec["rss_mb"] = round(rss, 1)
+        res[name] = rec
+        return out
+    colors = _title_colors(titles)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"personel.{fmt}")
+        if fmt == "xlsx": df.to_excel(path, index=False)
+        else: df.to_csv(path, index=False)
+        table = stage("load_table", lambda: load_table(path))
+        model = stage("build_people", lambda: build_people(table))
+        stage("build_tree", lambda: build_tree(model))
+        layouts = stage("compute_layout", lambda: layout_forest(model, model.roots))
+        scene = stage("scene", lambda: ChartScene(model, None, 1.0, colors, True, True, None, "bg", layouts=layouts))
+        bx = scene.bboxes[model.roots[0]]
+        x0 = max(0, (bx[0] + bx[2]) // 2 - VIEW_SIZE[0] // 2)
+        view = (x0, 0, x0 + VIEW_SIZE[0], VIEW_SIZE[1])
+        stage("render_view", lambda: scene.render(view))
+        # geniş ve sığ şemalarda alan bütçesinden önce kenar sınırı bağlar
+        fit_area = (max_px / (scene.width * scene.height)) ** 0.5
+        fit_side = (IMAGE_MAX_SIDE - 1) / max(scene.width, scene.height)   # yuvarlama payı
+        fit = min(1.0, fit_area, fit_side)
+        if fit >= FULL_RENDER_MIN_SCALE:
+            fit = int(fit * 1000) / 1000   # aşağı yuvarla: kenar sınırı aşılmasın
+            img = stage("draw_chart", lambda: draw_chart(model, None, fit, colors, True, True, None, "bg")[0], scale=fit)
+            stage("save_png", lambda: save_png(img, os.path.join(tmp, "sema.png")), soft=True, px=img.width * img.height)
+            stage("save_pdf", lambda: save_pdf(img, os.path.join(tmp, "sema.pdf")), soft=True, px=img.width * img.height)
+            del img
+        else:
+            why = f"{max_px/1e6:.0f} Mpx" if fit_area <= fit_side else f"{IMAGE_MAX_SIDE} px kenar"
+            for name in ("draw_chart", "save_png", "save_pdf"):
+                res[name] = {"skipped": f"{why} sınırına sığmak için ölçek {fit:.3f} < {FULL_RENDER_MIN_SCALE}"}
+        stage("export_pdf", lambda: export_pdf(scene, os.path.join(tmp, "sema_vektor.pdf")), soft=True, px=scene.width * scene.height)
+        if tk_conv is None: res["pil_to_tk"] = {"skipped": "Tk yok"}
+        else:
+            _, conv = tk_conv
+            tiles = [scene.render((x, y, x + TILE, y + TILE))
+                     for y in range(view[1], view[3], TILE) for x in range(view[0], view[2], TILE)]
+            stage("pil_to_tk", lambda: [conv(t) for t in tiles], n=len(tiles))
+    return res
+
+# ---- Açılış (--startup) ----
+STARTUP_TARGET_S = 0.5   # süreç başlangıcı -> ilk pencere (kaynaktan, sıcak disk önbelleği)
+_STARTUP_PROBE = r"""
+import sys, time, json
+out = {}
+import org_chart_app
+out["import_at"] = time.time()
+try:
+    app = org_chart_app.OrgChartApp(); app.update()
+    out["window_at"] = time.time()
+except Exception as e:
+    out["skipped"] = f"Tk yok: {e}".splitlines()[0]; app = None
+out["modules"] = sorted(sys.modules)
+if app is not None: app.destroy()
+print(json.dumps(out))
+"""
+
+def bench_startup(repeat: int) -> int:
+    """Açılış süresi; hedef aşılırsa 1 döner."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best, probe = None, None
+    for _ in range(max(2, repeat)):   # ilk tur .pyc'leri yazar / disk önbelleğini ısıtır
+        t0 = time.time()
+        proc = subprocess.run([sys.executable, "-c", _STARTUP_PROBE], capture_output=True, text=True, cwd=here, timeout=60)
+        if proc.returncode: print(proc.stderr.strip(), file=sys.stderr); return 1
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        dt = probe.get("window_at", probe["import_at"]) - t0
+        best = dt if best is None else min(best, dt)
+    what = "ilk pencere" if "window_at" in probe else f"org_chart_app içe aktarma ({probe['skipped']})"
+    print(f"Açılış -> {what}: {best:.3f} s (hedef {STARTUP_TARGET_S:.3f} s, {max(2, repeat)} turun en iyisi)")
+    print(f"Yüklenen modül: {len(probe['modules'])}")
+    if best > STARTUP_TARGET_S: print("AÇILIŞ HEDEFİ TUTMADI"); return 1
+    return 0
+
+def _env() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+            "pandas": pd.__version__, "pillow": PIL.__version__, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def _tree_depth(df: pd.DataFrame) -> int:
+    mgr = dict(zip(df["Kullanıcı Adı"], df["Üst Kademe"]))
+    memo: Dict[str, int] = {}
+    def d(u):
+        path = []
+        while u and u not in memo: path.append(u); u = mgr.get(u)
+        base = memo.get(u, 0)
+        for v in reversed(path): base += 1; memo[v] = base
+        return memo[path[0]] if path else base
+    return max(d(u) for u in mgr)
+
+def bench_suite(sizes: List[int], fanout: int, depth: Optional[int], depts: int, titles: int, seed: int,
+                fmt: str, repeat: int, max_px: int, trace: bool) -> dict:
+    """Her boyut için aşama süreleri (repeat turun en iyisi) ve bellek; sonuç sözlüğü döner."""
+    tk_conv, tk_why = _tk_converter()
+    runs = []
+    for n in sizes:
+        df = make_table(n, fanout=fanout, depts=depts, titles=titles, seed=seed, depth=depth)
+        params = {"rows": n, "fanout": fanout, "depth": depth, "depts": depts, "titles": titles, "seed": seed, "format": fmt}
+        best: Dict[str, dict] = {}
+        for _ in range(max(1, repeat)):
+            for name, rec in run_stages(df, fmt, titles, max_px, tk_conv).items():
+                prev = best.get(name)
+                if prev is not None and "s" in rec and prev["s"] <= rec["s"]: rec = dict(prev, rss_mb=rec.get("rss_mb"))
+                best[name] = rec   # süre: turların en iyisi; RSS: son tura dek tepe
+        if trace:   # ayrı tur: tracemalloc süreleri bozar
+            for name, rec in run_stages(df, fmt, titles, max_px, tk_conv, trace=True).items():
+                if "py_peak_mb" in rec: best[name]["py_peak_mb"] = rec["py_peak_mb"]
+        if tk_why: best["pil_to_tk"] = {"skipped": tk_why}
+        runs.append({"params": params, "levels": _tree_depth(df), "stages": best})
+        _print_run(runs[-1])
+    if tk_conv is not None: tk_conv[0].destroy()
+    return {"schema": 1, "env": _env(), "runs": runs}
+
+def _print_run(run: dict):
+    p = run["params"]
+    print(f"\n{p['rows']} satır | fanout {p['fanout']} | {run['levels']} düzey | {p['depts']} departman | {p['titles']} pozisyon | {p['format']}")
+    print(f"{'aşama':<16}{'süre (s)':>11}{'RSS MB':>9}{'py MB':>8}")
+    for name in STAGES:
+        rec = run["stages"].get(name, {})
+        if "s" not in rec:
+            print(f"{name:<16}{'—':>11}   {rec.get('skipped') or rec.get('error', '')}"); continue
+        rss, py = rec.get("rss_mb"), rec.get("py_peak_mb")
+        print(f"{name:<16}{rec['s']:>11.4f}{(f'{rss:.0f}' if rss is not None else '—'):>9}{(f'{py:.1f}' if py is not None else '—'):>8}")
+
+def _run_key(run: dict):
+    p = run["params"]
+    return (p["rows"], p["fanout"], p["depth"], p["depts"], p["titles"], p["seed"], p["format"])
+
+NOISE_FLOOR_S = 0.010   # bundan küçük farklar karşılaştırmada yavaşlama sayılmaz
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """Aynı parametreli koşuların aşama sürelerini karşılaştırır; yavaşlayan aşama sayısını döner."""
+    olds = {_run_key(r): r for r in old.get("runs", [])}
+    slower = 0
+    print(f"\nKarşılaştırma: {old.get('env', {}).get('commit')} -> {new['env'].get('commit')} (eşik %{threshold*100:.0f})")
+    for run in new["runs"]:
+        o = olds.get(_run_key(run))
+        if o is None: print(f"{run['params']['rows']} satır: önceki sonuçta yok"); continue
+        print(f"\n{run['params']['rows']} satır")
+        print(f"{'aşama':<16}{'önce (s)':>11}{'sonra (s)':>11}{'oran':>8}")
+        for name in STAGES:
+            a, b = o["stages"].get(name, {}).get("s"), run["stages"].get(name, {}).get("s")
+            if a is None or b is None: continue
+            ratio = b / a if a else float("inf")
+            flag = ""
+            if b > a * (1 + threshold) and b - a >= NOISE_FLOOR_S: flag = "  YAVAŞLADI"; slower += 1
+            print(f"{name:<16}{a:>11.4f}{b:>11.4f}{ratio:>8.2f}{flag}")
+    return slower
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Organizasyon şeması ölçümleri")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--switches", type=int, default=5, help="ölçülecek departman değişimi sayısı")
+    ap.add_argument("--model", type=int, nargs="*", metavar="N", help="model bellek/süre ölçümü (ör. 10000 100000 1000000)")
+    ap.add_argument("--suite", type=int, nargs="*", metavar="N", help="aşama aşama ölçüm, satır sayıları (ör. 1000 10000 100000 1000000)")
+    ap.add_argument("--fanout", type=int, default=6, help="yönetici başına kişi (varsayılan: %(default)s)")
+    ap.add_argument("--depth", type=int, default=None, help="en fazla düzey sayısı (varsayılan: fanout'tan doğan)")
+    ap.add_argument("--depts", type=int, default=40, help="departman sayısı (varsayılan: %(default)s)")
+    ap.add_argument("--titles", type=int, default=120, help="farklı pozisyon sayısı (varsayılan: %(default)s)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="load_table'a verilen dosya biçimi")
+    ap.add_argument("--repeat", type=int, default=1, help="tur sayısı; her aşamanın en iyisi alınır")
+    ap.add_argument("--max-pixels", type=int, default=FULL_RENDER_MAX_PX, help="draw_chart/save_* tam görüntüsünün piksel bütçesi (şema küçültülerek sığdırılır)")
+    ap.add_argument("--trace-mem", action="store_true", help="ek turda aşama başına tracemalloc tepe belleği")
+    ap.add_argument("--json", metavar="DOSYA", help="sonuçları JSON olarak yaz")
+    ap.add_argument("--compare", metavar="DOSYA", help="önceki --json sonucuyla karşılaştır")
+    ap.add_argument("--threshold", type=float, default=0.10, help="yavaşlama eşiği (oran; varsayılan: %(default)s)")
+    ap.add_argument("--startup", action="store_true", help="açılış süresini ve pencereden önce yüklenen modülleri denetle")
+    args = ap.parse_args(argv)
+    if args.startup: return 1 if bench_startup(args.repeat) else 0
+    if args.suite:
+        result = bench_suite(args.suite, args.fanout, args.depth, args.depts, args.titles, args.seed,
+                             args.format, args.repeat, args.max_pixels, args.trace_mem)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f: json.dump(result, f, ensure_ascii=False, indent=1)
+            print(f"\nYazıldı: {args.json}")
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f: old = json.load(f)
+            if compare(old, result, args.threshold): return 1
+        failed = [f"{r['params']['rows']} satır {name}: {rec['error']}" for r in result["runs"] for name, rec in r["stages"].items() if "error" in rec]
+        for line in failed: print(f"HATA {line}", file=sys.stderr)
+        return 1 if failed else 0
+    if args.model: bench_model(args.model)
+    else: bench_load(args.rows, args.switches)
+
+if __name__ == "__main__":
+    sys.exit(main())
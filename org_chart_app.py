@@ -7,265 +7,53 @@ Gelişmiş Masaüstü Organizasyon Şeması
 - BG/Şerit renklendirme, Arama (merkeze kaydırma), Zoom
 - PNG/PDF dışa aktarım
 
-Gerekli: pandas, pillow, openpyxl
+Çizim/veri çekirdeği org_chart_core'dadır; arayüzsüz kullanım için org_chart_cli.
+Gerekli: pillow; Excel için pandas + openpyxl
 Opsiyonel DnD: tkinterdnd2
+
+Pencere ağır kütüphaneleri beklemeden açılır: Pillow ilk çizimde, pandas ilk Excel
+dosyasında, tkinterdnd2 pencere göründükten sonra yüklenir (bkz. bench --startup).
 """
 
-import os, sys, json
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
-from PIL import Image, ImageDraw, ImageFont
+from __future__ import annotations
+
+import os, sys, json, time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
-from io import BytesIO
-from textwrap import wrap
 
-# ---- Opsiyonel DnD ----
-DnDEnabled = False
-try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    DnDEnabled = True
-except Exception:
-    DnDEnabled = False
+from org_chart_core import (
+    DEFAULT_SETTINGS_FILE, OrgModel, Table, ChartScene, TileCache, ChartData, BackgroundWorker, FoldableLayout,
+    STATS_COLUMNS, WORKER_POLL_MS, SEARCH_LIMIT, OVERVIEW_SIZE, chart_roots, collapse_below, build_people, diff_models, ppm_bytes,
+    export_png, save_report, save_stats,
+)
+from org_chart_cache import load_table_cached
+from org_chart_vector import PAPER_SIZES, export_pdf, export_pdf_pages, export_svg
+from org_chart_trace import TRACE
+
+FOLD_AUTO_PEOPLE = 2000   # bundan kalabalık tablolar ilk açılışta üç düzey açık gösterilir
+WATCH_POLL_MS = 2000      # dosya izleme yoklama aralığı
+TRACE_POLL_MS = 500       # ölçüm paneli / durum özeti yenileme aralığı
+STATS_ROWS = 1000         # ekip tablosunda gösterilen en fazla satır (sıralama tüm yöneticiler üzerinden)
+COLOR_STYLES = {"Arka plan": "bg", "Sol şerit": "stripe", "Ekip büyüklüğü": "headcount", "Doğrudan bağlı": "span"}
+
+if TYPE_CHECKING: from PIL import Image
+
+# ---- Opsiyonel ImageTk (Pillow'un Tk köprüsü; pikselleri doğrudan kopyalar) ----
+@lru_cache(maxsize=1)
+def _image_tk():
+    """PIL.ImageTk ya da None; ilk karoda yüklenir (Pillow zaten yüklüdür)."""
+    try:
+        from PIL import ImageTk
+        return ImageTk
+    except Exception:
+        return None
 
 APP_TITLE = "Organizasyon Şeması"
-REQ_COLS = ["Kullanıcı Adı","Ad Soyad","Departman","Pozisyon","Üst Kademe","Mail"]
-
-# Kart metrikleri
-BOX_W, BOX_H = 300, 88
-BOX_PAD_X = 44
-ROW_GAP, COL_GAP = 90, 42
-
-CANVAS_BG   = (248, 250, 252)
-BOX_BG      = (255, 255, 255)
-BOX_BORDER  = (39, 94, 254)
-LINE_COLOR  = (120, 144, 156)
-TEXT_COLOR  = (26, 32, 44)
-SUBTEXT     = (88, 96, 108)
-HILIGHT     = (220, 53, 69)
-
-FONT_TITLE_SIZE, FONT_SUB_SIZE = 17, 13
-DEFAULT_SETTINGS_FILE = os.path.join(os.path.expanduser("~"), ".org_chart_settings.json")
-
-@dataclass
-class Person:
-    username: str
-    full_name: str
-    dept: str
-    title: str
-    manager: Optional[str]
-    mail: str
-
-# ---------------- Yardımcılar ----------------
-def ensure_font(size: int) -> ImageFont.FreeTypeFont:
-    candidates = [
-        "DejaVuSans.ttf",
-        "C:\\Windows\\Fonts\\DejaVuSans.ttf",
-        "C:\\Windows\\Fonts\\arial.ttf",
-        "/System/Library/Fonts/Supplemental/Arial.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-    ]
-    for p in candidates:
-        try: return ImageFont.truetype(p, size)
-        except: pass
-    return ImageFont.load_default()
-
-def load_table(path: str) -> pd.DataFrame:
-    p = path.lower()
-    df = pd.read_excel(path) if p.endswith((".xlsx",".xls")) else pd.read_csv(path)
-    m = {}
-    for c in df.columns:
-        k = c.strip().lower()
-        if "kullanıcı" in k and "adı" in k: m[c] = "Kullanıcı Adı"
-        elif k in ["ad soyad","ad-soyad","ad_soyad","isim","ad","soyad","adi soyadi","adı soyadı"]: m[c] = "Ad Soyad"
-        elif "departman" in k or "department" in k: m[c] = "Departman"
-        elif "pozisy" in k or "görev" in k or "gorev" in k or "title" in k or "ünvan" in k or "unvan" in k: m[c] = "Pozisyon"
-        elif "üst" in k or "ust" in k or "manager" in k or "yönetici" in k or "yonetici" in k or "amiri" in k: m[c] = "Üst Kademe"
-        elif "mail" in k or "e-posta" in k or "email" in k: m[c] = "Mail"
-    df = df.rename(columns=m)
-    missing = [c for c in REQ_COLS if c not in df.columns]
-    if missing: raise ValueError(f"Eksik kolonlar: {missing}\nMevcut: {list(df.columns)}")
-    for c in REQ_COLS:
-        df[c] = df[c].astype(str).str.strip().replace({"nan":None,"None":None,"":None})
-    return df[REQ_COLS].copy()
-
-def build_people(df: pd.DataFrame, dept: Optional[str]=None) -> Dict[str,Person]:
-    if dept and dept != "Tümü": df = df.loc[df["Departman"]==dept].copy()
-    out: Dict[str,Person] = {}
-    for _,r in df.iterrows():
-        u = (r["Kullanıcı Adı"] or "").strip()
-        if not u or u.lower()=="none": continue
-        out[u] = Person(
-            username=u,
-            full_name=(r["Ad Soyad"] or "").strip(),
-            dept=(r["Departman"] or "").strip(),
-            title=(r["Pozisyon"] or "").strip(),
-            manager=((r["Üst Kademe"] or "").strip() or None),
-            mail=(r["Mail"] or "").strip()
-        )
-    return out
-
-def build_tree(people: Dict[str,Person]):
-    children = {u:[] for u in people}
-    has_mgr = set()
-    for u,p in people.items():
-        if p.manager and p.manager in people:
-            children[p.manager].append(u); has_mgr.add(u)
-    for k in children: children[k].sort(key=lambda x: people[x].full_name.lower())
-    roots = [u for u in people if u not in has_mgr]; roots.sort(key=lambda x: people[x].full_name.lower())
-    return children, roots
-
-def compute_layout(children: Dict[str,List[str]], root: str):
-    width = {}
-    def w(u):
-        if not children.get(u): width[u]=1; return 1
-        total = sum(w(v) for v in children[u]); width[u]=max(1,total); return width[u]
-    w(root)
-    pos = {}
-    def place(u, depth, x_left):
-        myw = width[u]; x_center = x_left + myw//2; pos[u]=(x_center, depth)
-        nxt = x_left
-        for v in children.get(u, []): nxt = place(v, depth+1, nxt)
-        return x_left + myw
-    place(root, 0, 0)
-    return pos
-
-# -------------- Çizim --------------
-def rel_luma(rgb):
-    r,g,b = [x/255.0 for x in rgb]
-    def adj(v): return v/12.92 if v<=0.03928 else ((v+0.055)/1.055)**2.4
-    r,g,b = adj(r), adj(g), adj(b)
-    return 0.2126*r + 0.7152*g + 0.0722*b
-
-def text_color_for(bg_rgb): return (255,255,255) if rel_luma(bg_rgb) < 0.55 else (26,32,44)
-def darker(rgb, f=0.80): return tuple(max(0, int(c*f)) for c in rgb)
-
-def draw_chart(people, children, roots, start_from, scale, title_colors, show_dept, show_mail, highlight_user, color_style, add_legend=True):
-    """
-    Şemayı çizer ve (img, bboxes) döner.
-    bboxes: {username: (x0,y0,x1,y1)} piksel koordinatları (render ölçeğinde)
-    """
-    if not people:
-        return Image.new("RGB",(900,600), CANVAS_BG), {}
-
-    draw_roots = [start_from] if (start_from and start_from in people) else roots
-    if not draw_roots: draw_roots = list(people.keys())[:1]
-
-    BW, BH = int(BOX_W*scale), int(BOX_H*scale)
-    PX, RG, CG = int(BOX_PAD_X*scale), int(ROW_GAP*scale), int(COL_GAP*scale)
-    FTS, FSS = max(11,int(FONT_TITLE_SIZE*scale)), max(10,int(FONT_SUB_SIZE*scale))
-    font_title, font_sub = ensure_font(FTS), ensure_font(FSS)
-
-    layouts = []
-    total_cols, max_depth = 0, 0
-    for r in draw_roots:
-        layout = compute_layout(children, r)
-        cols  = max([x for x,_ in layout.values()]+[0]) + 1
-        depth = max([y for _,y in layout.values()]+[0]) + 1
-        total_cols += cols; max_depth = max(max_depth, depth)
-        layouts.append(layout)
-
-    # Legend (tekilleştirilmiş)
-    legend_w = 0; legend_items=[]
-    if add_legend and title_colors:
-        uniq_titles = sorted({p.title for p in people.values() if title_colors.get(p.title)})
-        legend_items = [(t, title_colors[t]) for t in uniq_titles]
-        if legend_items: legend_w = int(260*scale)
-
-    img_w = PX*2 + total_cols*BW + (total_cols-1)*CG + legend_w
-    img_h = PX*2 + max_depth*BH + (max_depth-1)*RG
-    img = Image.new("RGB",(img_w,img_h), CANVAS_BG)
-    d = ImageDraw.Draw(img)
-
-    bboxes: Dict[str, Tuple[int,int,int,int]] = {}
-
-    def draw_box(xc, yc, person: Person, highlight: bool):
-        x0 = PX + xc*(BW+CG); y0 = PX + yc*(BH+RG)
-        x1, y1 = x0+BW, y0+BH
-        bboxes[person.username] = (x0,y0,x1,y1)
-        radius = int(18*scale)
-
-        pos_col = title_colors.get(person.title)
-        if color_style == "bg" and pos_col:
-            fill_col = pos_col
-            border_col = darker(pos_col, 0.75)
-            txt_main = text_color_for(fill_col)
-            txt_sub  = text_color_for(tuple(min(255,int(c*1.1)) for c in fill_col))
-            d.rounded_rectangle([x0+3,y0+3,x1+3,y1+3], radius=radius, fill=darker(fill_col,0.85))
-            d.rounded_rectangle([x0,y0,x1,y1], radius=radius, fill=fill_col, outline=border_col, width=max(1,int(2*scale)))
-        else:
-            d.rounded_rectangle([x0+3,y0+3,x1+3,y1+3], radius=radius, fill=(225,230,240))
-            d.rounded_rectangle([x0,y0,x1,y1], radius=radius, fill=BOX_BG, outline=BOX_BORDER, width=max(1,int(2*scale)))
-            txt_main, txt_sub = TEXT_COLOR, SUBTEXT
-            if pos_col and color_style == "stripe":
-                sw = int(16*scale)
-                d.rounded_rectangle([x0,y0,x0+sw,y1], radius=radius, fill=pos_col, outline=pos_col)
-
-        if highlight:
-            d.rounded_rectangle([x0-2,y0-2,x1+2,y1+2], radius=radius, outline=HILIGHT, width=max(2,int(3*scale)))
-
-        pad = int(12*scale)
-        name = person.full_name or person.username
-        line2 = f"{person.title}" + (f"  |  {person.dept}" if (show_dept and person.dept) else "")
-        line3 = person.mail if (show_mail and person.mail) else ""
-
-        max_name = 30 if scale>=1.0 else 24
-        max_sub  = 46 if scale>=1.0 else 36
-        name_wrapped   = "\n".join(wrap(name, max_name)) if len(name) > max_name else name
-        line2_wrapped  = "\n".join(wrap(line2, max_sub)) if len(line2) > max_sub else line2
-
-        d.text((x0+pad, y0+int(10*scale)),  name_wrapped,  fill=txt_main, font=font_title)
-        d.text((x0+pad, y0+int(36*scale)), line2_wrapped, fill=txt_sub,  font=font_sub)
-        if line3: d.text((x0+pad, y0+int(58*scale)), line3, fill=txt_sub, font=font_sub)
-
-    xoff = 0
-    for layout in layouts:
-        centers = {}
-        for u,(cx,cy) in layout.items():
-            x0 = PX + (xoff+cx)*(BW+CG); y0 = PX + cy*(BH+RG)
-            centers[u] = (x0 + BW//2, y0 + BH//2)
-        # bağlantılar
-        for u,(cx,cy) in layout.items():
-            for v in children.get(u, []):
-                if v not in layout: continue
-                x1,y1 = centers[u]; xv,yv = centers[v]
-                top_child_y = PX + layout[v][1]*(BH+RG)
-                bottom_parent_y = PX + layout[u][1]*(BH+RG) + BH
-                mid_y = (bottom_parent_y + top_child_y)//2
-                d.line([(x1,bottom_parent_y),(x1,mid_y)], fill=LINE_COLOR, width=max(1,int(2*scale)))
-                d.line([(x1,mid_y),(xv,mid_y)],         fill=LINE_COLOR, width=max(1,int(2*scale)))
-                d.line([(xv,mid_y),(xv,top_child_y)],   fill=LINE_COLOR, width=max(1,int(2*scale)))
-        # kutular
-        for u,(cx,cy) in layout.items():
-            draw_box(xoff+cx, cy, people[u], highlight=(highlight_user and u==highlight_user))
-        used = max([x for x,_ in layout.values()]+[0]) + 1
-        xoff += used
-
-    # Legend (tekilleştirilmiş kullan)
-    if legend_w and legend_items:
-        dfont = ensure_font(max(11,int(15*scale)))
-        sfont = ensure_font(max(10,int(12*scale)))
-        items = legend_items
-        lx0 = img_w - legend_w + int(12*scale)
-        ly0 = int(16*scale); lx1 = img_w - int(12*scale)
-        ly1 = ly0 + int((len(items)*24 + 56)*scale)
-        d.rounded_rectangle([lx0,ly0,lx1,ly1], radius=int(12*scale), fill=(255,255,255), outline=(220,225,235))
-        d.text((lx0+int(12*scale), ly0+int(12*scale)), "Pozisyon Renkleri", fill=(40,40,40), font=dfont)
-        y = ly0 + int(40*scale)
-        for title, col in items:
-            sz = int(18*scale)
-            d.rounded_rectangle([lx0+int(12*scale), y, lx0+int(12*scale)+sz, y+sz], radius=int(6*scale), fill=col, outline=col)
-            d.text((lx0+int(12*scale)+sz+int(10*scale), y-2), title, fill=(60,60,60), font=sfont)
-            y += int(24*scale)
-
-    return img, bboxes
-
-def save_png(img: Image.Image, path: str): img.save(path, "PNG", optimize=True)
-def save_pdf(img: Image.Image, path: str): img.convert("RGB").save(path, "PDF", resolution=300.0)
 
 # -------------- UI --------------
-class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
+class OrgChartApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title(APP_TITLE)
@@ -293,19 +81,34 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         style.configure("Treeview", rowheight=28, font=small_font)
 
         # durum
-        self.df: Optional[pd.DataFrame] = None
-        self.people: Dict[str,Person] = {}
-        self.children: Dict[str,List[str]] = {}
-        self.roots: List[str] = []
-        self.render_img: Optional[Image.Image] = None
-        self.preview_img: Optional[Image.Image] = None
-        self.render_tk = None
+        self.table: Optional[Table] = None
+        self.data: Optional[ChartData] = None
+        self.worker = BackgroundWorker()
+        self.model: OrgModel = OrgModel()        # seçili departmanın (ağacı kurulmuş) modeli
+        self.scene: Optional[ChartScene] = None
+        self.tiles = TileCache()
+        self.view_ratio = 1.0   # ön-izleme / render ölçeği (hızlı zoom)
+        self._tile_items: Dict[Tuple[int,int], Tuple[int, object]] = {}  # karo -> (canvas öğesi, PhotoImage)
+        self._tiles_pending = False
         self.scale = 1.0
         self.highlight_user: Optional[str] = None
+        self.search_hits: List[str] = []; self.search_pos = 0   # arama sonuçları (kullanıcı adı) / seçili sıra
+        self._hit_folded = False   # gösterilen sonuç katlanmış bir alt ağaçta (Enter açar)
         self.show_dept, self.show_mail = True, True
         self.color_style = "bg"
+        self.badges = False
+        self.compact = False
         self.var_fast = tk.BooleanVar(value=True)
-        self.node_bboxes: Dict[str, Tuple[int,int,int,int]] = {}  # render ölçeğinde
+        self.node_bboxes: Dict[int, Tuple[int,int,int,int]] = {}  # id -> bbox (render ölçeğinde)
+        self._hover: Optional[int] = None   # imlecin üstündeki kart (id)
+        self._tip: Optional[tk.Toplevel] = None
+        self.fold: Optional[FoldableLayout] = None   # açık/kapalı alt ağaçlar (artımlı yerleşim)
+        self._fold_key = None                        # (departman, başlangıç, düzey) — değişince katlama sıfırlanır
+        self._watch_sig = self._watch_seen = None    # yüklü dosyanın (boyut, mtime) imzası / yazılırken görülen imza
+        self._trace_win: Optional[tk.Toplevel] = None  # ölçüm paneli (F12)
+        self._issues_win: Optional[tk.Toplevel] = None # veri sorunları listesi
+        self._stats_win: Optional[tk.Toplevel] = None  # ekip tablosu
+        self._stats_sort = (4, True)                   # (sütun, azalan)
 
         # ayarlar (renkler)
         self.settings_path = DEFAULT_SETTINGS_FILE
@@ -314,17 +117,11 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
 
         self._build_ui()
 
-        # DnD bağlama
-        if DnDEnabled:
-            for w in (self, self.canvas, self.right_panel):
-                try:
-                    w.drop_target_register(DND_FILES)
-                    w.dnd_bind("<<Drop>>", self._on_drop)
-                except Exception:
-                    pass
-            self.status.configure(text="Sürükle-bırak aktif: Excel/CSV dosyasını pencereye bırakın.")
-        else:
-            self.status.configure(text="Sürükle-bırak pasif (tkinterdnd2 kurulu değil). Dosya seçerek yükleyin.")
+        self.after_idle(self._enable_dnd)   # pencere çizildikten sonra
+        self.after(WORKER_POLL_MS, self._poll_worker)
+        self.after(WATCH_POLL_MS, self._poll_watch)
+        self.after(TRACE_POLL_MS, self._poll_trace)
+        self.bind("<F12>", lambda e: self.show_trace_panel())
 
     # ---------- UI ----------
     def _build_ui(self):
@@ -349,13 +146,24 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         ttk.Checkbutton(top, text="Hızlı ön-izleme", variable=self.var_fast, command=self.on_zoom).pack(side=tk.LEFT, padx=(0,12))
 
         ttk.Label(top, text="Ara:").pack(side=tk.LEFT, padx=(8,4))
-        #self.ent_search = ttk.Entry(top, width=20); self.ent_search.pack(side=tk.LEFT)
-        #ttk.Button(top, text="Bul", command=self.on_search).pack(side=tk.LEFT, padx=(6,4))
+        self.var_search = tk.StringVar()
+        self.var_search.trace_add("write", lambda *a: self.on_search())
+        self.ent_search = ttk.Entry(top, width=20, textvariable=self.var_search); self.ent_search.pack(side=tk.LEFT)
+        self.ent_search.bind("<Return>", lambda e: self.step_search(1))
+        self.ent_search.bind("<Shift-Return>", lambda e: self.step_search(-1))
+        ttk.Button(top, text="◀", width=2, command=lambda: self.step_search(-1)).pack(side=tk.LEFT, padx=(4,0))
+        ttk.Button(top, text="▶", width=2, command=lambda: self.step_search(1)).pack(side=tk.LEFT)
+        self.lbl_search = ttk.Label(top, text="", width=9, foreground="#666"); self.lbl_search.pack(side=tk.LEFT, padx=(4,0))
         ttk.Button(top, text="Vurguyu Temizle", command=self.clear_highlight).pack(side=tk.LEFT, padx=(4,10))
 
         self.btn_export_png = ttk.Button(top, text="PNG Dışa Aktar", command=lambda: self.on_export("png"), state="disabled")
         self.btn_export_pdf = ttk.Button(top, text="PDF Dışa Aktar", command=lambda: self.on_export("pdf"), state="disabled")
+        self.btn_export_svg = ttk.Button(top, text="SVG Dışa Aktar", command=lambda: self.on_export("svg"), state="disabled")
         self.btn_export_png.pack(side=tk.RIGHT, padx=(6,0)); self.btn_export_pdf.pack(side=tk.RIGHT, padx=(6,0))
+        self.btn_export_svg.pack(side=tk.RIGHT, padx=(6,0))
+        self.var_paper = tk.StringVar(value="Tek sayfa")
+        ttk.Combobox(top, textvariable=self.var_paper, values=["Tek sayfa", "A4", "A3"], state="readonly", width=9).pack(side=tk.RIGHT, padx=(6,0))
+        ttk.Label(top, text="PDF:").pack(side=tk.RIGHT)
 
         # gövde
         body = ttk.Frame(self); body.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=12, pady=(0,10))
@@ -366,11 +174,18 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
 
         self.vbar = ttk.Scrollbar(left, orient=tk.VERTICAL, command=self.canvas.yview); self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.hbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.canvas.xview); self.hbar.pack(side=tk.BOTTOM, fill=tk.X)
-        self.canvas.configure(yscrollcommand=self.vbar.set, xscrollcommand=self.hbar.set)
+        self.canvas.configure(yscrollcommand=self._on_yscroll, xscrollcommand=self._on_xscroll)
+        self.canvas.bind("<Configure>", lambda e: self._schedule_tiles())
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<Double-Button-1>", self.on_canvas_toggle)
+        self.canvas.bind("<Button-3>", self.on_canvas_reroot)
+        if sys.platform == "darwin": self.canvas.bind("<Button-2>", self.on_canvas_reroot)
+        self.canvas.bind("<Motion>", self.on_canvas_motion)
+        self.canvas.bind("<Leave>", lambda e: self._hide_tip())
 
         self.right_panel = ttk.Frame(body, width=340); self.right_panel.pack(side=tk.RIGHT, fill=tk.Y); self.right_panel.pack_propagate(False)
         ttk.Label(self.right_panel, text="Pozisyon Renkleri", font=("Segoe UI", 13, "bold")).pack(anchor="w", padx=6, pady=(4,8))
-        self.tree_colors = ttk.Treeview(self.right_panel, columns=("poz","renk"), show="headings", height=16)
+        self.tree_colors = ttk.Treeview(self.right_panel, columns=("poz","renk"), show="headings", height=12)
         self.tree_colors.heading("poz", text="Pozisyon")
         self.tree_colors.heading("renk", text="Renk")
         self.tree_colors.column("poz", width=210, anchor="w")
@@ -382,6 +197,11 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         ttk.Button(b, text="Renkleri Kaydet", command=self.save_color_settings).pack(side=tk.LEFT, padx=(0,6))
         ttk.Button(b, text="Renkleri Yükle", command=self.load_color_settings).pack(side=tk.LEFT, padx=6)
         ttk.Button(b, text="Temizle", command=self.clear_colors).pack(side=tk.LEFT, padx=6)
+        b = ttk.Frame(self.right_panel); b.pack(fill=tk.X, padx=6)
+        self.btn_issues = ttk.Button(b, text="Veri sorunları: —", command=self.show_issues, state="disabled")
+        self.btn_issues.pack(side=tk.LEFT)
+        self.btn_stats = ttk.Button(b, text="Ekipler", command=self.show_stats, state="disabled")
+        self.btn_stats.pack(side=tk.LEFT, padx=6)
 
         ttk.Separator(self.right_panel, orient="horizontal").pack(fill=tk.X, padx=6, pady=8)
         self.var_show_dept = tk.BooleanVar(value=True)
@@ -389,17 +209,60 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         ttk.Checkbutton(self.right_panel, text="Departman satırını göster", variable=self.var_show_dept, command=self.on_redraw).pack(anchor="w", padx=8)
         ttk.Checkbutton(self.right_panel, text="Mail satırını göster",       variable=self.var_show_mail, command=self.on_redraw).pack(anchor="w", padx=8)
 
+        self.var_compact = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.right_panel, text="Kompakt yerleşim (yaprakları istifle)", variable=self.var_compact, command=self.on_redraw).pack(anchor="w", padx=8)
+        self.var_watch = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.right_panel, text="Dosyayı izle (değişince güncelle)", variable=self.var_watch, command=self.on_watch).pack(anchor="w", padx=8)
+
+        ttk.Label(self.right_panel, text="Açık düzey (çift tık: aç/kapat)").pack(anchor="w", padx=8, pady=(10,2))
+        self.cmb_levels = ttk.Combobox(self.right_panel, values=["Tümü","1","2","3","4","5","6"], state="readonly", width=16)
+        self.cmb_levels.set("Tümü"); self.cmb_levels.pack(anchor="w", padx=8)
+        self.cmb_levels.bind("<<ComboboxSelected>>", lambda e: self.on_relayout())
+
         ttk.Label(self.right_panel, text="Renk uygulama stili").pack(anchor="w", padx=8, pady=(10,2))
-        self.cmb_style = ttk.Combobox(self.right_panel, values=["Arka plan","Sol şerit"], state="readonly", width=16)
-        self.cmb_style.set("Arka plan"); self.cmb_style.pack(anchor="w", padx=8)
+        b = ttk.Frame(self.right_panel); b.pack(fill=tk.X, padx=8)
+        self.cmb_style = ttk.Combobox(b, values=list(COLOR_STYLES), state="readonly", width=16)
+        self.cmb_style.set("Arka plan"); self.cmb_style.pack(side=tk.LEFT)
         self.cmb_style.bind("<<ComboboxSelected>>", lambda e: self.on_redraw())
-
-        self.status = ttk.Label(self, text="Hazır", anchor="w")
-        self.status.pack(side=tk.BOTTOM, fill=tk.X, padx=12, pady=(0,10))
+        self.var_badges = tk.BooleanVar(value=False)
+        ttk.Checkbutton(b, text="Ekip rozeti", variable=self.var_badges, command=self.on_redraw).pack(side=tk.LEFT, padx=(8,0))
+
+        ttk.Label(self.right_panel, text="Genel Bakış").pack(anchor="w", padx=8, pady=(12,2))
+        self.minimap = tk.Canvas(self.right_panel, width=OVERVIEW_SIZE[0], height=OVERVIEW_SIZE[1], bg="#eef1f5",
+                                 highlightthickness=1, highlightbackground="#d0d7de")
+        self.minimap.pack(anchor="w", padx=8)
+        self.minimap.bind("<Button-1>", self.on_minimap); self.minimap.bind("<B1-Motion>", self.on_minimap)
+        self._mini_photo, self._mini_rect = None, None
+
+        bar = ttk.Frame(self); bar.pack(side=tk.BOTTOM, fill=tk.X, padx=12, pady=(0,10))
+        self.lbl_trace = ttk.Label(bar, text="", foreground="#666")   # ölçüm açıkken son işlemin süreleri
+        self.lbl_trace.pack(side=tk.RIGHT)
+        self.status = ttk.Label(bar, text="Hazır", anchor="w")
+        self.status.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         self.tree_colors.bind("<Double-1>", self.on_color_pick)
 
     # ---------- DnD ----------
+    def _enable_dnd(self):
+        """
+        Opsiyonel tkinterdnd2: tkdnd Tcl paketi mevcut köke sonradan yüklenir (açılışı
+        geciktirmez). Modül widget'lara drop_target_register/dnd_bind ekler; kök pencere
+        yerine onu dolduran çocuklar kaydedilir.
+        """
+        try:
+            from tkinterdnd2 import DND_FILES, TkinterDnD
+            TkinterDnD._require(self)
+        except Exception:
+            if self.data is None: self.status.configure(text="Sürükle-bırak pasif (tkinterdnd2 kurulu değil). Dosya seçerek yükleyin.")
+            return
+        for w in (*self.winfo_children(), self.canvas, self.right_panel):
+            try:
+                w.drop_target_register(DND_FILES)
+                w.dnd_bind("<<Drop>>", self._on_drop)
+            except Exception:
+                pass
+        if self.data is None: self.status.configure(text="Sürükle-bırak aktif: Excel/CSV dosyasını pencereye bırakın.")
+
     @staticmethod
     def _parse_dnd_path(event_data: str) -> Optional[str]:
         if not event_data: return None
@@ -431,95 +294,349 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         if not path: return
         self._load_path(path)
 
-    def _load_path(self, path: str):
-        try:
-            self.df = load_table(path)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Tablo okunamadı:\n{e}"); return
-
-        depts = ["Tümü"] + sorted([x for x in self.df["Departman"].dropna().unique()])
-        self.cmb_dept.configure(values=depts, state="readonly"); self.cmb_dept.set("Tümü")
-
-        users = ["Otomatik (Kökler)"] + [f'{u} — {n}' for u,n in zip(self.df["Kullanıcı Adı"], self.df["Ad Soyad"])]
-        self.cmb_root.configure(values=users, state="readonly"); self.cmb_root.set("Otomatik (Kökler)")
+    @staticmethod
+    def _file_sig(path: str):
+        try: st = os.stat(path); return st.st_size, st.st_mtime_ns
+        except OSError: return None
 
-        self.btn_build.configure(state="normal")
+    def _load_path(self, path: str):
+        def work(job):
+            job.progress(f"Okunuyor: {os.path.basename(path)}")
+            sig = self._file_sig(path)   # okumadan önce: okuma sırasındaki değişiklik de yakalanır
+            table, entry = load_table_cached(path)   # değişmemiş dosyada ayrıştırma diskteki önbellekten
+            job.progress(f"Kişiler hazırlanıyor ({len(table)} satır)...")
+            data = ChartData(path, table, build_people(table), cache=entry)
+            job.progress("Hiyerarşi denetleniyor...")
+            data.report()   # döngü / kendine bağlı / bulunamayan yönetici / tekrar
+            job.progress("Arama dizini hazırlanıyor...")
+            data.search_index()
+            TRACE.gauge("people", len(data.model_all))
+            return data, sig
+        self.worker.submit("load", work, lambda r: self._on_loaded(*r),
+                           lambda e: messagebox.showerror("Hata", f"Tablo okunamadı:\n{e}"))
+
+    def _fill_pickers(self):
+        """Departman ve başlangıç listeleri (seçim korunur)."""
+        depts = ["Tümü"] + sorted({x for x in self.table["Departman"] if x is not None})
+        self.cmb_dept.configure(values=depts, state="readonly")
+        users = ["Otomatik (Kökler)"] + [f'{u} — {n}' for u,n in zip(self.table["Kullanıcı Adı"], self.table["Ad Soyad"])]
+        self.cmb_root.configure(values=users, state="readonly")
+
+    def _on_loaded(self, data: ChartData, sig):
+        # izleme imzası yalnız yükleme başarılıysa değişir (okunamayan dosya eski tablonun izlemesini bozmaz)
+        self.data, self.table = data, data.table
+        self._watch_sig, self._watch_seen = sig, None
+
+        self._fill_pickers()
+        self.cmb_dept.set("Tümü"); self.cmb_root.set("Otomatik (Kökler)")
+        self.cmb_levels.set("3" if len(data.model_all) > FOLD_AUTO_PEOPLE else "Tümü")
+        self.fold = self._fold_key = None
+
+        self.btn_build.configure(state="normal"); self.btn_stats.configure(state="normal")
         self.cmb_dept.configure(state="readonly"); self.cmb_root.configure(state="readonly")
         self.zoom.configure(state="normal")
 
         self.refresh_position_list()
+        report = self._show_report_state()
+        self.status.configure(text=f"Yüklendi: {data.path} | {len(self.table)} satır" + (f" | Veri sorunu: {report.summary()}" if report else ""))
         self.on_relayout()
-        self.status.configure(text=f"Yüklendi: {path} | {len(self.df)} satır")
 
-    def on_relayout(self):
-        if self.df is None: return
+    def on_relayout(self, change=None, focus: Optional[str] = None):
+        """
+        Model/yerleşim/sahne arka planda hazırlanır; yeni istek eskisinin yerini alır.
+        change(fold): katlama değişikliği (aç/kapat); yalnız etkilenen omurga yeniden yerleşir.
+        focus: sahne gelince ortalanacak kullanıcı.
+        """
+        if self.data is None: return
         dept = self.cmb_dept.get(); dept = None if (not dept or dept=="Tümü") else dept
-        self.people = build_people(self.df, dept)
-        if not self.people:
-            messagebox.showwarning("Uyarı","Filtreye uyan kayıt bulunamadı."); return
-        self.children, self.roots = build_tree(self.people)
-
-        start_from=None
         root_sel = self.cmb_root.get()
-        if root_sel and root_sel!="Otomatik (Kökler)":
-            sf = root_sel.split(" — ")[0].strip()
-            if sf in self.people: start_from = sf
+        sf = root_sel.split(" — ")[0].strip() if (root_sel and root_sel!="Otomatik (Kökler)") else None
 
         self.show_dept = self.var_show_dept.get()
         self.show_mail = self.var_show_mail.get()
-        self.color_style = "bg" if self.cmb_style.get()=="Arka plan" else "stripe"
-
-        self.render_img, self.node_bboxes = draw_chart(
-            self.people, self.children, self.roots, start_from,
-            scale=self.scale, title_colors=self.title_colors,
-            show_dept=self.show_dept, show_mail=self.show_mail,
-            highlight_user=self.highlight_user, color_style=self.color_style,
-            add_legend=True
-        )
-        self.preview_img = self.render_img
+        self.color_style, self.badges = COLOR_STYLES[self.cmb_style.get()], self.var_badges.get()
+        self.compact = self.var_compact.get()
+        data, scale, colors = self.data, self.scale, dict(self.title_colors)
+        show_dept, show_mail, style, compact, badges = self.show_dept, self.show_mail, self.color_style, self.compact, self.badges
+        levels = 0 if self.cmb_levels.get() == "Tümü" else int(self.cmb_levels.get())
+        key = (dept, sf, levels)
+        fold = self.fold if key == self._fold_key else None
+        watch = self.var_watch.get()   # izlenen şemada konturlar saklanır (yeniden okumada artımlı yerleşim)
+
+        def work(job):
+            job.progress("Model hazırlanıyor...")
+            model = data.model_for(dept)
+            if not model: return model, None, None, None
+            start_from = model.index.get(sf) if sf else None
+            f = fold
+            if f is None and (levels or change or watch):
+                roots = chart_roots(model, start_from)
+                job.progress(f"Yerleşim hesaplanıyor ({len(model)} kişi)...")
+                f = FoldableLayout(model, roots, compact, collapse_below(model, roots, levels) if levels else ())
+            elif f is not None and f.compact != compact:
+                f = FoldableLayout(model, f.roots, compact, f.collapsed)
+            if change:
+                # paylaşılan katlama durumu değişmesin: iş iptal edilirse ekrandaki şemayla uyuşmazdı;
+                # kopya _on_chart'ta sahneyle birlikte yerleşir
+                if f is fold: f = fold.copy()
+                change(f)
+            if f is not None: layouts = f.layouts()
+            else:
+                job.progress(f"Yerleşim hesaplanıyor ({len(model)} kişi)...")
+                layouts = data.layouts_for(dept, start_from, compact)
+            job.progress("Şema hazırlanıyor...")
+            scene = ChartScene(model, start_from, scale=scale, title_colors=colors,
+                               show_dept=show_dept, show_mail=show_mail, highlight=None, color_style=style,
+                               add_legend=True, compact=compact, layouts=layouts,
+                               collapsed=f.collapsed if f is not None else (), badges=badges)
+            return model, start_from, scene, f
+        self.worker.submit("chart", work, lambda r: self._on_chart(r, dept, key, focus), self._on_job_error)
+
+    def _on_chart(self, result, dept: Optional[str], key=None, focus: Optional[str] = None):
+        model, start_from, scene, fold = result
+        if not model:
+            messagebox.showwarning("Uyarı","Filtreye uyan kayıt bulunamadı."); return
+        # iş sürerken değişen görünüm ayarlarını uygula (yerleşim etkilenmez)
+        scene.set_display(self.show_dept, self.show_mail, self.color_style, self.badges)
+        scene.set_colors(self.title_colors)
+        scene.set_highlight(model.index.get(self.highlight_user))
+        if key != self._fold_key:   # başka departman/başlangıç: arama sonuçları geçersiz; Enter yeniden arar
+            self.search_hits = []; self.lbl_search.configure(text="")
+        self.model, self.scene, self.fold, self._fold_key = model, scene, fold, key
+        self.node_bboxes = scene.bboxes
+        self.view_ratio = self.scale / scene.scale
+        if self._stats_win is not None: self._fill_stats()
+        if TRACE.enabled:
+            TRACE.gauge("scene.people", len(scene.bboxes)); TRACE.gauge("scene.items", len(scene.items))
+            TRACE.gauge("scene.pixels", scene.width * scene.height)
         self._paint_preview()
+        if focus: self._center_on_user(focus)
 
         self.btn_export_png.configure(state="normal")
-        self.btn_export_pdf.configure(state="normal")
+        self.btn_export_pdf.configure(state="normal"); self.btn_export_svg.configure(state="normal")
 
-        info = f"Şema: {len(self.people)} | Kök: {len(self.roots)} | Ölçek: {int(self.scale*100)}%"
-        if start_from: info += f" | Başlangıç: {start_from}"
+        info = f"Şema: {len(model)} | Kök: {len(model.roots)} | Ölçek: {int(self.scale*100)}%"
+        if start_from is not None: info += f" | Başlangıç: {model.users[start_from]}"
         if dept: info += f" | Departman: {dept}"
         self.status.configure(text=info)
 
+    # ---- Dosya izleme / artımlı yeniden okuma ----
+    def on_watch(self):
+        if self.var_watch.get() and self.scene is not None and self.fold is None: self.on_relayout()
+
+    def _poll_watch(self):
+        """
+        İzleme açıkken yüklü dosyanın boyut/mtime'ı yoklanır. Değişiklik, yazma bitsin diye
+        iki yoklama boyunca aynı kaldığında okunur.
+        """
+        try:
+            if self.var_watch.get() and self.data is not None:
+                sig = self._file_sig(self.data.path)
+                if sig is None or sig == self._watch_sig: self._watch_seen = None
+                elif sig != self._watch_seen: self._watch_seen = sig
+                else:
+                    self._watch_sig, self._watch_seen = sig, None
+                    self._reload()
+        finally:
+            self.after(WATCH_POLL_MS, self._poll_watch)
+
+    def _reload(self):
+        """
+        İzlenen dosyayı yeniden okur ve yüklü tabloyla karşılaştırır (eklenen, çıkan, taşınan,
+        düzenlenen). Yerleşim eskisinden türetilir (yalnız değişen alt ağaçlar), karolardan
+        yalnız değişen bölgeler yeniden çizilir.
+        """
+        old_data, old_scene, old_fold, key = self.data, self.scene, self.fold, self._fold_key
+        path = old_data.path
+        def work(job):
+            job.progress(f"Değişiklik okunuyor: {os.path.basename(path)}")
+            table, entry = load_table_cached(path)
+            data = ChartData(path, table, build_people(table), cache=entry)
+            diff = diff_models(old_data.model_all, data.model_all)
+            chart = None
+            if diff and old_scene is not None and old_fold is not None and key is not None:
+                dept, sf, _ = key
+                model = data.model_for(dept)
+                if model:
+                    job.progress("Değişen alt ağaçlar yerleşiyor...")
+                    start_from = model.index.get(sf) if sf else None
+                    model.carry_stats(old_scene.model, diff)   # ekip toplamları: yalnız değişenlerin ata yolları
+                    fold = old_fold.rebase(model, chart_roots(model, start_from), diff)
+                    scene = old_scene.rebuilt(model, start_from, fold.layouts(), fold.collapsed)
+                    chart = (model, start_from, scene, fold, scene.dirty_since(old_scene))
+            if diff:
+                data.report()
+                job.progress("Arama dizini hazırlanıyor..."); data.search_index()
+            return data, diff, chart
+        self.worker.submit("load", work, lambda r: self._on_reloaded(r, old_data, old_scene, old_fold),
+                           lambda e: self.status.configure(text=f"Değişen dosya okunamadı: {e}"))
+
+    def _on_reloaded(self, result, old_data: ChartData, old_scene, old_fold):
+        data, diff, chart = result
+        stamp = f"{os.path.basename(data.path)} güncellendi ({time.strftime('%H:%M')}): {diff.summary()}"
+        if not diff or self.data is not old_data:
+            if not diff: self.status.configure(text=stamp)
+            return
+        self.data, self.table = data, data.table
+        self._fill_pickers(); self.refresh_position_list(); self._show_report_state()
+        if chart is None or self.scene is not old_scene or self.fold is not old_fold:
+            # iş sürerken şema yeniden kuruldu: yeni tabloyla baştan
+            self.fold = self._fold_key = None
+            self.status.configure(text=stamp); self.on_relayout(); return
+        model, start_from, scene, fold, dirty = chart
+        # iş sürerken değişen görünüm ayarları / vurgu
+        parts = [scene.set_display(self.show_dept, self.show_mail, self.color_style, self.badges),
+                 scene.set_colors(self.title_colors), scene.set_highlight(model.index.get(self.highlight_user))]
+        self.model, self.scene, self.fold = model, scene, fold
+        self.node_bboxes = scene.bboxes
+        if self._stats_win is not None: self._fill_stats()
+        if dirty is None or any(p is None for p in parts):
+            self._paint_preview(); redrawn = "tümü"
+        else:
+            keys = self.tiles.replace_scene(scene, dirty + [r for p in parts for r in p])
+            vw, vh = self.tiles.view_size()
+            self.canvas.config(scrollregion=(0,0,vw,vh))
+            shown = keys & self._tile_items.keys()
+            for k in shown:
+                item, photo = self._tile_items[k]
+                self._tile_items[k] = (item, self._update_photo(item, photo, self.tiles.get(*k)))
+            redrawn = len(shown)
+            self._update_tiles(); self._draw_minimap(); self._schedule_pyramid()
+        self.search_hits = []; self.lbl_search.configure(text="")   # sonuçlar eski tablonun; Enter yeniden arar
+        self.status.configure(text=f"{stamp} | yeniden yerleşen: {fold.updated}/{len(scene.bboxes)} kart | yeniden çizilen karo: {redrawn}")
+
+    def _on_job_error(self, e: Exception):
+        messagebox.showerror("Hata", f"İşlem tamamlanamadı:\n{e}")
+
+    def _poll_worker(self):
+        try:
+            for ev, job, val in self.worker.poll():
+                if ev == "progress": self.status.configure(text=val)
+                elif ev == "done": job.on_done(val)
+                elif job.on_error: job.on_error(val)
+        finally:
+            self.after(WORKER_POLL_MS, self._poll_worker)
+
     def on_redraw(self):
-        if self.df is None or not self.people: return
-        self.on_relayout()
+        """Görünüm ayarları değişti: yerleşim korunur, yalnız etkilenen karolar çizilir."""
+        if self.table is None or not self.model: return
+        if self.scene is None or self.var_compact.get() != self.compact:
+            self.on_relayout(); return
+        self.show_dept = self.var_show_dept.get()
+        self.show_mail = self.var_show_mail.get()
+        self.color_style, self.badges = COLOR_STYLES[self.cmb_style.get()], self.var_badges.get()
+        dirty = self.scene.set_display(self.show_dept, self.show_mail, self.color_style, self.badges)
+        colors = self.scene.set_colors(self.title_colors)
+        if dirty is None or colors is None: self._paint_preview()
+        elif dirty or colors: self._refresh_region(dirty + colors)
 
     def on_zoom(self, _=None):
-        if self.df is None: return
+        if self.table is None: return
         v = max(50, min(200, int(float(self.zoom.get()))))
         new_scale = v/100.0
-        if self.var_fast.get() and self.render_img is not None:
+        if self.var_fast.get() and self.scene is not None:
+            # mevcut sahneden ölçekli karolar; yalnızca görünen kısım çizilir
             self.scale = new_scale
-            new_w = max(1,int(self.render_img.width * self.scale))
-            new_h = max(1,int(self.render_img.height * self.scale))
-            self.preview_img = self.render_img.resize((new_w,new_h), Image.BILINEAR)
-            self._paint_preview()
+            self.view_ratio = new_scale / self.scene.scale
+            with TRACE.span("ui.zoom", ratio=self.view_ratio): self._paint_preview()
         else:
             self.scale = new_scale
             self.on_relayout()
 
     def _paint_preview(self):
-        if self.preview_img is None: return
-        tkimg = self._pil_to_tk(self.preview_img); self.render_tk = tkimg
-        self.canvas.delete("all")
-        self.canvas.create_image(0,0, anchor="nw", image=self.render_tk)
-        self.canvas.config(scrollregion=(0,0,self.preview_img.width, self.preview_img.height))
+        if self.scene is None: return
+        if TRACE.enabled: TRACE.gauge("view.pixels", int(self.scene.width*self.view_ratio) * int(self.scene.height*self.view_ratio))
+        self.tiles.set_scene(self.scene, self.view_ratio)
+        self.canvas.delete("all"); self._tile_items.clear(); self._hide_tip()
+        vw, vh = self.tiles.view_size()
+        self.canvas.config(scrollregion=(0,0,vw,vh))
+        self._update_tiles()
+        self._draw_minimap(); self._schedule_pyramid()
+
+    # ---- Karo ön-izleme ----
+    def _on_xscroll(self, *a):
+        self.hbar.set(*a); self._schedule_tiles()
+
+    def _on_yscroll(self, *a):
+        self.vbar.set(*a); self._schedule_tiles()
+
+    def _schedule_tiles(self):
+        if self._tiles_pending: return
+        self._tiles_pending = True
+        self.after_idle(self._update_tiles)
+
+    def _update_tiles(self):
+        """Görünür bölgeyi (bir karo pay ile) kaplayan karoları canvas'a koyar, dışarıdakileri atar."""
+        self._tiles_pending = False
+        if self.scene is None: return
+        T = self.tiles.tile
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        x1, y1 = x0 + self.canvas.winfo_width(), y0 + self.canvas.winfo_height()
+        want = set(self.tiles.tiles_for(x0-T, y0-T, x1+T, y1+T))
+        with TRACE.span("ui.tiles") as sp:
+            for k in [k for k in self._tile_items if k not in want]:
+                self.canvas.delete(self._tile_items.pop(k)[0])
+            new = [k for k in want if k not in self._tile_items]
+            for tx,ty in new:
+                img = self.tiles.get(tx,ty)
+                with TRACE.span("tk.convert"): photo = self._pil_to_tk(img)
+                item = self.canvas.create_image(tx*T, ty*T, anchor="nw", image=photo)
+                self._tile_items[(tx,ty)] = (item, photo)
+            sp.set(shown=len(want), added=len(new))
+        self._update_minimap_view()
+
+    def _refresh_region(self, rects):
+        """Sahne koordinatındaki bölgeleri yeniden çizer; ekrandaki karolar yerinde güncellenir."""
+        for k in self.tiles.refresh(rects):
+            if k not in self._tile_items: continue
+            item, photo = self._tile_items[k]
+            self._tile_items[k] = (item, self._update_photo(item, photo, self.tiles.get(*k)))
+        self._schedule_pyramid()
+
+    # ---- Zoom piramidi / genel bakış ----
+    def _schedule_pyramid(self):
+        """Genel bakış ve komşu zoom düzeyleri eksikse arka planda hazırlanır (görünür bölge önce)."""
+        if not self.tiles.needs_build(): return
+        scene, r = self.scene, self.view_ratio or 1.0
+        x0, y0 = self.canvas.canvasx(0) / r, self.canvas.canvasy(0) / r
+        around = (x0, y0, x0 + self.canvas.winfo_width() / r, y0 + self.canvas.winfo_height() / r)
+        self.worker.submit("pyramid", lambda job: self.tiles.build_pyramid(scene, around),
+                           lambda _: self._draw_minimap(), lambda e: None)
+
+    def _draw_minimap(self):
+        self.minimap.delete("all"); self._mini_rect = None
+        ov = self.tiles.overview
+        if ov is None or self.scene is None: self._mini_photo = None; return
+        self._mini_photo = self._pil_to_tk(ov)
+        self.minimap.create_image(0, 0, anchor="nw", image=self._mini_photo)
+        self._mini_rect = self.minimap.create_rectangle(0, 0, 0, 0, outline="#dc3545", width=2)
+        self._update_minimap_view()
+
+    def _update_minimap_view(self):
+        """Mini haritada ana görünümün kapladığı dikdörtgen."""
+        if self._mini_rect is None: return
+        k = self.tiles.overview_ratio / (self.view_ratio or 1.0)   # görünüm -> mini harita
+        x0, y0 = self.canvas.canvasx(0)*k, self.canvas.canvasy(0)*k
+        x1, y1 = x0 + self.canvas.winfo_width()*k, y0 + self.canvas.winfo_height()*k
+        self.minimap.coords(self._mini_rect, x0, y0, max(x1, x0+3), max(y1, y0+3))
+
+    def on_minimap(self, event):
+        """Mini haritada tıklanan/sürüklenen noktayı ana görünümün ortasına getirir."""
+        if self._mini_rect is None: return
+        k = (self.view_ratio or 1.0) / self.tiles.overview_ratio   # mini harita -> görünüm
+        pw, ph = self.tiles.view_size()
+        self.canvas.xview_moveto(max(0.0, (event.x*k - self.canvas.winfo_width()/2) / max(1, pw)))
+        self.canvas.yview_moveto(max(0.0, (event.y*k - self.canvas.winfo_height()/2) / max(1, ph)))
 
     def _center_on_user(self, username: str):
         """Bulunduğunda kişiyi ekrana getir (merkezle)."""
-        if not self.preview_img or username not in self.node_bboxes:
+        i = self.model.index.get(username)
+        if self.scene is None or i not in self.node_bboxes:
             return
         # bbox render ölçeğinde; önizleme ölçeğine çevir
-        ratio_x = self.preview_img.width  / self.render_img.width
-        ratio_y = self.preview_img.height / self.render_img.height
-        x0,y0,x1,y1 = self.node_bboxes[username]
+        pw, ph = self.tiles.view_size()
+        ratio_x = ratio_y = self.view_ratio
+        x0,y0,x1,y1 = self.node_bboxes[i]
         cx = ((x0+x1)//2) * ratio_x
         cy = ((y0+y1)//2) * ratio_y
 
@@ -529,45 +646,343 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
         target_x = max(0, cx - view_w/2)
         target_y = max(0, cy - view_h/2)
 
-        frac_x = target_x / max(1, self.preview_img.width  - view_w)
-        frac_y = target_y / max(1, self.preview_img.height - view_h)
+        frac_x = target_x / max(1, pw)
+        frac_y = target_y / max(1, ph)
         self.canvas.xview_moveto(min(1.0, max(0.0, frac_x)))
         self.canvas.yview_moveto(min(1.0, max(0.0, frac_y)))
 
-    def on_search(self):
-        q = (self.ent_search.get() or "").strip().lower()
-        if not q or not self.people: return
-        found = None
-        for u,p in self.people.items():
-            if q in u.lower() or q in (p.full_name or "").lower():
-                found = u; break
-        if not found:
-            messagebox.showinfo("Bilgi","Eşleşme bulunamadı."); return
-        self.highlight_user = found
+    # ---- Fare: seçim / ipucu / yeniden köklendirme ----
+    def _hit(self, event) -> Optional[int]:
+        """Olay konumundaki kart; ön-izleme koordinatı render ölçeğine çevrilir, sahne ızgarasında aranır."""
+        if self.scene is None: return None
+        r = self.view_ratio or 1.0
+        return self.scene.hit(self.canvas.canvasx(event.x) / r, self.canvas.canvasy(event.y) / r)
+
+    def on_canvas_click(self, event):
+        i = self._hit(event)
+        if i is None: return
+        u = self.model.users[i]
+        self.set_highlight(u)
+        self.status.configure(text=f"Seçili: {u} — {self.model.names[i]} ({self.model.title(i)})")
+
+    def on_canvas_toggle(self, event):
+        """Çift tık: yöneticinin alt ağacını aç/kapat (kart yerinde kalacak şekilde ortalanır)."""
+        i = self._hit(event)
+        if i is None or not self.model.has_kids(i): return
+        self.on_relayout(change=lambda f: f.toggle(i), focus=self.model.users[i])
+
+    def on_canvas_reroot(self, event):
+        """Sağ tık: şemayı bu kişiden başlat (Başlangıç seçimi güncellenir)."""
+        i = self._hit(event)
+        if i is None: return
+        self._hide_tip()
+        self.cmb_root.set(f"{self.model.users[i]} — {self.model.names[i]}")
         self.on_relayout()
-        self.after(50, lambda: self._center_on_user(found))  # görüntü çizildikten hemen sonra merkeze al
+
+    def on_canvas_motion(self, event):
+        i = self._hit(event)
+        if i is None:
+            if self._hover is not None: self._hide_tip()
+            return
+        if i != self._hover:
+            self._hover = i
+            self.canvas.configure(cursor="hand2")
+            self._show_tip(self._tip_text(i))
+        self._tip.geometry(f"+{event.x_root+16}+{event.y_root+18}")
+
+    def _tip_text(self, i: int) -> str:
+        m = self.model
+        lines = [m.names[i] or m.users[i], m.title(i), m.dept(i), m.mails[i], f"Kullanıcı: {m.users[i]}"]
+        if m.parent[i] >= 0: lines.append(f"Yönetici: {m.names[m.parent[i]]}")
+        n = len(m.kids(i))
+        if n:
+            st = m.stats()
+            lines.append(f"Doğrudan bağlı: {n} | Ekip: {st.size[i] - 1} kişi | Derinlik: {st.depth[i]}")
+        return "\n".join(x for x in lines if x)
+
+    def _show_tip(self, text: str):
+        if self._tip is None:
+            self._tip = tk.Toplevel(self); self._tip.wm_overrideredirect(True)
+            self._tip_label = tk.Label(self._tip, justify="left", background="#ffffe8", relief="solid", borderwidth=1, padx=6, pady=4)
+            self._tip_label.pack()
+        self._tip_label.configure(text=text)
+        self._tip.deiconify()
+
+    def _hide_tip(self):
+        self._hover = None
+        self.canvas.configure(cursor="")
+        if self._tip is not None: self._tip.withdraw()
+
+    def on_search(self):
+        """
+        Yazdıkça arar (yüklemede kurulan dizinle); ilk eşleşme vurgulanıp ortalanır, yeniden
+        çizim yok. Eşleşme katlanmış bir alt ağaçtaysa yalnız görünen atası gösterilir.
+        """
+        q = self.var_search.get().strip()
+        self.search_hits, self.search_pos = [], 0
+        if not q or self.data is None or self.scene is None:
+            self.lbl_search.configure(text=""); return
+        users_all, index, boxes, fold = self.data.model_all.users, self.model.index, self.node_bboxes, self.fold
+        def shown(i):   # şemada (katlanmış bir yöneticinin altında olsa da)
+            j = index.get(users_all[i])
+            return j in boxes or (j is not None and fold is not None and fold.contains(j))
+        ids = self.data.search_index().search(q, accept=shown)
+        self.search_hits = [users_all[i] for i in ids]
+        if not ids:
+            self.lbl_search.configure(text="0 sonuç"); return
+        self._show_hit(reveal=False)
+
+    def step_search(self, d: int):
+        """
+        Sonuçlar arasında ileri/geri (Enter / Shift+Enter); katlanmış alt ağaçtaki sonucun
+        ataları açılır. Yazarken bulunan sonuç katlıysa ilk Enter onu açar.
+        """
+        if not self.search_hits: self.on_search(); return
+        if not (self._hit_folded and d > 0): self.search_pos = (self.search_pos + d) % len(self.search_hits)
+        self._show_hit(reveal=True)
+
+    def _show_hit(self, reveal: bool):
+        n = len(self.search_hits)
+        self.lbl_search.configure(text=f"{self.search_pos+1}/{n}{'+' if n >= SEARCH_LIMIT else ''}")
+        u = self.search_hits[self.search_pos]
+        i = self.model.index[u]
+        text = f"Bulunan: {u} — {self.model.names[i]} ({self.model.title(i)})"
+        self._hit_folded = not reveal and i not in self.node_bboxes
+        if self._hit_folded:   # yazarken yeniden yerleşim yok: kartı görünen (katlı) ata vurgulanır
+            a = self.model.parent[i]
+            while a not in self.node_bboxes: a = self.model.parent[a]
+            self.set_highlight(self.model.users[a]); self._center_on_user(self.model.users[a])
+            text += f" | {self.model.names[a] or self.model.users[a]} altında katlı; Enter ile aç"
+        else: self._focus_user(u)
+        self.status.configure(text=text)
+
+    def _focus_user(self, u: str):
+        """Kişiyi vurgulayıp ortalar; katlanmış alt ağaçtaysa ataları açılır."""
+        i = self.model.index[u]
+        if i in self.node_bboxes: self.set_highlight(u); self._center_on_user(u)
+        else:
+            self.highlight_user = u
+            self.on_relayout(change=lambda f: f.reveal(i), focus=u)
 
     def clear_highlight(self):
-        self.highlight_user=None; self.on_relayout()
+        self.set_highlight(None)
+
+    def set_highlight(self, username: Optional[str]):
+        """Vurguyu değiştirir; yalnızca eski ve yeni kartın karoları yeniden çizilir."""
+        self.highlight_user = username
+        if self.scene is None: return
+        self._refresh_region(self.scene.set_highlight(self.model.index.get(username)))
 
     def on_export(self, fmt):
-        if self.render_img is None: return
-        if fmt=="png":
-            path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG","*.png")], title="PNG olarak kaydet")
-            if not path: return
-            try: save_png(self.render_img, path); messagebox.showinfo("Kaydedildi", f"PNG: {path}")
-            except Exception as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}")
+        if self.scene is None: return
+        path = filedialog.asksaveasfilename(defaultextension=f".{fmt}", filetypes=[(fmt.upper(), f"*.{fmt}")],
+                                            title=f"{fmt.upper()} olarak kaydet")
+        if not path: return
+        scene, paper = self.scene, self.var_paper.get()
+        def work(job):
+            job.progress(f"{fmt.upper()} hazırlanıyor...")
+            TRACE.gauge("export.pixels", scene.width * scene.height)
+            if fmt == "png":
+                # şerit şerit akıtılır; tam boy görüntü bellekte oluşmaz
+                export_png(scene, path, progress=lambda f: job.progress(f"PNG yazılıyor... %{int(f*100)}"))
+            elif fmt == "pdf" and paper in PAPER_SIZES:
+                # yatay A4/A3 sayfalar; her sayfa ayrı çizilip dosyaya akıtılır
+                export_pdf_pages(scene, path, paper, progress=lambda f: job.progress(f"PDF sayfaları yazılıyor... %{int(f*100)}"))
+            elif fmt == "pdf": export_pdf(scene, path)   # vektör: seçilebilir metin, boyut kişi sayısıyla büyür
+            else: export_svg(scene, path)
+            return path
+        self.worker.submit("export", work,
+                           lambda p: (self.status.configure(text=f"Kaydedildi: {p}"), messagebox.showinfo("Kaydedildi", f"{fmt.upper()}: {p}")),
+                           lambda e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}"))
+
+    # ---- Ölçüm (F12) ----
+    _TRACE_STEPS = (("okuma", ("job.load",)), ("yerleşim", ("layout", "fold.init", "fold.toggle", "fold.rebase")),
+                    ("sahne", ("scene",)), ("karolar", ("ui.tiles",)), ("dışa aktarma", ("job.export",)))
+
+    def _poll_trace(self):
+        """Ölçüm açıkken durum çubuğu özeti ve (açıksa) panel yenilenir; kapalıyken yalnız bayrak denetimi."""
+        try:
+            if TRACE.enabled:
+                parts = [f"{label} {last[1]:.0f} ms" for label, names in self._TRACE_STEPS
+                         for last in (TRACE.last(*names),) if last]
+                c = TRACE.counts()
+                parts.append(f"karo {c.get('tiles.drawn', 0)} çizildi / {c.get('tiles.hit', 0)} önbellek")
+                self.lbl_trace.configure(text=" · ".join(parts))
+            elif self.lbl_trace.cget("text"): self.lbl_trace.configure(text="")
+            if self._trace_win is not None: self._fill_trace_panel()
+        finally:
+            self.after(TRACE_POLL_MS, self._poll_trace)
+
+    def show_trace_panel(self):
+        """Aşama süreleri ve sayaçlar; iz (JSON) ve cProfile kaydı."""
+        if self._trace_win is not None: self._trace_win.lift(); return
+        win = self._trace_win = tk.Toplevel(self); win.title("Ölçüm"); win.geometry("620x520")
+        win.protocol("WM_DELETE_WINDOW", self._close_trace_panel)
+        b = ttk.Frame(win); b.pack(fill=tk.X, padx=8, pady=8)
+        self.var_trace = tk.BooleanVar(value=TRACE.enabled)
+        ttk.Checkbutton(b, text="Ölçüm açık", variable=self.var_trace, command=lambda: TRACE.enable(self.var_trace.get())).pack(side=tk.LEFT)
+        ttk.Button(b, text="Sıfırla", command=TRACE.reset).pack(side=tk.LEFT, padx=6)
+        ttk.Button(b, text="İzi Kaydet (JSON)", command=self.save_trace).pack(side=tk.LEFT, padx=6)
+        self.btn_profile = ttk.Button(b, text="Profili Başlat", command=self.toggle_profile)
+        self.btn_profile.pack(side=tk.LEFT, padx=6)
+        cols = ("adet", "son", "toplam", "en uzun")
+        self.tree_trace = ttk.Treeview(win, columns=cols, height=14)
+        self.tree_trace.heading("#0", text="Aşama"); self.tree_trace.column("#0", width=200)
+        for c in cols:
+            self.tree_trace.heading(c, text=c if c == "adet" else f"{c} (ms)"); self.tree_trace.column(c, width=90, anchor="e")
+        self.tree_trace.pack(fill=tk.BOTH, expand=True, padx=8)
+        self.lbl_counters = ttk.Label(win, text="", justify="left", anchor="w", foreground="#444", wraplength=600)
+        self.lbl_counters.pack(fill=tk.X, padx=8, pady=8)
+        self._fill_trace_panel()
+
+    def _close_trace_panel(self):
+        self._trace_win.destroy(); self._trace_win = None
+
+    def _fill_trace_panel(self):
+        self.tree_trace.delete(*self.tree_trace.get_children())
+        for name, n, last, total, mx in TRACE.summary():
+            self.tree_trace.insert("", "end", text=name, values=(n, f"{last:.1f}", f"{total:.1f}", f"{mx:.1f}"))
+        c = sorted(TRACE.counts().items())
+        self.lbl_counters.configure(text="  ".join(f"{k}={v:,}" for k, v in c) or "Sayaç yok (ölçüm kapalı ya da sıfırlandı).")
+        self.btn_profile.configure(text="Profili Durdur ve Kaydet" if TRACE.profiling else "Profili Başlat")
+
+    def save_trace(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Trace JSON","*.json")],
+                                            title="İzi kaydet (chrome://tracing / Perfetto)")
+        if not path: return
+        try: TRACE.write_json(path)
+        except OSError as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}"); return
+        self.status.configure(text=f"İz kaydedildi: {path}")
+
+    def toggle_profile(self):
+        """cProfile: arayüz iş parçacığı ve arka plan işleri; durdurunca .prof (pstats) dosyası yazılır."""
+        if not TRACE.profiling:
+            TRACE.start_profile(); self._fill_trace_panel(); return
+        path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("pstats","*.prof")], title="Profili kaydet")
+        try: TRACE.stop_profile(path or None)
+        except OSError as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}")
         else:
-            path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF","*.pdf")], title="PDF olarak kaydet")
-            if not path: return
-            try: save_pdf(self.render_img, path); messagebox.showinfo("Kaydedildi", f"PDF: {path}")
-            except Exception as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}")
+            if path: self.status.configure(text=f"Profil kaydedildi: {path} (python -m pstats {os.path.basename(path)})")
+        self._fill_trace_panel()
+
+    # ---- Veri sorunları ----
+    def _show_report_state(self):
+        """Yüklü tablonun hiyerarşi raporu; düğme metni ve (açıksa) liste güncellenir."""
+        report = self.data.report()
+        self.btn_issues.configure(text=f"⚠ Veri sorunları ({len(report)})" if report else "Veri sorunu yok", state="normal")
+        if self._issues_win is not None: self._fill_issues()
+        return report
+
+    def show_issues(self):
+        """Döngü, kendine bağlı, bulunamayan yönetici ve tekrarlanan kullanıcı listesi; çift tık kişiyi gösterir."""
+        if self.data is None: return
+        if self._issues_win is not None: self._issues_win.lift(); return
+        win = self._issues_win = tk.Toplevel(self); win.title("Veri Sorunları"); win.geometry("760x440")
+        win.protocol("WM_DELETE_WINDOW", self._close_issues)
+        b = ttk.Frame(win); b.pack(fill=tk.X, padx=8, pady=8)
+        self.lbl_issues = ttk.Label(b, text=""); self.lbl_issues.pack(side=tk.LEFT)
+        ttk.Button(b, text="CSV Olarak Kaydet", command=self.save_issues).pack(side=tk.RIGHT)
+        self.tree_issues = ttk.Treeview(win, columns=("sorun", "kullanici", "ayrinti"), show="headings")
+        for c, t, w in (("sorun", "Sorun", 170), ("kullanici", "Kullanıcı Adı", 140), ("ayrinti", "Ayrıntı", 420)):
+            self.tree_issues.heading(c, text=t); self.tree_issues.column(c, width=w, anchor="w")
+        self.tree_issues.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0,8))
+        self.tree_issues.bind("<Double-1>", self.on_issue_pick)
+        self._fill_issues()
+
+    def _close_issues(self):
+        self._issues_win.destroy(); self._issues_win = None
+
+    def _fill_issues(self):
+        report = self.data.report()
+        self.tree_issues.delete(*self.tree_issues.get_children())
+        for row in report.rows(): self.tree_issues.insert("", "end", values=row)
+        self.lbl_issues.configure(text=f"{os.path.basename(self.data.path)}: {report.summary()}")
+
+    def on_issue_pick(self, _):
+        sel = self.tree_issues.selection()
+        if not sel: return
+        u = self.tree_issues.item(sel[0], "values")[1]
+        if u in self.model.index: self._focus_user(u)
+        else: self.status.configure(text=f"{u} şu anki şemada yok (departman / başlangıç seçimini değiştirin).")
+
+    def save_issues(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Veri sorunlarını kaydet")
+        if not path: return
+        try: save_report(self.data.report(), path)
+        except OSError as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}"); return
+        self.status.configure(text=f"Veri sorunları kaydedildi: {path}")
+
+    # ---- Ekip tablosu ----
+    def show_stats(self):
+        """Şemadaki yöneticilerin ekip / doğrudan bağlı / derinlik tablosu; başlığa tıklayınca sıralanır, çift tık kişiyi gösterir."""
+        if not self.model: return
+        if self._stats_win is not None: self._stats_win.lift(); return
+        win = self._stats_win = tk.Toplevel(self); win.title("Ekipler"); win.geometry("900x520")
+        win.protocol("WM_DELETE_WINDOW", self._close_stats)
+        b = ttk.Frame(win); b.pack(fill=tk.X, padx=8, pady=8)
+        self.lbl_stats = ttk.Label(b, text=""); self.lbl_stats.pack(side=tk.LEFT)
+        ttk.Button(b, text="CSV Olarak Kaydet", command=self.save_stats).pack(side=tk.RIGHT)
+        cols = [f"c{k}" for k in range(len(STATS_COLUMNS))]
+        self.tree_stats = ttk.Treeview(win, columns=cols, show="headings")
+        for k, (c, t, w) in enumerate(zip(cols, STATS_COLUMNS, (120, 170, 120, 150, 70, 100, 70))):
+            self.tree_stats.heading(c, text=t, command=lambda k=k: self.on_stats_sort(k))
+            self.tree_stats.column(c, width=w, anchor="e" if k >= 4 else "w")
+        self.tree_stats.pack(fill=tk.BOTH, expand=True, padx=8)
+        self.lbl_breakdown = ttk.Label(win, text="", foreground="#444", wraplength=860, justify="left")
+        self.lbl_breakdown.pack(fill=tk.X, padx=8, pady=8)
+        self.tree_stats.bind("<<TreeviewSelect>>", self.on_stats_select)
+        self.tree_stats.bind("<Double-1>", self.on_stats_pick)
+        self._fill_stats()
+
+    def _close_stats(self):
+        self._stats_win.destroy(); self._stats_win = None
+
+    def _fill_stats(self):
+        """Şu anki şemanın modeli; sıralama tüm yöneticiler üzerinden, ilk STATS_ROWS satır gösterilir."""
+        rows = self.model.stats().rows()
+        k, desc = self._stats_sort
+        if k != 4 or not desc: rows.sort(key=lambda r: (r[k], r[0]) if k >= 4 else (r[k].lower(), r[0]), reverse=desc)
+        self.tree_stats.delete(*self.tree_stats.get_children())
+        for r in rows[:STATS_ROWS]: self.tree_stats.insert("", "end", values=r)
+        shown = f" (ilk {STATS_ROWS})" if len(rows) > STATS_ROWS else ""
+        self.lbl_stats.configure(text=f"{len(rows)} yönetici{shown} | {len(self.model)} kişi")
+        self.lbl_breakdown.configure(text="Dağılım için bir satır seçin.")
+
+    def on_stats_sort(self, k: int):
+        """Aynı başlık yönü çevirir; sayı sütunları önce büyükten küçüğe."""
+        col, desc = self._stats_sort
+        self._stats_sort = (k, not desc) if k == col else (k, k >= 4)
+        self._fill_stats()
+
+    def _stats_user(self) -> Optional[int]:
+        sel = self.tree_stats.selection()
+        return self.model.index.get(self.tree_stats.item(sel[0], "values")[0]) if sel else None
+
+    def on_stats_select(self, _):
+        """Seçili yöneticinin ekibinde departman ve pozisyon dağılımı (en kalabalık ilk 8)."""
+        u = self._stats_user()
+        if u is None: return
+        st = self.model.stats()
+        def fmt(items): return ", ".join(f"{n or '—'}: {c}" for n, c in items[:8]) + (f" … (+{len(items) - 8})" if len(items) > 8 else "")
+        self.lbl_breakdown.configure(text=f"{self.model.names[u]} ekibi ({st.size[u]} kişi, kendisi dahil)\n"
+                                          f"Departman: {fmt(st.breakdown(u))}\nPozisyon: {fmt(st.breakdown(u, 'title'))}")
+
+    def on_stats_pick(self, _):
+        u = self._stats_user()
+        if u is not None: self._focus_user(self.model.users[u])
+
+    def save_stats(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Ekip tablosunu kaydet")
+        if not path: return
+        try: save_stats(self.model.stats(), path)
+        except OSError as e: messagebox.showerror("Hata", f"Kaydedilemedi:\n{e}"); return
+        self.status.configure(text=f"Ekip tablosu kaydedildi: {path}")
 
     # ---- Renk paneli ----
     def refresh_position_list(self):
         self.tree_colors.delete(*self.tree_colors.get_children())
-        if self.df is None: return
-        titles = sorted({(t or "").strip() for t in self.df["Pozisyon"].dropna().unique()})
+        if self.table is None: return
+        titles = sorted({t.strip() for t in self.table["Pozisyon"] if t is not None})
         for t in titles:
             hexv = self._rgb_to_hex(self.title_colors.get(t)) if self.title_colors.get(t) else ""
             self.tree_colors.insert("", "end", values=(t, hexv))
@@ -612,7 +1027,20 @@ class OrgChartApp((TkinterDnD.Tk if DnDEnabled else tk.Tk)):
 
     @staticmethod
     def _pil_to_tk(img: Image.Image):
-        b = BytesIO(); img.save(b, "PNG"); return tk.PhotoImage(data=b.getvalue())
+        """PNG kodlama/çözme olmadan: ImageTk varsa doğrudan kopya, yoksa ham PPM."""
+        ImageTk = _image_tk()
+        if ImageTk is not None: return ImageTk.PhotoImage(img)
+        return tk.PhotoImage(data=ppm_bytes(img), format="PPM")
+
+    def _update_photo(self, item, photo, img: Image.Image):
+        """Aynı boyuttaki karoyu mevcut PhotoImage'a yazar (canvas öğesi yerinde kalır)."""
+        ImageTk = _image_tk()
+        if ImageTk is not None and isinstance(photo, ImageTk.PhotoImage) and (photo.width(), photo.height()) == img.size:
+            photo.paste(img); return photo
+        if isinstance(photo, tk.PhotoImage) and (photo.width(), photo.height()) == img.size:
+            photo.configure(data=ppm_bytes(img), format="PPM"); return photo
+        photo = self._pil_to_tk(img); self.canvas.itemconfigure(item, image=photo)
+        return photo
 
     @staticmethod
     def _rgb_to_hex(rgb: Optional[Tuple[int,int,int]]) -> str:
@@ -0,0 +1,159 @@
+# org_chart_cache.py
+# -*- coding: utf-8 -*-
+"""
+Kalıcı disk önbelleği: okunmuş (REQ_COLS'a normalleştirilmiş) tablo ve hesaplanmış
+yerleşimler, dosya içeriğinin özetiyle (blake2b) anahtarlanır. Değişmemiş dosya yeniden
+açıldığında Excel ayrıştırma ve yerleşim atlanır.
+
+    ~/.org_chart_cache/v1/
+        index.json                  yol -> [boyut, mtime_ns, anahtar]  (özet yeniden hesaplanmaz)
+        <anahtar>/table-2.pkl       {kolon: değer listesi}  (sütunlu, pickle; TABLE_VERSION)
+        <anahtar>/layout-<...>.pkl  (departman, başlangıç, kompakt) başına yerleşim dizileri
+
+Toplam boyut CACHE_MAX_BYTES'ı aşınca en uzun süredir kullanılmayan kayıtlar silinir
+(yükleme başına bir kez; yazma başına değil); silinen kayıtların indeks satırları da atılır.
+Önbellek hataları yüklemeyi hiçbir zaman bozmaz: okunamayan kayıt yok sayılır.
+"""
+
+import os, json, pickle, shutil, hashlib, threading
+from array import array
+from typing import Dict, Optional, Tuple
+
+from org_chart_core import DEFAULT_SETTINGS_FILE, REQ_COLS, Table, load_table
+
+CACHE_DIR = os.path.join(os.path.dirname(DEFAULT_SETTINGS_FILE), ".org_chart_cache", "v1")
+CACHE_MAX_BYTES = 512 * 2**20
+_HASH_CHUNK = 1 << 20
+LAYOUT_VERSION = 2   # yerleşim algoritması değişince artar; eski yerleşim kayıtları okunmaz
+TABLE_VERSION = 2    # tablo okuma kuralları değişince artar (2: pandas'sız CSV, sayılar metin olarak)
+_TABLE_FILE = f"table-{TABLE_VERSION}.pkl"
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f: f.write(data)
+    os.replace(tmp, path)
+
+def _read_pickle(path: str):
+    with open(path, "rb") as f: return pickle.load(f)
+
+def file_digest(path: str) -> str:
+    """Dosya içeriğinin blake2b özeti (önbellek anahtarı)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""): h.update(chunk)
+    return h.hexdigest()
+
+class DiskCache:
+    """Önbellek klasörü; dosya -> içerik anahtarı eşlemesi ve boyut sınırlı temizlik."""
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root, self.max_bytes = root, max_bytes
+        self._lock = threading.Lock()
+
+    def _index_path(self): return os.path.join(self.root, "index.json")
+
+    def _load_index(self) -> Dict[str, list]:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f: return json.load(f)
+        except Exception:
+            return {}
+
+    def file_key(self, path: str) -> str:
+        """
+        İçerik özeti. Yol, boyut ve mtime indeksteki kayıtla aynıysa dosya yeniden
+        okunmaz; değilse özet hesaplanıp indekse yazılır.
+        """
+        path = os.path.abspath(path); st = os.stat(path)
+        with self._lock:
+            index = self._load_index()
+            hit = index.get(path)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns: return hit[2]
+        key = file_digest(path)
+        with self._lock:
+            index = self._load_index(); index[path] = [st.st_size, st.st_mtime_ns, key]
+            os.makedirs(self.root, exist_ok=True)
+            _write_atomic(self._index_path(), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+        return key
+
+    def entry(self, path: str) -> Optional["CacheEntry"]:
+        """Dosyanın önbellek kaydı; dosya okunamıyor ya da klasör yazılamıyorsa None."""
+        try: return CacheEntry(self, self.file_key(path))
+        except OSError: return None
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        Toplam boyut sınırı aşılırsa en eski kullanılmış kayıtları siler (keep hariç); klasörü
+        olmayan anahtarların satırları indeksten atılır. Tüm kayıtları tarar: yüklemede bir kez çağrılır.
+        """
+        with self._lock:
+            try: names = [n for n in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, n))]
+            except OSError: return
+            entries = []
+            for n in names:
+                d = os.path.join(self.root, n)
+                try:
+                    files = [os.path.join(d, f) for f in os.listdir(d)]
+                    size = sum(os.path.getsize(f) for f in files)
+                    entries.append((os.path.getmtime(d), size, n))
+                except OSError: pass
+            total = sum(size for _, size, _ in entries)
+            for _, size, n in sorted(entries):
+                if total <= self.max_bytes: break
+                if n == keep: continue
+                shutil.rmtree(os.path.join(self.root, n), ignore_errors=True); total -= size
+            index = self._load_index()
+            alive = {k: v for k, v in index.items() if v[2] == keep or os.path.isdir(os.path.join(self.root, v[2]))}
+            if len(alive) != len(index):
+                try: _write_atomic(self._index_path(), json.dumps(alive, ensure_ascii=False).encode("utf-8"))
+                except OSError: pass
+
+class CacheEntry:
+    """Tek bir dosya içeriğinin (anahtar) önbellek kaydı: tablo ve yerleşimler."""
+    def __init__(self, cache: DiskCache, key: str):
+        self.cache, self.key = cache, key
+        self.dir = os.path.join(cache.root, key)
+
+    def _touch(self):
+        try: os.utime(self.dir)   # LRU: son kullanım zamanı
+        except OSError: pass
+
+    def _put(self, name: str, obj):
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            _write_atomic(os.path.join(self.dir, name), pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+            self._touch()
+        except OSError: pass
+
+    def table(self) -> Optional[Table]:
+        try: cols = _read_pickle(os.path.join(self.dir, _TABLE_FILE))
+        except Exception: return None
+        self._touch()
+        return Table({c: cols[c] for c in REQ_COLS})
+
+    def put_table(self, table: Table):
+        self._put(_TABLE_FILE, {c: list(table[c]) for c in REQ_COLS})
+
+    @staticmethod
+    def _layout_name(lkey: Tuple[str, Optional[int], bool]) -> str:
+        return "layout-" + hashlib.blake2b(repr((LAYOUT_VERSION, lkey)).encode("utf-8"), digest_size=8).hexdigest() + ".pkl"
+
+    def layouts(self, lkey: Tuple[str, Optional[int], bool]) -> Optional[list]:
+        """layout_forest biçiminde yerleşim ([(layout, sütun)]) ya da None."""
+        try: stored = _read_pickle(os.path.join(self.dir, self._layout_name(lkey)))
+        except Exception: return None
+        if stored[0] != lkey: return None
+        return [(dict(zip(ids, zip(xs, ds))), cols) for ids, xs, ds, cols in stored[1]]
+
+    def put_layouts(self, lkey: Tuple[str, Optional[int], bool], layouts: list):
+        rows = [(array("i", lay.keys()), array("d", (x for x, _ in lay.values())),
+                 array("d", (d for _, d in lay.values())), cols) for lay, cols in layouts]
+        self._put(self._layout_name(lkey), (lkey, rows))
+
+def load_table_cached(path: str, cache: Optional[DiskCache] = None) -> Tuple[Table, Optional[CacheEntry]]:
+    """load_table ile aynı tablo; içerik önbellekteyse ayrıştırma atlanır. (tablo, kayıt) döner."""
+    entry = (cache or DiskCache()).entry(path)
+    table = entry.table() if entry is not None else None
+    if table is None:
+        table = load_table(path)
+        if entry is not None: entry.put_table(table)
+    if entry is not None: entry.cache.evict(keep=entry.key)   # yükleme başına bir tarama (yerleşim yazımları dahil sınır)
+    return table, entry
@@ -0,0 +1,214 @@
+# org_chart_cli.py
+# -*- coding: utf-8 -*-
+"""
+Arayüzsüz (headless) organizasyon şeması üretimi — zamanlanmış işler için.
+tkinter yüklenmez; çizim org_chart_core üzerinden yapılır.
+
+    python org_chart_cli.py personel.xlsx -o sema.png
+    python org_chart_cli.py personel.xlsx --dept Satış --root ahmet.k --scale 1.5 -o satis.pdf
+    python org_chart_cli.py personel.xlsx --batch dept --out-dir ciktilar --format pdf -j 4
+    python org_chart_cli.py personel.xlsx -o sema.png --trace iz.json --profile sema.prof
+    python org_chart_cli.py personel.xlsx --report sorunlar.csv   (yalnız hiyerarşi denetimi)
+    python org_chart_cli.py personel.xlsx --stats ekipler.csv     (yönetici başına ekip / doğrudan bağlı / derinlik)
+    python org_chart_cli.py personel.xlsx --style headcount --badges -o ekip.png
+
+Toplu modda tablo bir kez okunur; model süreç havuzundaki işçilere başlangıçta
+bir kez aktarılır (her şema için yeniden ayrıştırılmaz).
+"""
+
+import os, re, sys, argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from org_chart_core import (
+    DEFAULT_SETTINGS_FILE, HEAT_STYLES, PNG_COMPRESS_LEVEL, ChartData, ChartScene, OrgModel,
+    load_table, build_people, load_title_colors, export_png, chart_roots, collapse_below, layout_forest, save_report, save_stats,
+)
+from org_chart_cache import load_table_cached
+from org_chart_vector import PAPER_SIZES, export_pdf, export_pdf_pages, export_svg
+from org_chart_trace import TRACE
+
+@dataclass
+class RenderOptions:
+    scale: float = 1.0
+    style: str = "bg"                 # "bg" | "stripe" | "headcount" | "span" (ısı: ekip / doğrudan bağlı)
+    badges: bool = False              # yöneticilerde ekip (altındaki kişi sayısı) rozeti
+    show_dept: bool = True
+    show_mail: bool = True
+    compact: bool = False
+    levels: int = 0                   # >0: yalnız ilk N düzey; altı katlanır (kişi sayısı rozetiyle)
+    compress_level: int = PNG_COMPRESS_LEVEL
+    paper: Optional[str] = None       # None: tek sayfa PDF; "A4"/"A3": sayfalara bölünmüş
+    landscape: bool = True
+    title_colors: Dict[str, Tuple[int,int,int]] = field(default_factory=dict)
+
+def parse_color(spec: str) -> Tuple[str, Tuple[int,int,int]]:
+    """'Pozisyon=#rrggbb' ya da 'Pozisyon=r,g,b' -> (pozisyon, (r,g,b))."""
+    title, sep, val = spec.rpartition("=")
+    if not sep or not title.strip(): raise ValueError(f"Renk biçimi 'Pozisyon=#rrggbb' olmalı: {spec}")
+    val = val.strip()
+    if val.startswith("#") and len(val) == 7:
+        rgb = tuple(int(val[i:i+2], 16) for i in (1, 3, 5))
+    else:
+        rgb = tuple(int(x) for x in val.split(","))
+        if len(rgb) != 3 or not all(0 <= c <= 255 for c in rgb): raise ValueError(f"Geçersiz renk: {spec}")
+    return title.strip(), rgb
+
+def chart_scene(data: ChartData, dept: Optional[str], root: Optional[str], opts: RenderOptions) -> ChartScene:
+    """Departman/başlangıç/seçeneklere göre sahne (yerleşim ChartData'dan, --levels ile katlanmış)."""
+    model = data.model_for(dept)
+    if not model: raise ValueError(f"Filtreye uyan kayıt bulunamadı (departman: {dept})")
+    start = None
+    if root:
+        start = model.index.get(root)
+        if start is None: raise ValueError(f"Başlangıç kullanıcısı bulunamadı: {root}")
+    if opts.levels > 0:
+        roots = chart_roots(model, start)
+        collapsed = collapse_below(model, roots, opts.levels)
+        layouts = layout_forest(model, roots, opts.compact, collapsed)
+    else: collapsed, layouts = (), data.layouts_for(dept, start, opts.compact)
+    return ChartScene(model, start, opts.scale, opts.title_colors, opts.show_dept, opts.show_mail, None,
+                      opts.style, add_legend=True, compact=opts.compact, layouts=layouts, collapsed=collapsed, badges=opts.badges)
+
+def render_chart(data: ChartData, dept: Optional[str], root: Optional[str], out_path: str, opts: RenderOptions) -> str:
+    """Tek şemayı uzantıya göre PNG (şerit şerit akıtılarak), vektör PDF ya da SVG olarak yazar."""
+    scene = chart_scene(data, dept, root, opts)
+    ext = os.path.splitext(out_path)[1].lower()
+    if ext == ".pdf" and opts.paper: export_pdf_pages(scene, out_path, opts.paper, opts.landscape)
+    elif ext == ".pdf": export_pdf(scene, out_path)
+    elif ext == ".svg": export_svg(scene, out_path)
+    else: export_png(scene, out_path, compress_level=opts.compress_level)
+    return out_path
+
+# ---- Toplu üretim (süreç havuzu) ----
+def batch_targets(data: ChartData, mode: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    (etiket, departman, başlangıç) listesi. mode="dept": her departman;
+    mode="manager": köklerin doğrudan bağlısı olan yöneticiler (yoksa kökler).
+    """
+    if mode == "dept":
+        depts = sorted(d for d in data.model_all.dept_table if d and data.model_all.dept_members(d))
+        return [(d, d, None) for d in depts]
+    model = data.model_for(None)
+    mgrs = [c for r in model.roots for c in model.kids(r) if model.has_kids(c)]
+    if not mgrs: mgrs = [r for r in model.roots if model.has_kids(r)] or list(model.roots)
+    return [(model.users[i], None, model.users[i]) for i in mgrs]
+
+def safe_filename(label: str) -> str:
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", label).strip("._") or "sema"
+
+def output_names(labels: List[str]) -> List[str]:
+    """
+    Etiket başına dosya adı (uzantısız). Farklı etiketler aynı ada düşerse ("Satış/Pazarlama",
+    "Satış Pazarlama") sonrakilere _2, _3 ... eklenir; yoksa iki işçi aynı dosyaya yazardı.
+    Windows'ta büyük/küçük harf farkı ayrı dosya sayılmaz.
+    """
+    taken, out = set(), []
+    for label in labels:
+        base = name = safe_filename(label); k = 1
+        while name.lower() in taken: k += 1; name = f"{base}_{k}"
+        taken.add(name.lower()); out.append(name)
+    return out
+
+_WORKER_DATA: Optional[ChartData] = None
+
+def _init_worker(path: str, model_all: OrgModel):
+    global _WORKER_DATA
+    _WORKER_DATA = ChartData(path, None, model_all)
+
+def _render_task(dept, root, out_path, opts):
+    return render_chart(_WORKER_DATA, dept, root, out_path, opts)
+
+def run_batch(data: ChartData, mode: str, out_dir: str, fmt: str, opts: RenderOptions, jobs: Optional[int]) -> int:
+    """Hedef başına bir şema; CPU çekirdekleri arasında paralel. Hata sayısını döner."""
+    os.makedirs(out_dir, exist_ok=True)
+    targets = batch_targets(data, mode)
+    errors = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(data.path, data.model_all)) as ex:
+        names = output_names([label for label, _, _ in targets])
+        futs = {ex.submit(_render_task, dept, root, os.path.join(out_dir, f"{name}.{fmt}"), opts): label
+                for (label, dept, root), name in zip(targets, names)}
+        for fut in as_completed(futs):
+            try: print(f"Yazıldı: {fut.result()}")
+            except Exception as e:
+                errors += 1; print(f"Hata ({futs[fut]}): {e}", file=sys.stderr)
+    print(f"{len(targets) - errors}/{len(targets)} şema üretildi -> {out_dir}")
+    return errors
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="org_chart_cli", description="Organizasyon şemasını arayüzsüz PNG/PDF/SVG olarak üretir.")
+    ap.add_argument("input", help="Excel/CSV personel tablosu")
+    ap.add_argument("-o", "--output", help="çıktı dosyası (.png/.pdf/.svg); tekli modda gerekli")
+    ap.add_argument("--dept", help="yalnız bu departman (tekli mod)")
+    ap.add_argument("--root", help="bu kullanıcı adından başlat (tekli mod)")
+    ap.add_argument("--scale", type=float, default=1.0, help="ölçek (1.0 = %%100)")
+    ap.add_argument("--style", choices=["bg", "stripe", *HEAT_STYLES], default="bg",
+                    help="renk stili: arka plan / sol şerit (pozisyon renkleri) ya da ekip büyüklüğü / doğrudan bağlı sayısı (ısı)")
+    ap.add_argument("--badges", action="store_true", help="yönetici kartlarında ekip rozeti (altındaki kişi sayısı)")
+    ap.add_argument("--no-dept", action="store_true", help="departman satırını gizle")
+    ap.add_argument("--no-mail", action="store_true", help="mail satırını gizle")
+    ap.add_argument("--compact", action="store_true", help="kompakt yerleşim (yaprakları istifle)")
+    ap.add_argument("--levels", type=int, default=0, metavar="N", help="yalnız ilk N düzeyi çiz; alt ağaçlar katlanır (varsayılan: tümü)")
+    ap.add_argument("--compress", type=int, choices=range(10), default=PNG_COMPRESS_LEVEL, metavar="0-9",
+                    help="PNG sıkıştırma düzeyi: düşük = hızlı, yüksek = küçük dosya (varsayılan: %(default)s)")
+    ap.add_argument("--paper", choices=sorted(PAPER_SIZES), help="PDF'i bu kâğıt boyutunda sayfalara böl (varsayılan: tek sayfa)")
+    ap.add_argument("--portrait", action="store_true", help="sayfalı PDF'te dikey yönlendirme")
+    ap.add_argument("--settings", default=DEFAULT_SETTINGS_FILE, help="renk ayar dosyası (varsayılan: %(default)s)")
+    ap.add_argument("--color", action="append", default=[], metavar="POZİSYON=#RRGGBB", help="pozisyon rengi (tekrarlanabilir)")
+    ap.add_argument("--report", metavar="CSV", help="hiyerarşi sorunlarını (döngü, kendine bağlı, bulunamayan yönetici, tekrar) CSV'ye yaz")
+    ap.add_argument("--stats", metavar="CSV", help="yönetici başına ekip, doğrudan bağlı ve derinlik tablosunu CSV'ye yaz (--dept ile süzülür)")
+    ap.add_argument("--no-cache", action="store_true", help="disk önbelleğini kullanma (tabloyu ve yerleşimi yeniden hesapla)")
+    ap.add_argument("--batch", choices=["dept", "manager"], help="toplu mod: departman ya da üst yönetici başına şema")
+    ap.add_argument("--out-dir", default="ciktilar", help="toplu mod çıktı klasörü")
+    ap.add_argument("--format", choices=["png", "pdf", "svg"], default="png", help="toplu mod çıktı biçimi")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="paralel süreç sayısı (varsayılan: CPU sayısı)")
+    ap.add_argument("--trace", metavar="JSON", help="aşama sürelerini ve sayaçları bu dosyaya yaz (chrome://tracing / Perfetto); özet stderr'e")
+    ap.add_argument("--profile", metavar="PROF", help="cProfile çıktısını (pstats) bu dosyaya yaz; ilk satırlar stderr'e")
+    return ap
+
+def main(argv=None) -> int:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if not args.batch and not args.output and not args.report and not args.stats: ap.error("--output, --batch, --report ya da --stats gerekli")
+    if args.batch and (args.dept or args.root): ap.error("--dept/--root toplu modda kullanılamaz (hedefleri --batch belirler)")
+    if args.trace: TRACE.enable()
+    if args.profile: TRACE.start_profile()
+    try:
+        colors = load_title_colors(args.settings)
+        colors.update(parse_color(c) for c in args.color)
+        opts = RenderOptions(scale=args.scale, style=args.style, badges=args.badges, show_dept=not args.no_dept,
+                             show_mail=not args.no_mail, compact=args.compact, levels=args.levels,
+                             compress_level=args.compress, paper=args.paper, landscape=not args.portrait,
+                             title_colors=colors)
+        if args.no_cache: table, entry = load_table(args.input), None
+        else: table, entry = load_table_cached(args.input)
+        data = ChartData(args.input, table, build_people(table), cache=entry)
+        report = data.report()
+        if report: print(f"Uyarı: veri sorunları: {report.summary()}" + ("" if args.report else " (ayrıntı için --report)"), file=sys.stderr)
+        if args.report: save_report(report, args.report); print(f"Rapor yazıldı: {args.report}")
+        if args.stats: save_stats(data.model_for(args.dept).stats(), args.stats); print(f"Ekip tablosu yazıldı: {args.stats}")
+        if not args.batch and not args.output: return 0
+        if args.batch:
+            return 1 if run_batch(data, args.batch, args.out_dir, args.format, opts, args.jobs) else 0
+        print(f"Yazıldı: {render_chart(data, args.dept, args.root, args.output, opts)}")
+        return 0
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.profile: print(TRACE.stop_profile(args.profile, top=25), file=sys.stderr)
+        if args.trace:
+            try: write_trace(args.trace)
+            except OSError as e: print(f"İz yazılamadı: {e}", file=sys.stderr)
+
+def write_trace(path: str):
+    """İz dosyası ve aşama özeti (toplu modda yalnız ana süreç: okuma ve model)."""
+    TRACE.write_json(path)
+    for name, n, _, total, mx in TRACE.summary():
+        print(f"  {name:<18} {n:>6}× {total:>10.1f} ms  (en uzun {mx:.1f} ms)", file=sys.stderr)
+    for k, v in sorted(TRACE.counts().items()): print(f"  {k:<18} {v:>10,}", file=sys.stderr)
+    print(f"İz yazıldı: {path}", file=sys.stderr)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1763 @@
+# org_chart_core.py
+# -*- coding: utf-8 -*-
+"""
+Organizasyon şeması çekirdeği (arayüzden bağımsız)
+- Tablo okuma/normalleştirme, dizi tabanlı model (OrgModel), alt ağaç toplamları (SubtreeStats)
+- Yerleşim (compute_layout), sahne/karo çizimi (ChartScene, TileCache)
+- PNG/PDF kaydetme, arka plan işleri
+
+tkinter'e bağımlı değildir; org_chart_app (masaüstü) ve org_chart_cli (komut satırı)
+bu modülü kullanır.
+
+Gerekli: pillow; Excel için pandas + openpyxl (CSV pandas'sız okunur)
+Ağır kütüphaneler içe aktarmada yüklenmez: Pillow ilk çizimde, pandas ilk Excel
+dosyasında (LazyModule / load_table). Arayüz penceresi bunları beklemeden açılır.
+"""
+
+from __future__ import annotations
+
+import os, re, sys, csv, json, math, zlib, queue, struct, importlib, threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter, sub
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from textwrap import wrap
+
+from org_chart_trace import TRACE
+
+class LazyModule:
+    """
+    İlk öznitelik erişiminde içe aktarılan modül vekili. Yüklenince modülün adları
+    vekile kopyalanır; sonraki erişimler sıradan öznitelik okumasıdır.
+    """
+    def __init__(self, name: str):
+        self.__dict__["_lazy_name"] = name
+
+    def __getattr__(self, attr):
+        mod = importlib.import_module(self._lazy_name)
+        self.__dict__.update(vars(mod))
+        return getattr(mod, attr)
+
+# statik içe aktarma tip denetleyicisi ve PyInstaller içindir (modüller pakete alınır)
+if TYPE_CHECKING: from PIL import Image, ImageDraw, ImageFont
+else: Image, ImageDraw, ImageFont = LazyModule("PIL.Image"), LazyModule("PIL.ImageDraw"), LazyModule("PIL.ImageFont")
+
+REQ_COLS = ["Kullanıcı Adı","Ad Soyad","Departman","Pozisyon","Üst Kademe","Mail"]
+
+# Kart metrikleri
+BOX_W, BOX_H = 300, 88
+BOX_PAD_X = 44
+ROW_GAP, COL_GAP = 90, 42
+# Kompakt yerleşim: istiflenen yaprakların satır adımı / girintisi (sütun-satır biriminde)
+STACK_STEP   = (BOX_H + 16) / (BOX_H + ROW_GAP)
+STACK_BOX    = BOX_H / (BOX_H + ROW_GAP)
+STACK_INDENT = 0.15
+
+CANVAS_BG   = (248, 250, 252)
+BOX_BG      = (255, 255, 255)
+BOX_BORDER  = (39, 94, 254)
+LINE_COLOR  = (120, 144, 156)
+TEXT_COLOR  = (26, 32, 44)
+SUBTEXT     = (88, 96, 108)
+HILIGHT     = (220, 53, 69)
+
+FONT_TITLE_SIZE, FONT_SUB_SIZE = 17, 13
+DEFAULT_SETTINGS_FILE = os.path.join(os.path.expanduser("~"), ".org_chart_settings.json")
+
+def load_title_colors(path: str = DEFAULT_SETTINGS_FILE) -> Dict[str, Tuple[int,int,int]]:
+    """Ayar dosyasındaki pozisyon renkleri ({pozisyon: (r,g,b)}); dosya yoksa/bozuksa boş."""
+    try:
+        with open(path,"r",encoding="utf-8") as f: data = json.load(f)
+        return {k:tuple(v) for k,v in data.get("title_colors", {}).items()}
+    except Exception:
+        return {}
+
+@dataclass
+class Person:
+    """Tek kişinin satır görünümü (OrgModel.person ile üretilir)."""
+    __slots__ = ("username", "full_name", "dept", "title", "manager", "mail")
+    username: str
+    full_name: str
+    dept: str
+    title: str
+    manager: Optional[str]
+    mail: str
+
+# ---------------- Yardımcılar ----------------
+FONT_CANDIDATES = [
+    "DejaVuSans.ttf",
+    "C:\\Windows\\Fonts\\DejaVuSans.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+TEXT_CACHE_BYTES = 64 * 2**20   # metin maskesi önbelleği üst sınırı (LRU, bayt)
+
+_font_path: Optional[str] = None   # çalıştığı görülen aday; "" = hiçbiri yüklenmedi (varsayılan font)
+_fonts: Dict[Tuple[str,int], ImageFont.ImageFont] = {}
+
+def ensure_font(size: int) -> ImageFont.FreeTypeFont:
+    """Süreç genelinde önbellekli: aday listesi bir kez taranır, (yol, boyut) başına bir kez yüklenir."""
+    global _font_path
+    f = _fonts.get((_font_path, size))
+    if f is not None: return f
+    if _font_path is None:
+        for p in FONT_CANDIDATES:
+            try: f = ImageFont.truetype(p, size); _font_path = p; break
+            except OSError: pass
+        else: _font_path = ""
+    if f is None: f = ImageFont.truetype(_font_path, size) if _font_path else ImageFont.load_default()
+    _fonts[(_font_path, size)] = f
+    return f
+
+@lru_cache(maxsize=65536)
+def wrap_text(text: str, width: int) -> str:
+    """Karakter genişliğine göre satır kırma (aynı metin/genişlik için bir kez)."""
+    return "\n".join(wrap(text, width)) if len(text) > width else text
+
+_text_masks: "OrderedDict[tuple, tuple]" = OrderedDict()
+_text_bytes = 0
+_text_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _measure():
+    """Metin ölçümü için 1×1 çizim yüzeyi (Pillow'u ilk ölçümde yükler)."""
+    return ImageDraw.Draw(Image.new("L", (1, 1)))
+
+def text_mask(text: str, font) -> Tuple[Image.Image, int, int]:
+    """
+    Metnin 'L' maskesi ve sol-üst ofseti. (metin, font) başına bir kez şekillendirilir;
+    tekrar eden zoom/yeniden çizimlerde glif çizimi atlanır.
+    """
+    global _text_bytes
+    key = (text, font)
+    with _text_lock:
+        hit = _text_masks.get(key)
+        if hit is not None: _text_masks.move_to_end(key); return hit
+    if TRACE.enabled: TRACE.count("text.shaped")
+    l,t,r,b = _measure().multiline_textbbox((0,0), text, font=font)
+    m = Image.new("L", (max(1,r-l), max(1,b-t)), 0)
+    ImageDraw.Draw(m).text((-l,-t), text, fill=255, font=font)
+    hit = (m, l, t)
+    with _text_lock:
+        if key not in _text_masks: _text_bytes += m.width * m.height
+        _text_masks[key] = hit
+        while _text_bytes > TEXT_CACHE_BYTES and len(_text_masks) > 1:
+            old, _, _ = _text_masks.popitem(last=False)[1]; _text_bytes -= old.width * old.height
+    return hit
+
+def draw_text(img: Image.Image, xy, text: str, font, fill):
+    """ImageDraw.text ile piksel-aynı; maske önbellekten yapıştırılır."""
+    m, l, t = text_mask(text, font)
+    img.paste(fill, (xy[0]+l, xy[1]+t), m)
+
+class Table:
+    """
+    REQ_COLS kolonlu ham tablo, sütun sütun (kolon -> hücre listesi; boş hücre None).
+    load_table, disk önbelleği ve build_people bununla çalışır; pandas gerekmez.
+    """
+    __slots__ = ("columns",)
+    def __init__(self, columns: Dict[str, List[Optional[str]]]):
+        self.columns = columns
+
+    def __len__(self): return len(self.columns[REQ_COLS[0]])
+    def __getitem__(self, col: str) -> List[Optional[str]]: return self.columns[col]
+
+def _column_map(columns) -> Dict[str, str]:
+    """Başlık -> REQ_COLS adı (Türkçe/İngilizce eş adlar, büyük/küçük harf duyarsız)."""
+    m = {}
+    for c in columns:
+        k = str(c).strip().lower()
+        if "kullanıcı" in k and "adı" in k: m[c] = "Kullanıcı Adı"
+        elif k in ["ad soyad","ad-soyad","ad_soyad","isim","ad","soyad","adi soyadi","adı soyadı"]: m[c] = "Ad Soyad"
+        elif "departman" in k or "department" in k: m[c] = "Departman"
+        elif "pozisy" in k or "görev" in k or "gorev" in k or "title" in k or "ünvan" in k or "unvan" in k: m[c] = "Pozisyon"
+        elif "üst" in k or "ust" in k or "manager" in k or "yönetici" in k or "yonetici" in k or "amiri" in k: m[c] = "Üst Kademe"
+        elif "mail" in k or "e-posta" in k or "email" in k: m[c] = "Mail"
+    return m
+
+def _required_indices(header: list) -> List[int]:
+    """REQ_COLS sırasıyla başlıktaki kolon sıraları (eş adlıların ilki); eksik varsa ValueError."""
+    m, found = _column_map(header), {}
+    for i, c in enumerate(header):
+        if c in m: found.setdefault(m[c], i)
+    missing = [c for c in REQ_COLS if c not in found]
+    if missing: raise ValueError(f"Eksik kolonlar: {missing}\nMevcut: {list(header)}")
+    return [found[c] for c in REQ_COLS]
+
+@TRACE.traced("load_table")
+def load_table(path: str) -> Table:
+    """
+    Excel/CSV'yi Table olarak okur: eş adlı başlıklar REQ_COLS'a eşlenir, hücreler
+    str + strip, boşlar None. CSV pandas'sız okunur; pandas yalnız Excel için gerekir.
+    """
+    if path.lower().endswith((".xlsx", ".xls")): return _load_excel(path)
+    return _load_csv(path)
+
+def _load_excel(path: str) -> Table:
+    import pandas as pd   # ~0.5 s'lik içe aktarma yalnız Excel açılınca ödenir
+    df = pd.read_excel(path)
+    idx = _required_indices(list(df.columns))
+    return Table({c: _clean_column(df.iloc[:, i].tolist()) for c, i in zip(REQ_COLS, idx)})
+
+def _load_csv(path: str) -> Table:
+    """
+    csv modülüyle satır satır: yalnız gereken altı hücre alınır, sonra kolonlar tek
+    geçişte temizlenir. pandas.read_csv ile aynı kurallar (UTF-8, BOM, boş satırlar
+    atlanır, eksik hücre boş); farkı: sayılar metin olarak kalır ("007", boşluklu
+    kolonda "1001.0" yerine "1001").
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = csv.reader(f)
+        header = next(rows, [])
+        idx = _required_indices(header)
+        get, width, picked = itemgetter(*idx), max(idx) + 1, []
+        for row in rows:
+            if len(row) < width:
+                if not row: continue
+                row += [""] * (width - len(row))
+            picked.append(get(row))
+    cols = list(zip(*picked)) if picked else [()] * len(REQ_COLS)
+    return Table({c: _clean_column(v) for c, v in zip(REQ_COLS, cols)})
+
+# pandas'ın varsayılan boş (NA) değerleri: CSV yolu da aynı hücreleri boş sayar
+_NULL_STR = {"", "nan", "None", "<NA>", "NaN", "-nan", "-NaN", "NA", "N/A", "n/a", "#N/A", "#N/A N/A", "#NA",
+             "NULL", "null", "1.#IND", "-1.#IND", "1.#QNAN", "-1.#QNAN"}
+
+def _clean_column(values) -> List[Optional[str]]:
+    """Tek geçişte str + strip; boş/"nan"/"None" hücreler None olur."""
+    return [None if (s := str(v).strip()) in _NULL_STR else s for v in values]
+
+class OrgModel:
+    """
+    Dizi tabanlı organizasyon modeli. Kişiler 0..n-1 tamsayı id'leriyle tutulur;
+    departman/pozisyon adları tekil tablolarda (id dizisi + tablo), diğer metinler
+    intern edilmiş listelerdedir. build_tree sonrası ağaç CSR biçimindedir:
+    kids(i) = child_idx[child_start[i]:child_start[i+1]] (ada göre sıralı).
+    """
+    __slots__ = ("users", "index", "names", "mails", "managers", "dept_ids", "title_ids",
+                 "dept_table", "title_table", "_dept_lookup", "_title_lookup",
+                 "parent", "child_start", "child_idx", "roots", "_dept_members", "_stats", "duplicates", "report")
+
+    def __init__(self):
+        self.users: List[str] = []
+        self.index: Dict[str,int] = {}
+        self.names: List[str] = []; self.mails: List[str] = []
+        self.managers: List[Optional[str]] = []
+        self.dept_ids, self.title_ids = array("i"), array("i")
+        self.dept_table: List[str] = []; self.title_table: List[str] = []
+        self._dept_lookup: Dict[str,int] = {}; self._title_lookup: Dict[str,int] = {}
+        self.parent = array("i"); self.child_start = array("i", [0]); self.child_idx = array("i")
+        self.roots: List[int] = []
+        self._dept_members: Optional[Dict[str,List[int]]] = None
+        self._stats: Optional["SubtreeStats"] = None
+        self.duplicates: Dict[str,int] = {}   # kullanıcı adı -> satır sayısı (birden çok satırı olanlar)
+        self.report: Optional["HierarchyReport"] = None   # build_tree'nin bulduğu sorunlar
+
+    def __len__(self): return len(self.users)
+    def __bool__(self): return bool(self.users)
+    def __contains__(self, username): return username in self.index
+
+    @staticmethod
+    def _intern(table: List[str], lookup: Dict[str,int], s: str) -> int:
+        i = lookup.get(s)
+        if i is None: i = lookup[s] = len(table); table.append(sys.intern(s))
+        return i
+
+    def add(self, username: str, full_name: str, dept: str, title: str, manager: Optional[str], mail: str) -> int:
+        """Kişi ekler; aynı kullanıcı adı yeniden gelirse ilk id korunur, alanlar güncellenir (duplicates'e yazılır)."""
+        d = self._intern(self.dept_table, self._dept_lookup, dept)
+        t = self._intern(self.title_table, self._title_lookup, title)
+        manager = sys.intern(manager) if manager else None
+        i = self.index.get(username)
+        if i is None:
+            i = self.index[username] = len(self.users)
+            self.users.append(sys.intern(username)); self.names.append(full_name); self.mails.append(mail)
+            self.managers.append(manager); self.dept_ids.append(d); self.title_ids.append(t)
+        else:
+            self.names[i], self.mails[i], self.managers[i] = full_name, mail, manager
+            self.dept_ids[i], self.title_ids[i] = d, t
+            self.duplicates[username] = self.duplicates.get(username, 1) + 1
+        self._dept_members = None
+        return i
+
+    def dept(self, i: int) -> str: return self.dept_table[self.dept_ids[i]]
+    def title(self, i: int) -> str: return self.title_table[self.title_ids[i]]
+    def title_id(self, title: str) -> Optional[int]: return self._title_lookup.get(title)
+
+    def person(self, i: int) -> Person:
+        return Person(self.users[i], self.names[i], self.dept(i), self.title(i), self.managers[i], self.mails[i])
+
+    def kids(self, i: int):
+        cs = self.child_start
+        return self.child_idx[cs[i]:cs[i+1]]
+
+    def has_kids(self, i: int) -> bool:
+        cs = self.child_start
+        return cs[i+1] > cs[i]
+
+    def subtree_size(self, i: int) -> int:
+        """i ve altındaki herkes (kişi sayısı); tüm boyutlar ilk çağrıda tek geçişte hesaplanır."""
+        return self.stats().size[i]
+
+    def stats(self) -> "SubtreeStats":
+        """Alt ağaç toplamları (build_tree sonrası); ilk çağrıda hesaplanır, ağaç yeniden kurulunca sıfırlanır."""
+        if self._stats is None: self._stats = SubtreeStats(self)
+        return self._stats
+
+    def carry_stats(self, old: "OrgModel", diff: "TableDiff"):
+        """Aynı tablonun eski sürümünün toplamları hesaplanmışsa yalnız değişen ata yolları güncellenerek devralınır."""
+        if old._stats is not None and self._stats is None: self._stats = old._stats.rebase(self, diff)
+
+    def dept_members(self, dept: str) -> List[int]:
+        """Departmandaki id'ler; gruplama ilk çağrıda tek geçişte yapılır."""
+        if self._dept_members is None:
+            groups: Dict[int,List[int]] = {}
+            for i, d in enumerate(self.dept_ids): groups.setdefault(d, []).append(i)
+            self._dept_members = {self.dept_table[d]: ids for d, ids in groups.items() if self.dept_table[d]}
+        return self._dept_members.get(dept, [])
+
+    def subset(self, ids) -> "OrgModel":
+        """Verilen id'lerden yeni (ağacı kurulmamış) model; id'ler yeniden numaralanır."""
+        m = OrgModel()
+        for i in ids:
+            m.add(self.users[i], self.names[i], self.dept(i), self.title(i), self.managers[i], self.mails[i])
+        return m
+
+@TRACE.traced("build_people")
+def build_people(table: Table, dept: Optional[str]=None) -> OrgModel:
+    """
+    Kolon dizilerinden tek geçişte OrgModel kurar (iterrows yok). Aynı kullanıcı
+    adında son satır geçerlidir. dept verilirse yalnız o departmanın satırları alınır.
+    table: Table ya da aynı kolonlu pandas.DataFrame.
+    """
+    m = OrgModel()
+    only = dept if (dept and dept != "Tümü") else None
+    cols = [table[c] for c in REQ_COLS]
+    for u, name, d, title, mgr, mail in zip(*(c.tolist() if hasattr(c, "tolist") else c for c in cols)):
+        if not u or u.lower()=="none": continue
+        if only is not None and d != only: continue
+        m.add(u, name or "", d or "", title or "", mgr or None, mail or "")
+    return m
+
+@dataclass
+class HierarchyReport:
+    """
+    build_tree'nin bulduğu veri sorunları (kullanıcı adları). Şema yine çizilir:
+    Üst Kademe'si bulunamayan ya da kendisi olan kişi kök olur; döngüde kullanıcı adı
+    (alfabetik) en küçük olanın Üst Kademe bağı yok sayılır ve döngü onun altında zincir olur.
+    """
+    duplicates: List[Tuple[str, int]]      # (kullanıcı, satır sayısı); son satır geçerli
+    self_managers: List[str]               # Üst Kademe'si kendisi
+    dangling: List[Tuple[str, str]]        # (kullanıcı, tabloda olmayan Üst Kademe)
+    cycles: List[List[str]]                # kırılan kişiden başlayarak yönetici yönünde
+
+    def __bool__(self): return bool(self.duplicates or self.self_managers or self.dangling or self.cycles)
+
+    def __len__(self): return len(self.duplicates) + len(self.self_managers) + len(self.dangling) + len(self.cycles)
+
+    def summary(self) -> str:
+        parts = [f"{len(v)} {t}" for v, t in ((self.cycles, "döngü"), (self.self_managers, "kendine bağlı"),
+                                                (self.dangling, "bulunamayan yönetici"), (self.duplicates, "tekrarlanan kullanıcı")) if v]
+        return ", ".join(parts) or "sorun yok"
+
+    def rows(self) -> List[Tuple[str, str, str]]:
+        """(sorun, kullanıcı, ayrıntı) satırları — panel ve CSV için."""
+        out = [("Döngü", c[0], " → ".join(c + c[:1]) + f" (kırıldı: {c[0]} kök yapıldı)") for c in self.cycles]
+        out += [("Kendine bağlı", u, "Üst Kademe kendisi; kök yapıldı") for u in self.self_managers]
+        out += [("Bulunamayan yönetici", u, f"Üst Kademe '{m}' tabloda yok; kök yapıldı") for u, m in self.dangling]
+        out += [("Tekrarlanan kullanıcı", u, f"{k} satır; son satır kullanıldı") for u, k in self.duplicates]
+        return out
+
+def save_report(report: HierarchyReport, path: str):
+    """Sorun listesini CSV olarak yazar (Excel'in Türkçe karakterleri tanıması için BOM'lu UTF-8)."""
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f); w.writerow(["Sorun", "Kullanıcı Adı", "Ayrıntı"]); w.writerows(report.rows())
+
+def _break_cycles(users: List[str], parent, counts) -> Tuple[List[int], List[List[int]]]:
+    """
+    Üst Kademe döngülerini bulup kırar (parent ve counts yerinde değişir). Her kişinin en
+    çok bir yöneticisi olduğundan yukarı doğru yürüyüşler yeterli: her düğüm bir kez
+    ziyaret edilir (O(n)); yürüyüş kendi izine dönerse döngüdür. Kırılan düğümler ve
+    döngüler döner.
+    """
+    seen = [0] * len(users)   # 0: ziyaret edilmedi, s+1: s'den başlayan yürüyüşte
+    selfs, cycles = [], []
+    for s in range(len(users)):
+        if seen[s]: continue
+        w = s + 1; u = s
+        while u >= 0 and not seen[u]:
+            seen[u] = w; u = parent[u]
+        if u < 0 or seen[u] != w: continue
+        cyc, v = [u], parent[u]
+        while v != u: cyc.append(v); v = parent[v]
+        b = min(cyc, key=users.__getitem__)
+        counts[parent[b]] -= 1; parent[b] = -1
+        if len(cyc) == 1: selfs.append(b)
+        else: k = cyc.index(b); cycles.append(cyc[k:] + cyc[:k])
+    return selfs, cycles
+
+@TRACE.traced("build_tree")
+def build_tree(model: OrgModel) -> OrgModel:
+    """
+    Üst Kademe -> id çözümlemesi ve CSR çocuk dizileri. Çocuklar ve kökler ada göre
+    (küçük harf) sıralıdır; sıralama bir kez, tüm kişiler üzerinden yapılır.
+    Döngüler ve kendine bağlılar kırılır; bulunan sorunlar model.report'tadır (departman
+    alt kümesinde başka departmandaki yönetici de "bulunamayan" görünür; tablonun raporu
+    tüm kişilerin modelindedir: ChartData.report).
+    """
+    n = len(model); idx = model.index; users = model.users
+    parent = array("i", [-1]) * n
+    counts, dangling = [0]*n, []
+    for i, mgr in enumerate(model.managers):
+        if mgr is not None:
+            j = idx.get(mgr)
+            if j is not None: parent[i] = j; counts[j] += 1
+            else: dangling.append(i)
+    selfs, cycles = _break_cycles(users, parent, counts)
+    start = array("i", [0]) * (n+1)
+    for i in range(n): start[i+1] = start[i] + counts[i]
+    fill = array("i", start[:n]); child_idx = array("i", [0]) * start[n]
+    roots: List[int] = []
+    names = model.names
+    for i in sorted(range(n), key=lambda i: names[i].lower()):
+        p = parent[i]
+        if p < 0: roots.append(i)
+        else: child_idx[fill[p]] = i; fill[p] += 1
+    model.parent, model.child_start, model.child_idx, model.roots = parent, start, child_idx, roots
+    model._stats = None
+    model.report = HierarchyReport(sorted(model.duplicates.items()), sorted(users[i] for i in selfs),
+                                   sorted((users[i], model.managers[i]) for i in dangling),
+                                   sorted([users[i] for i in c] for c in cycles))
+    return model
+
+@dataclass
+class TableDiff:
+    """Aynı tablonun iki sürümü arasındaki fark (kullanıcı adları)."""
+    added: List[str]
+    removed: List[str]
+    moved: List[str]      # Üst Kademe değişti
+    edited: List[str]     # ad, departman, pozisyon ya da mail değişti
+
+    def __bool__(self): return bool(self.added or self.removed or self.moved or self.edited)
+
+    def summary(self) -> str:
+        parts = [f"{len(v)} {t}" for v, t in ((self.added, "eklendi"), (self.removed, "çıkarıldı"),
+                                                (self.moved, "taşındı"), (self.edited, "düzenlendi")) if v]
+        return ", ".join(parts) or "değişiklik yok"
+
+@TRACE.traced("diff_models")
+def diff_models(old: OrgModel, new: OrgModel) -> TableDiff:
+    """Kullanıcı adına göre tek geçişte karşılaştırır (ağacın kurulmuş olması gerekmez)."""
+    oidx = old.index
+    added, moved, edited = [], [], []
+    for j, u in enumerate(new.users):
+        i = oidx.get(u)
+        if i is None: added.append(u); continue
+        if old.managers[i] != new.managers[j]: moved.append(u)
+        if (old.names[i] != new.names[j] or old.mails[i] != new.mails[j]
+                or old.dept(i) != new.dept(j) or old.title(i) != new.title(j)): edited.append(u)
+    removed = [u for u in old.users if u not in new.index]
+    return TableDiff(added, removed, moved, edited)
+
+# -------------- Alt ağaç toplamları --------------
+STATS_BREAKDOWN_CACHE = 256   # LRU'da tutulan departman/pozisyon dağılımı sayısı
+STATS_COLUMNS = ["Kullanıcı Adı", "Ad Soyad", "Departman", "Pozisyon", "Ekip", "Doğrudan Bağlı", "Derinlik"]
+
+class SubtreeStats:
+    """
+    build_tree çıktısı üzerinde kişi başına alt ağaç toplamları, tek post-order geçişte:
+    size[u] (u ve altındaki herkes), reports[u] (doğrudan bağlı), depth[u] (altındaki en
+    derin düzey; yaprak 0). Ön-sıra dizisinde her alt ağaç ardışık bir dilimdir; departman
+    ve pozisyon dağılımı bu dilimden sayılır (sorgu başına O(alt ağaç), son sorgular LRU'da).
+    rebase yeniden okunan tablo için yalnız değişen kişilerin ata yollarını günceller.
+    updated: hesaplanan düğüm sayısı.
+    """
+    __slots__ = ("model", "size", "reports", "depth", "updated", "_order", "_pos", "_breakdown")
+
+    @TRACE.traced("stats")
+    def __init__(self, model: OrgModel, _arrays=None):
+        self.model = model
+        self._order: Optional[array] = None; self._pos: Optional[array] = None
+        self._breakdown: "OrderedDict[Tuple[str,int], List[Tuple[str,int]]]" = OrderedDict()
+        cs = model.child_start
+        self.reports = array("i", map(sub, cs[1:], cs[:-1]))
+        if _arrays is not None:
+            self.size, self.depth, self.updated = _arrays; return
+        n, parent = len(model), model.parent
+        size, depth = self.size, self.depth = array("i", [1]) * n, array("i", [0]) * n
+        for u in reversed(self._preorder()):
+            p = parent[u]
+            if p >= 0:
+                size[p] += size[u]
+                if depth[u] >= depth[p]: depth[p] = depth[u] + 1
+        self.updated = n
+
+    def _preorder(self) -> array:
+        """Ön-sıra (her alt ağaç ardışık) ve konumlar; ilk ihtiyaçta kurulur."""
+        if self._order is None:
+            m, order = self.model, array("i")
+            stack = list(m.roots)
+            while stack:
+                u = stack.pop(); order.append(u); stack.extend(m.kids(u))
+            pos = array("i", [0]) * len(m)
+            for k, u in enumerate(order): pos[u] = k
+            self._order, self._pos = order, pos
+        return self._order
+
+    def breakdown(self, u: int, by: str = "dept") -> List[Tuple[str, int]]:
+        """u'nun alt ağacında (u dahil) departman ya da pozisyon (by="title") başına kişi sayısı, çoktan aza."""
+        key = (by, u)
+        hit = self._breakdown.get(key)
+        if hit is not None: self._breakdown.move_to_end(key); return hit
+        m, order = self.model, self._preorder()
+        ids, table = (m.title_ids, m.title_table) if by == "title" else (m.dept_ids, m.dept_table)
+        k = self._pos[u]
+        counts = Counter(map(ids.__getitem__, order[k:k + self.size[u]]))
+        out = self._breakdown[key] = sorted(((table[t], c) for t, c in counts.items()), key=lambda x: (-x[1], x[0]))
+        while len(self._breakdown) > STATS_BREAKDOWN_CACHE: self._breakdown.popitem(last=False)
+        return out
+
+    def rows(self) -> List[tuple]:
+        """Yöneticilerin STATS_COLUMNS satırları (ekip = altındaki kişi sayısı), ekibi büyükten küçüğe."""
+        m, size, reports, depth = self.model, self.size, self.reports, self.depth
+        ids = sorted((u for u in range(len(m)) if reports[u]), key=lambda u: (-size[u], m.users[u]))
+        return [(m.users[u], m.names[u], m.dept(u), m.title(u), size[u] - 1, reports[u], depth[u]) for u in ids]
+
+    @TRACE.traced("stats.rebase")
+    def rebase(self, model: OrgModel, diff: TableDiff) -> "SubtreeStats":
+        """
+        Aynı tablonun yeniden okunmuş sürümü (build_tree'den geçmiş model) için toplamlar.
+        Eski kişilerin id'leri korunmuşsa (satırlar düzenlenmiş ya da sona eklenmiş) yalnız
+        yeni ve taşınan kişilerin, eski ve yeni yöneticilerinden köke giden yollar yeniden
+        hesaplanır. Satır çıkmış / araya girmişse (id'ler kayar) ya da döngü kırılmışsa
+        (kırılan bağ diff'te görünmeyebilir) tek geçişte baştan hesaplanır.
+        """
+        old, n0, n = self.model, len(self.model), len(model)
+        if n < n0 or old.users != model.users[:n0] or old.report.cycles or model.report.cycles:
+            return SubtreeStats(model)
+        parent, idx, marked = model.parent, model.index, set()
+        touched = [*range(n0, n), *(idx[u] for u in diff.moved if u in idx)]
+        for i in touched:
+            for u in (i, parent[i], old.parent[i] if i < n0 else -1):
+                while u >= 0 and u not in marked: marked.add(u); u = parent[u]
+        size, depth = array("i", self.size), array("i", self.depth)
+        size.extend([1] * (n - n0)); depth.extend([0] * (n - n0))
+        order, stack = [], [u for u in marked if parent[u] < 0]
+        while stack:
+            u = stack.pop(); order.append(u); stack.extend(v for v in model.kids(u) if v in marked)
+        for u in reversed(order):
+            kids = model.kids(u)
+            size[u] = 1 + sum(size[v] for v in kids)
+            depth[u] = 1 + max(depth[v] for v in kids) if kids else 0
+        return SubtreeStats(model, (size, depth, len(order)))
+
+def save_stats(stats: SubtreeStats, path: str):
+    """Yönetici toplamlarını CSV olarak yazar (BOM'lu UTF-8; Excel'de sıralanabilir)."""
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f); w.writerow(STATS_COLUMNS); w.writerows(stats.rows())
+
+def _stack_contour(d: int, n: int):
+    """n yaprağı alt alta istiflenmiş yöneticinin (sol, sağ) konturu."""
+    rows = int((n-1)*STACK_STEP + STACK_BOX)
+    cl = {k: STACK_INDENT for k in range(d+1, d+2+rows)}; cl[d] = 0.0
+    return (cl, 0.0), (dict(cl), 0.0)
+
+def _merge_contours(d: int, lefts: list, rights: list):
+    """
+    Kardeş alt ağaçları (soldan sağa) kontur karşılaştırmasıyla sıkıca yan yana koyar.
+    Kontur: (dict{derinlik: x}, ofset) — gerçek x = dict[k] + ofset (alt ağaç köküne göre);
+    anahtarlar kökün derinliğinden başlayıp kesintisiz gider. Verilen konturlar tüketilir
+    (yerinde değişir). Çocukların ebeveyne göre x'leri ve ebeveynin (sol, sağ) konturu döner.
+    """
+    pos = [0.0]
+    (aL, aLo), (aR, aRo) = lefts[0], rights[0]
+    for (cL, cLo), (cR, cRo) in zip(lefts[1:], rights[1:]):
+        n = min(len(aR), len(cL))
+        s = max(aR[k] + aRo - cL[k] - cLo for k in range(d+1, d+1+n)) + 1.0
+        pos.append(s)
+        # sağ kontur: yeni alt ağaç baskın; eski kontur daha derinse yalnız üst kısmı ezilir
+        if len(cR) >= len(aR): aR, aRo = cR, cRo + s
+        else:
+            for k in range(d+1, d+1+len(cR)): aR[k] = cR[k] + cRo + s - aRo
+        # sol kontur: birikmiş orman baskın; yeni alt ağaç daha derinse onun listesi devralınır
+        if len(cL) > len(aL):
+            for k in range(d+1, d+1+len(aL)): cL[k] = aL[k] + aLo - cLo - s
+            aL, aLo = cL, cLo + s
+    mid = (pos[0] + pos[-1]) / 2.0
+    aLo -= mid; aRo -= mid
+    aL[d] = -aLo; aR[d] = -aRo
+    return [x - mid for x in pos], (aL, aLo), (aR, aRo)
+
+def _place(root: int, kids_of, rel, depth, stacked):
+    """
+    Göreli konumlardan mutlak {id: (x, derinlik)} (önce-sıra, en soldaki x = 0);
+    (yerleşim, sütun sayısı, satır sayısı) döner.
+    """
+    xs: Dict[int, float] = {root: 0.0}
+    order, stack = [], [root]
+    while stack:
+        u = stack.pop(); order.append(u)
+        xu = xs[u]; kids = kids_of(u)
+        for i,v in enumerate(kids):
+            xs[v] = xu + rel[v]
+            if u in stacked: depth[v] = depth[u] + 1 + i*STACK_STEP
+        stack.extend(reversed(kids))
+    minx = min(xs.values())
+    return ({u: (xs[u] - minx, depth[u]) for u in order}, max(xs.values()) - minx + 1,
+            max(map(depth.__getitem__, order)) + 1)
+
+def compute_layout(model: OrgModel, root: int, compact: bool = False, collapsed=()):
+    """{id: (x, depth)}; ayrıntı _tree_layout'ta."""
+    return _tree_layout(model, root, compact, collapsed)[0]
+
+def _tree_layout(model: OrgModel, root: int, compact: bool = False, collapsed=()):
+    """
+    Yinelemeli (açık yığınlı) Reingold–Tilford düzeni; O(n), özyineleme sınırına takılmaz.
+    {id: (x, depth)} döner; x sütun biriminde (kesirli olabilir, en soldaki 0).
+    Alt ağaçlar kontur karşılaştırmasıyla sıkıca yan yana yerleşir, ebeveyn ilk ve son
+    çocuğun ortasına gelir. compact=True: çocuklarının hepsi yaprak olan yöneticide
+    yapraklar alt alta (kesirli depth ile) istiflenir. collapsed: alt ağacı gizlenen
+    (katlanmış) yöneticiler; yaprak gibi yerleşir. (yerleşim, sütun, satır) döner.
+    """
+    kids_of = (lambda u: () if u in collapsed else model.kids(u)) if collapsed else model.kids
+    # önce-sıra (pre-order) listesi ve derinlikler
+    order, depth = [], {root: 0}
+    stack = [root]
+    while stack:
+        u = stack.pop(); order.append(u)
+        du = depth[u] + 1
+        for v in reversed(kids_of(u)):
+            depth[v] = du; stack.append(v)
+
+    rel: Dict[int, float] = {root: 0.0}
+    stacked = set()
+    left, right = {}, {}
+    for u in reversed(order):  # çocuklar ebeveynden önce
+        d = depth[u]; kids = kids_of(u)
+        if not kids:
+            left[u] = ({d: 0.0}, 0.0); right[u] = ({d: 0.0}, 0.0); continue
+        if is_stacked(model, u, compact, collapsed):
+            for v in kids:
+                rel[v] = STACK_INDENT; left.pop(v); right.pop(v)
+            stacked.add(u)
+            left[u], right[u] = _stack_contour(d, len(kids)); continue
+        xs, left[u], right[u] = _merge_contours(d, [left.pop(v) for v in kids], [right.pop(v) for v in kids])
+        rel.update(zip(kids, xs))
+    return _place(root, kids_of, rel, depth, stacked)
+
+def is_stacked(model: OrgModel, u: int, compact: bool, collapsed=()) -> bool:
+    """compute_layout(compact=True) bu yöneticinin yapraklarını alt alta mı dizdi? (katlanmış çocuk yaprak sayılır)"""
+    if not compact or u in collapsed: return False
+    kids = model.kids(u)
+    return len(kids) > 1 and not any(model.has_kids(v) and v not in collapsed for v in kids)
+
+def collapse_below(model: OrgModel, roots: List[int], levels: int) -> set:
+    """İlk `levels` düzey açık kalacak şekilde katlanacak yöneticiler (yalnız görünür kısım gezilir)."""
+    out, frontier = set(), list(roots)
+    for _ in range(levels - 1):
+        frontier = [v for u in frontier for v in model.kids(u)]
+    out.update(u for u in frontier if model.has_kids(u))
+    return out
+
+class FoldableLayout:
+    """
+    Katlanabilir alt ağaçlarla artımlı yerleşim (kök başına compute_layout ile aynı sonuç).
+    Her görünür düğümün alt ağaç konturu ve çocuklarının göreli x'leri saklanır; bir
+    yönetici açılıp kapanınca yalnız onun (yeni görünen alt ağacı) ve köke giden omurga
+    yeniden hesaplanır, kardeş alt ağaçların konturları önbellekten gelir. Gizli kısımlar
+    hiç yerleşmez. layouts() layout_forest ile aynı biçimi döner. toggle/reveal ile
+    layouts() farklı iş parçacıklarından çağrılabilir (kilitli). updated: yeniden
+    hesaplanan kontur sayısı.
+    """
+    @TRACE.traced("fold.init")
+    def __init__(self, model: OrgModel, roots: List[int], compact: bool = False, collapsed=()):
+        self.model, self.roots, self.compact = model, list(roots), compact
+        self.collapsed = set(collapsed)
+        self._root_set = set(self.roots)
+        self._contour: Dict[int, tuple] = {}   # u -> ((sol, ofset), (sağ, ofset)); değiştirilmez
+        self._rel: Dict[int, float] = {}       # u -> ebeveynine göre x
+        self._stacked: set = set()
+        self._depth: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.updated = 0
+        for r in self.roots:
+            self._depth[r] = 0; self._rel[r] = 0.0; self._fill(r)
+
+    def kids(self, u: int):
+        return () if u in self.collapsed else self.model.kids(u)
+
+    def _fill(self, top: int):
+        """top'un görünür alt ağacında konturu olmayan düğümleri alttan üste hesaplar."""
+        order, stack = [], [top]
+        while stack:
+            u = stack.pop(); order.append(u)
+            du = self._depth[u] + 1
+            for v in self.kids(u):
+                self._depth[v] = du
+                if v not in self._contour: stack.append(v)
+        for u in reversed(order): self._update(u)
+
+    def _update(self, u: int):
+        """u'nun konturu, çocuklarının (saklı) konturlarının kopyalarından."""
+        d, kids, cont = self._depth[u], self.kids(u), self._contour
+        self._stacked.discard(u); self.updated += 1
+        if not kids:
+            cont[u] = (({d: 0.0}, 0.0), ({d: 0.0}, 0.0))
+        elif is_stacked(self.model, u, self.compact, self.collapsed):
+            for v in kids: self._rel[v] = STACK_INDENT
+            self._stacked.add(u); cont[u] = _stack_contour(d, len(kids))
+        else:
+            xs, l, r = _merge_contours(d, [(dict(cont[v][0][0]), cont[v][0][1]) for v in kids],
+                                       [(dict(cont[v][1][0]), cont[v][1][1]) for v in kids])
+            self._rel.update(zip(kids, xs)); cont[u] = (l, r)
+
+    def _carry(self, top: int, base: "FoldableLayout", marked: Optional[set]):
+        """
+        _fill gibi; ancak görünür alt ağacı base'dekiyle aynı olan (aynı kullanıcılar,
+        çocuk sırası, derinlik ve katlama) düğümlerin konturu ve çocuklarının göreli
+        x'leri base'den kopyalanır; değişen düğümler ve ataları yeniden hesaplanır.
+        marked verilirse çocuk listeleri yalnız bu düğümlerde karşılaştırılır.
+        """
+        users, busers, bidx = self.model.users, base.model.users, base.model.index
+        depth, bdepth, bcont = self._depth, base._depth, base._contour
+        coll, bcoll, kids_of, bkids_of = self.collapsed, base.collapsed, self.kids, base.kids
+        order, stack, old = [], [top], {}
+        while stack:
+            u = stack.pop(); kids = kids_of(u); order.append((u, kids))
+            du = depth[u]
+            for v in kids: depth[v] = du + 1
+            stack.extend(kids)
+            o = bidx.get(users[u])
+            if o is None or bdepth.get(o) != du or o not in bcont or (o in bcoll) != (u in coll): continue
+            if (marked is None or u in marked) and [users[v] for v in kids] != [busers[w] for w in bkids_of(o)]: continue
+            old[u] = o
+        parent, rel, brel, bstacked = self.model.parent, self._rel, base._rel, base._stacked
+        changed = set()   # yeniden hesaplanan bir çocuğu olan düğümler
+        for u, kids in reversed(order):
+            o = old.get(u)
+            if o is None or u in changed:
+                self._update(u); changed.add(parent[u]); continue
+            self._contour[u] = bcont[o]
+            for v in kids: rel[v] = brel[old[v]]
+            if o in bstacked: self._stacked.add(u)
+
+    @TRACE.traced("fold.rebase")
+    def rebase(self, model: OrgModel, roots: List[int], diff: Optional[TableDiff] = None) -> "FoldableLayout":
+        """
+        Aynı tablonun yeniden okunmuş sürümü (model; id'ler farklı olabilir) için yerleşim.
+        Katlı yöneticiler kullanıcı adıyla taşınır; yalnız değişen alt ağaçlar ve köke
+        giden omurgaları yeniden hesaplanır. diff (diff_models) verilirse çocuk sırası
+        yalnız eklenen/çıkan/taşınan/adı değişen kişilerin eski ve yeni yöneticilerinde
+        karşılaştırılır (diğer düğümlerde derinlik ve katlama yeterlidir).
+        """
+        old, idx = self.model, model.index
+        collapsed = {j for j in (idx.get(old.users[u]) for u in self.collapsed) if j is not None and model.has_kids(j)}
+        marked = None
+        if diff is not None:
+            oidx, marked = old.index, set()
+            renamed = [u for u in diff.edited if old.names[oidx[u]] != model.names[idx[u]]]
+            for u in (*diff.added, *diff.removed, *diff.moved, *renamed):
+                for m, i in ((old, oidx.get(u)), (model, idx.get(u))):
+                    if i is None: continue
+                    p = m.parent[i]
+                    for j in (idx.get(u), idx.get(m.users[p]) if p >= 0 else None):
+                        if j is not None: marked.add(j)
+        new = FoldableLayout(model, [], self.compact, collapsed)
+        new.roots, new._root_set = list(roots), set(roots)
+        with self._lock:
+            for r in new.roots:
+                new._depth[r] = 0; new._rel[r] = 0.0; new._carry(r, self, marked)
+        return new
+
+    def copy(self) -> "FoldableLayout":
+        """Bağımsız kopya (konturlar paylaşılır, değiştirilmezler); toggle/reveal aslını etkilemez."""
+        new = FoldableLayout.__new__(FoldableLayout)
+        new.model, new.roots, new.compact, new._root_set = self.model, self.roots, self.compact, self._root_set
+        new._lock, new.updated = threading.Lock(), 0
+        with self._lock:
+            new.collapsed, new._stacked = set(self.collapsed), set(self._stacked)
+            new._contour, new._rel, new._depth = dict(self._contour), dict(self._rel), dict(self._depth)
+        return new
+
+    def _spine(self, u: int):
+        """u'dan çizilen köke kadar atalar (u dahil), alttan üste."""
+        parent, out = self.model.parent, [u]
+        while u not in self._root_set:
+            u = parent[u]; out.append(u)
+        return out
+
+    def contains(self, u: int) -> bool:
+        """u çizilen köklerden birinin altında mı (görünür olmasa da)?"""
+        parent, seen = self.model.parent, 0
+        while u >= 0 and seen <= len(parent):
+            if u in self._root_set: return True
+            u = parent[u]; seen += 1
+        return False
+
+    @TRACE.traced("fold.toggle")
+    def toggle(self, u: int) -> bool:
+        """Yöneticiyi açar/kapatır; değişiklik olduysa True."""
+        if not self.model.has_kids(u) or not self.contains(u): return False
+        with self._lock:
+            if u in self.collapsed:
+                self.collapsed.discard(u)
+                self._fill(u)
+            else:
+                self.collapsed.add(u); self._update(u)
+            for a in self._spine(u)[1:]: self._update(a)
+        return True
+
+    def reveal(self, u: int) -> bool:
+        """u görünene kadar katlanmış atalarını açar; değişiklik olduysa True."""
+        if not self.contains(u): return False
+        spine = self._spine(u)[1:]
+        closed = [a for a in spine if a in self.collapsed]
+        if not closed: return False
+        with self._lock:
+            for a in reversed(closed):   # yukarıdan aşağı: her açılış bir alt düzeyi görünür yapar
+                self.collapsed.discard(a)
+            for a in reversed(closed): self._fill(a)
+            for a in spine: self._update(a)
+        return True
+
+    def layouts(self) -> list:
+        with self._lock:
+            depth = dict(self._depth)   # _place istif derinliklerini yazar; kökler ayrık alt ağaçlar
+            return pack_forest(self.model, self.roots, lambda r: _place(r, self.kids, self._rel, depth, self._stacked))
+
+# -------------- Arama --------------
+SEARCH_LIMIT = 500   # bir sorguda döndürülen en fazla sonuç
+_WORD_RE = re.compile(r"\w+")
+_KEY_END = "\U0010ffff"
+_SET_MAX = 50_000   # bu boyuta kadar olan önek aralıkları kesişim için kümeye çevrilir
+
+def fold_tr(s: str) -> str:
+    """Türkçe kurallı küçük harf: İ->i, I->ı (str.lower 'I'yı 'i' yapar, 'İ'yı 'i̇' bırakır)."""
+    return s.replace("İ", "i").replace("I", "ı").lower()
+
+class SearchIndex:
+    """
+    Kullanıcı adı, Ad Soyad, Pozisyon ve Mail üzerinde kelime-öneki dizini; yükleme
+    başına bir kez kurulur. Sıralı (kelime, id) dizilerinde bisect ile önek aralığı
+    bulunur; sorgu kelimelerinin en dar aralığı taranır, diğerleri aralık kesişimiyle
+    denetlenir. Önek eşleşmesi yoksa kelime ortası aranır: tüm metinler tek dizgide,
+    str.find ile doğrusal (100 bin kişide birkaç ms).
+    """
+    __slots__ = ("keys", "ids", "text", "starts")
+
+    @TRACE.traced("search_index")
+    def __init__(self, model: OrgModel):
+        pairs, parts, starts, pos = [], [], array("i"), 0
+        for i in range(len(model)):
+            words = dict.fromkeys(_WORD_RE.findall(fold_tr(
+                f"{model.users[i]} {model.names[i]} {model.title(i)} {model.mails[i]}")))
+            pairs.extend((w, i) for w in words)
+            t = " " + " ".join(words) + "\n"
+            parts.append(t); starts.append(pos); pos += len(t)
+        starts.append(pos)
+        pairs.sort()
+        self.keys: List[str] = [w for w, _ in pairs]
+        self.ids = array("i", [i for _, i in pairs])
+        self.text, self.starts = "".join(parts), starts
+
+    def __len__(self): return len(self.starts) - 1
+
+    def _has_prefix(self, i: int, word: str) -> bool:
+        return self.text.find(" " + word, self.starts[i], self.starts[i+1]) >= 0
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT, accept=None) -> List[int]:
+        """
+        Sorgunun tüm kelimelerini (önek olarak) içeren kişi id'leri; kelime sırasına
+        göre. accept(id) verilirse yalnız kabul edilenler sayılır (ör. görünür kişiler).
+        """
+        words = _WORD_RE.findall(fold_tr(query))
+        if not words: return []
+        keys, out, seen = self.keys, [], set()
+        ranges = [(bisect_right(keys, w + _KEY_END) - (lo := bisect_left(keys, w)), lo, w) for w in words]
+        ranges.sort()
+        size, lo, first = ranges[0]
+        if size:
+            # diğer kelimelerin aralıkları küçükse küme üyeliği, değilse metin denetimi
+            sets = [set(self.ids[l:l+n]) for n, l, w in ranges[1:] if w != first and n <= _SET_MAX]
+            rest = [w for n, _, w in ranges[1:] if w != first and n > _SET_MAX]
+            for i in self.ids[lo:lo+size]:
+                if i in seen: continue
+                seen.add(i)
+                if all(i in s for s in sets) and all(self._has_prefix(i, w) for w in rest) \
+                        and (accept is None or accept(i)):
+                    out.append(i)
+                    if len(out) >= limit: break
+            return out
+        # önek yok: kelime ortasında ara
+        rest = [w for w in words if w != first]
+        text, starts, pos = self.text, self.starts, 0
+        while len(out) < limit:
+            pos = text.find(first, pos)
+            if pos < 0: break
+            i = bisect_right(starts, pos) - 1
+            if all(text.find(w, starts[i], starts[i+1]) >= 0 for w in rest) and (accept is None or accept(i)):
+                out.append(i)
+            pos = starts[i+1]
+        return out
+
+# -------------- Çizim --------------
+def rel_luma(rgb):
+    r,g,b = [x/255.0 for x in rgb]
+    def adj(v): return v/12.92 if v<=0.03928 else ((v+0.055)/1.055)**2.4
+    r,g,b = adj(r), adj(g), adj(b)
+    return 0.2126*r + 0.7152*g + 0.0722*b
+
+def text_color_for(bg_rgb): return (255,255,255) if rel_luma(bg_rgb) < 0.55 else (26,32,44)
+def darker(rgb, f=0.80): return tuple(max(0, int(c*f)) for c in rgb)
+
+TILE_SIZE = 256        # ön-izleme karo kenarı (px)
+TILE_CACHE_MAX = 160   # LRU'da tutulan en fazla karo (~30 MB)
+PYRAMID_TILES = 256    # piramit düzey karoları LRU üst sınırı (~48 MB)
+PYRAMID_MAX = 3        # en kaba karo düzeyi: sahne × 2^-3 (%12,5)
+OVERVIEW_SIZE = (320, 200)   # genel bakış (mini harita) en fazla bu boyuta sığar
+# Isı stilleri: kart rengi alt ağaç değerinden (log ölçekli dilimler; çizilen kartların en büyüğüne göre)
+HEAT_STYLES = {"headcount": "Ekip Büyüklüğü", "span": "Doğrudan Bağlı"}
+HEAT_COLORS = [(255,247,188), (254,217,118), (253,141,60), (227,26,28), (128,0,38)]   # az -> çok
+INDEX_CELL = 512       # uzamsal ızgara hücresi (px)
+
+class GridIndex:
+    """Dikdörtgenler için tekdüze ızgara; bölge sorgusu yalnızca kesişen hücrelere bakar."""
+    def __init__(self, cell: int = INDEX_CELL):
+        self.cell = cell
+        self.cells: Dict[Tuple[int,int], List[int]] = {}
+
+    def _span(self, rect):
+        c = self.cell; x0,y0,x1,y1 = rect
+        return range(int(x0)//c, int(x1)//c+1), range(int(y0)//c, int(y1)//c+1)
+
+    def insert(self, item: int, rect):
+        gxs, gys = self._span(rect)
+        for gx in gxs:
+            for gy in gys: self.cells.setdefault((gx,gy), []).append(item)
+
+    def query(self, rect) -> List[int]:
+        gxs, gys = self._span(rect); out = set()
+        for gx in gxs:
+            for gy in gys: out.update(self.cells.get((gx,gy), ()))
+        return sorted(out)
+
+class ChartScene:
+    """
+    draw_chart'ın geometri katmanı: kutu ve bağlantı konumlarını (render ölçeğinde)
+    piksel üretmeden hesaplar. paint()/render() yalnızca istenen bölgeyle kesişen
+    öğeleri çizer; böylece karo bazlı ön-izleme tüm şemayı belleğe almaz.
+    """
+    @TRACE.traced("scene")
+    def __init__(self, model: OrgModel, start_from, scale, title_colors, show_dept, show_mail, highlight, color_style, add_legend=True, compact=False, layouts=None, collapsed=(), badges=False):
+        self.model = model
+        self.collapsed = frozenset(collapsed)   # katlanmış yöneticiler: tek kart + kişi sayısı rozeti
+        self.scale, self.title_colors = scale, dict(title_colors)
+        self.show_dept, self.show_mail = show_dept, show_mail
+        self.highlight, self.color_style = highlight, color_style   # "bg" | "stripe" | HEAT_STYLES
+        self.badges = badges   # yöneticilerde ekip (altındaki kişi sayısı) rozeti
+        self.start_from, self.add_legend, self.compact = start_from, add_legend, compact
+        self.key = self._make_key()
+        self.bboxes: Dict[int, Tuple[int,int,int,int]] = {}
+        self.items: List[Tuple[str, object]] = []   # ("edge", noktalar) | ("box", id) | ("legend", None)
+        self.rects: List[Tuple[int,int,int,int]] = []  # öğe sınırları (items ile paralel)
+        self.box_item: Dict[int, int] = {}
+        self.by_title: Dict[int, List[int]] = {}       # pozisyon id -> çizilen kartlar
+        self.index = GridIndex()
+        self.legend_items, self.legend_rect, self.legend_item = [], None, None
+        self.legend_title = "Pozisyon Renkleri"
+        self._title_rgb = [title_colors.get(t) for t in model.title_table]
+        self._heat: Optional[List[int]] = None   # ısı stilinde dilimlerin alt sınırları
+        if not model:
+            self.width = self.base_width = 900; self.height = 600; return
+
+        draw_roots = chart_roots(model, start_from)
+
+        self.BW, self.BH = BW, BH = int(BOX_W*scale), int(BOX_H*scale)
+        self.PX = PX = int(BOX_PAD_X*scale); RG, CG = int(ROW_GAP*scale), int(COL_GAP*scale)
+        FTS, FSS = max(11,int(FONT_TITLE_SIZE*scale)), max(10,int(FONT_SUB_SIZE*scale))
+        self.font_title, self.font_sub = ensure_font(FTS), ensure_font(FSS)
+
+        if layouts is None: layouts = layout_forest(model, draw_roots, compact, self.collapsed)
+        self.layouts = layouts
+        total_cols = sum(cols for _, cols in layouts)
+        self.base_width = PX*2 + int(round(total_cols*BW + (total_cols-1)*CG))
+
+        lw = max(1,int(2*scale))
+        edges, boxes = [], []
+        xoff, max_y = 0, -1.0
+        for layout, cols in layouts:
+            for u,(cx,cy) in layout.items():
+                x0 = PX + int(round((xoff+cx)*(BW+CG))); y0 = PX + int(round(cy*(BH+RG)))
+                if cy > max_y: max_y = cy
+                self.bboxes[u] = (x0, y0, x0+BW, y0+BH)
+                boxes.append(u); self.by_title.setdefault(model.title_ids[u], []).append(u)
+            # bağlantılar
+            for u in layout:
+                px0,_,_,py1 = self.bboxes[u]; xu = px0 + BW//2
+                if is_stacked(model, u, compact, self.collapsed):
+                    # istiflenmiş yapraklar: soldan inen omurga + her karta yatay kol
+                    sx = px0 + int(20*scale)
+                    for v in model.kids(u):
+                        vx0,vy0,_,vy1 = self.bboxes[v]; my = (vy0+vy1)//2
+                        edges.append([(sx,py1),(sx,my),(vx0,my)])
+                    continue
+                for v in model.kids(u):
+                    if v not in layout: continue
+                    vx0,vy0,_,_ = self.bboxes[v]; xv = vx0 + BW//2
+                    mid_y = (py1 + vy0)//2
+                    edges.append([(xu,py1),(xu,mid_y),(xv,mid_y),(xv,vy0)])
+            xoff += cols
+        max_depth = max_y + 1
+        self.height = PX*2 + int(round(max_depth*BH + (max_depth-1)*RG))
+        self._heat = self._heat_bins()
+        self._legend_geometry()
+
+        # çizim sırası: önce bağlantılar, sonra kutular, en son legend
+        for pts in edges:
+            xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
+            self._add("edge", pts, (min(xs)-lw, min(ys)-lw, max(xs)+lw, max(ys)+lw))
+        m = int(24*scale)  # gölge, vurgu halkası ve taşan metin payı
+        for u in boxes:
+            x0,y0,x1,y1 = self.bboxes[u]
+            self._add("box", u, (x0-4, y0-4, x1+m, y1+m))
+        if self.legend_rect: self._add_legend_item()
+
+    def _legend_geometry(self):
+        """Legend (tekilleştirilmiş) öğeleri, dikdörtgeni ve toplam genişlik."""
+        scale = self.scale
+        self.legend_items, self.legend_rect, legend_w = [], None, 0
+        self.legend_title = HEAT_STYLES.get(self.color_style, "Pozisyon Renkleri")
+        if self.add_legend and self._heat is not None:
+            self.legend_items = self._heat_legend(); legend_w = int(260*scale)
+        elif self.add_legend and self.title_colors:
+            present = {self.model.title_table[t] for t in set(self.model.title_ids)}
+            uniq_titles = sorted(t for t in present if self.title_colors.get(t))
+            self.legend_items = [(t, self.title_colors[t]) for t in uniq_titles]
+            if self.legend_items: legend_w = int(260*scale)
+        self.width = self.base_width + legend_w
+        if self.legend_items:
+            lx0 = self.width - legend_w + int(12*scale)
+            ly0 = int(16*scale); lx1 = self.width - int(12*scale)
+            ly1 = ly0 + int((len(self.legend_items)*24 + 56)*scale)
+            self.legend_rect = (lx0, ly0, lx1, ly1)
+
+    def _heat_value(self, u: int) -> int:
+        st = self.model.stats()
+        return st.size[u] - 1 if self.color_style == "headcount" else st.reports[u]
+
+    def _heat_bins(self) -> Optional[List[int]]:
+        """Isı stilinde HEAT_COLORS dilimlerinin alt sınırları (0 yalnız ilk dilimde); değilse None."""
+        if self.color_style not in HEAT_STYLES or not self.bboxes: return None
+        top = math.log1p(max(map(self._heat_value, self.bboxes)))
+        k = len(HEAT_COLORS)
+        return [0] + [max(1, math.ceil(math.expm1(i * top / k) - 1e-9)) for i in range(1, k)]
+
+    def _heat_legend(self) -> List[Tuple[str, Tuple[int,int,int]]]:
+        """Boş olmayan dilimler: ("a–b", renk)."""
+        lo, top = self._heat, max(map(self._heat_value, self.bboxes))
+        out = []
+        for i, col in enumerate(HEAT_COLORS):
+            hi = lo[i+1] - 1 if i + 1 < len(lo) else top
+            if lo[i] <= hi: out.append((f"{lo[i]}" if lo[i] == hi else f"{lo[i]}–{hi}", col))
+        return out
+
+    def _card_rgb(self, u: int) -> Optional[Tuple[int,int,int]]:
+        """Kartın rengi: ısı stilinde değerinin dilimi, değilse pozisyon rengi (yoksa None)."""
+        if self._heat is None: return self._title_rgb[self.model.title_ids[u]]
+        return HEAT_COLORS[bisect_right(self._heat, self._heat_value(u)) - 1]
+
+    def _add_legend_item(self):
+        lx0, ly0, _, ly1 = self.legend_rect
+        rect = (lx0, ly0, self.width, ly1 + int(24*self.scale))
+        if self.legend_item is None:
+            self.legend_item = len(self.items); self._add("legend", None, rect)
+        else:
+            self.rects[self.legend_item] = rect; self.index.insert(self.legend_item, rect)
+
+    def _add(self, kind, ref, rect):
+        i = len(self.items)
+        if kind == "box": self.box_item[ref] = i
+        self.index.insert(i, rect); self.items.append((kind, ref)); self.rects.append(rect)
+
+    def _make_key(self):
+        # karo önbelleği bu anahtar değişince geçersiz olur
+        return (id(self.model), self.start_from, self.scale, self.show_dept, self.show_mail,
+                self.highlight, self.color_style, self.add_legend, self.compact,
+                tuple(sorted(self.title_colors.items())), self.collapsed, self.badges)
+
+    def box_rect(self, u: int):
+        """Kartın çizim sınırı (gölge, vurgu halkası ve metin payı dahil)."""
+        i = self.box_item.get(u)
+        return self.rects[i] if i is not None else None
+
+    def hit(self, x: float, y: float) -> Optional[int]:
+        """(x,y) noktasındaki (render ölçeğinde) kartın kişi id'si; yalnız noktanın ızgara hücresine bakılır."""
+        c = self.index.cell; items, bboxes = self.items, self.bboxes
+        for i in reversed(self.index.cells.get((int(x)//c, int(y)//c), ())):
+            kind, u = items[i]
+            if kind != "box": continue
+            x0,y0,x1,y1 = bboxes[u]
+            if x0 <= x < x1 and y0 <= y < y1: return u
+        return None
+
+    def set_highlight(self, u: Optional[int]) -> List[Tuple[int,int,int,int]]:
+        """Vurguyu yerinde değiştirir; yeniden çizilmesi gereken bölgeleri döner."""
+        dirty = [r for r in (self.box_rect(x) for x in {self.highlight, u} if x is not None) if r]
+        self.highlight = u; self.key = self._make_key()
+        return dirty
+
+    # Yerinde güncellemeler: yerleşim korunur. Dönen liste yeniden çizilecek bölgelerdir;
+    # None, tüm karoların (ya da şema boyutunun) değiştiğini bildirir.
+    def set_colors(self, title_colors) -> Optional[List[Tuple[int,int,int,int]]]:
+        """Yalnız rengi değişen pozisyonların kartları (by_title) ve legend yeniden çizilir."""
+        changed = {t for t in set(self.title_colors) | set(title_colors) if self.title_colors.get(t) != title_colors.get(t)}
+        if not changed: return []
+        old_w, old_legend = self.width, self.legend_rect
+        self.title_colors = dict(title_colors); self.key = self._make_key()
+        self._title_rgb = [title_colors.get(t) for t in self.model.title_table]
+        dirty = [self.rects[self.box_item[u]] for t in changed for u in self.by_title.get(self.model.title_id(t), ())]
+        self._legend_geometry()
+        if self.width != old_w:
+            if self.legend_rect: self._add_legend_item()
+            return None
+        for r in (old_legend, self.legend_rect):
+            if r: dirty.append((r[0], r[1], self.width, r[3] + int(24*self.scale)))
+        if self.legend_rect: self._add_legend_item()
+        return dirty
+
+    def set_display(self, show_dept: bool, show_mail: bool, color_style: str, badges: Optional[bool] = None) -> Optional[List[Tuple[int,int,int,int]]]:
+        """Kart içeriği/stili değişir, kartların yeri aynı kalır (ısı stiline geçişte legend değişebilir)."""
+        if badges is None: badges = self.badges
+        if (show_dept, show_mail, color_style, badges) == (self.show_dept, self.show_mail, self.color_style, self.badges): return []
+        heat = color_style in HEAT_STYLES or self.color_style in HEAT_STYLES
+        self.show_dept, self.show_mail, self.color_style, self.badges = show_dept, show_mail, color_style, badges
+        self.key = self._make_key()
+        if heat and self.model:
+            self._heat = self._heat_bins(); self._legend_geometry()
+            if self.legend_rect: self._add_legend_item()
+        return None
+
+    def rescaled(self, factor: float) -> "ChartScene":
+        """Aynı yerleşim ve görünüm ayarlarıyla factor kat ölçekli sahne (yerleşim yeniden hesaplanmaz)."""
+        return ChartScene(self.model, self.start_from, self.scale*factor, self.title_colors, self.show_dept,
+                          self.show_mail, self.highlight, self.color_style, self.add_legend, self.compact,
+                          getattr(self, "layouts", None), self.collapsed, self.badges)
+
+    def rebuilt(self, model: OrgModel, start_from, layouts, collapsed=()) -> "ChartScene":
+        """Aynı görünüm ayarlarıyla yeni model/yerleşim için sahne (yeniden okunan tablo); vurgu kullanıcı adıyla taşınır."""
+        h = self.model.users[self.highlight] if self.highlight is not None else None
+        return ChartScene(model, start_from, self.scale, self.title_colors, self.show_dept, self.show_mail,
+                          model.index.get(h), self.color_style, self.add_legend, self.compact, layouts, collapsed, self.badges)
+
+    def dirty_since(self, old: "ChartScene") -> Optional[List[Tuple[int,int,int,int]]]:
+        """
+        Aynı ayarlı eski sahneye (modelin önceki sürümü) göre yeniden çizilmesi gereken
+        bölgeler: yeri ya da içeriği değişen, eklenen ve çıkan kartlar, değişen bağlantılar
+        ve legend. Kişiler kullanıcı adıyla eşlenir. Ölçek/görünüm farklıysa None.
+        """
+        if (old.scale, old.show_dept, old.show_mail, old.color_style, old.add_legend, old.compact, old.title_colors, old.badges) != \
+           (self.scale, self.show_dept, self.show_mail, self.color_style, self.add_legend, self.compact, self.title_colors, self.badges):
+            return None
+        m, om = self.model, old.model
+        dirty, seen = [], set()
+        for u, bb in self.bboxes.items():
+            o = om.index.get(m.users[u])
+            if o is not None and o in old.bboxes:
+                seen.add(o)
+                if (old.bboxes[o] == bb and om.names[o] == m.names[u] and om.mails[o] == m.mails[u]
+                        and om.title(o) == m.title(u) and om.dept(o) == m.dept(u)
+                        and (o == old.highlight) == (u == self.highlight)
+                        and (o in old.collapsed) == (u in self.collapsed)
+                        and (u not in self.collapsed or om.subtree_size(o) == m.subtree_size(u))
+                        and old._card_rgb(o) == self._card_rgb(u)
+                        and (not self.badges or old._team_text(o) == self._team_text(u))): continue
+                dirty.append(old.box_rect(o))
+            dirty.append(self.box_rect(u))
+        dirty.extend(old.box_rect(o) for o in old.bboxes if o not in seen)
+        edges = {tuple(ref): r for (kind, ref), r in zip(self.items, self.rects) if kind == "edge"}
+        old_edges = {tuple(ref): r for (kind, ref), r in zip(old.items, old.rects) if kind == "edge"}
+        dirty.extend(r for k, r in edges.items() if k not in old_edges)
+        dirty.extend(r for k, r in old_edges.items() if k not in edges)
+        if (old.legend_items, old.legend_rect, old.width) != (self.legend_items, self.legend_rect, self.width):
+            dirty.extend(sc.rects[sc.legend_item] for sc in (old, self) if sc.legend_item is not None)
+        return dirty
+
+    # ---- çizim ----
+    def overview(self, ratio: float, rect=None) -> Image.Image:
+        """
+        Şematik küçük görüntü (mini harita): kartlar renkli dikdörtgen, bağlantılar tek piksel; metin yok.
+        rect verilirse (ratio ölçeğinde) yalnız o bölge çizilir (uzak yakınlaştırma karoları).
+        """
+        if rect is None: ox, oy, ex, ey = 0, 0, max(1,int(self.width*ratio)), max(1,int(self.height*ratio)); sr = (0, 0, self.width, self.height)
+        else: ox, oy, ex, ey = rect; sr = (ox/ratio, oy/ratio, ex/ratio, ey/ratio)
+        img = Image.new("RGB", (max(1,ex-ox), max(1,ey-oy)), CANVAS_BG)
+        d = ImageDraw.Draw(img)
+        for i in self.items_in(sr):
+            kind, ref = self.items[i]
+            if kind == "edge":
+                d.line([(x*ratio-ox, y*ratio-oy) for x,y in ref], fill=LINE_COLOR, width=1)
+            elif kind == "box":
+                x0,y0,x1,y1 = [v*ratio for v in self.bboxes[ref]]
+                x0, y0, x1, y1 = x0-ox, y0-oy, x1-ox, y1-oy
+                col = self._card_rgb(ref)
+                fill = col if (col and self.color_style != "stripe") else BOX_BG
+                d.rectangle([x0, y0, max(x0, x1-1), max(y0, y1-1)], fill=fill, outline=darker(col, 0.75) if col else BOX_BORDER)
+        return img
+
+    def render(self, rect=None) -> Image.Image:
+        """rect=(x0,y0,x1,y1) bölgesini (None ise tüm şemayı) yeni bir görüntüye çizer."""
+        if rect is None: rect = (0, 0, self.width, self.height)
+        x0,y0,x1,y1 = [int(v) for v in rect]
+        img = Image.new("RGB", (max(1,x1-x0), max(1,y1-y0)), CANVAS_BG)
+        self.paint(img, x0, y0)
+        return img
+
+    def items_in(self, rect) -> List[int]:
+        """Bölgeyle kesişen öğeler, çizim sırasında."""
+        x0,y0,x1,y1 = rect
+        if x0 <= 0 and y0 <= 0 and x1 >= self.width and y1 >= self.height: return list(range(len(self.items)))
+        # ızgara hücre adayları; ince şeritlerde (akışlı PNG) gerçekten kesişenlerle sınırla
+        rects = self.rects
+        return [i for i in self.index.query(rect) if rects[i][0] < x1 and rects[i][2] > x0 and rects[i][1] < y1 and rects[i][3] > y0]
+
+    def paint(self, img: Image.Image, ox: int = 0, oy: int = 0):
+        """Görüntünün kapsadığı bölgeye ((ox,oy) orijinli) düşen öğeleri çizer."""
+        if not self.items: return
+        d = ImageDraw.Draw(img)
+        for i in self.items_in((ox, oy, ox+img.width, oy+img.height)):
+            for op in self.item_ops(i):
+                if op[0] == "rrect":
+                    _, (x0,y0,x1,y1), r, fill, outline, w = op
+                    d.rounded_rectangle([x0-ox,y0-oy,x1-ox,y1-oy], radius=r, fill=fill, outline=outline, width=w)
+                elif op[0] == "text":
+                    _, (x,y), text, font, col = op
+                    draw_text(img, (x-ox, y-oy), text, font, col)
+                else:
+                    _, pts, col, w = op
+                    pts = [(x-ox, y-oy) for x,y in pts]
+                    for a,b in zip(pts, pts[1:]): d.line([a,b], fill=col, width=w)
+
+    # Çizim komutları sahne koordinatındadır; raster (paint) ve vektör (org_chart_vector)
+    # arka uçları aynı listeyi çizer:
+    #   ("rrect", (x0,y0,x1,y1), yarıçap, dolgu|None, kenar|None, kalınlık)
+    #   ("text", (x,y), metin, font, renk)   — (x,y) sol-üst, metin "\n" ile çok satırlı olabilir
+    #   ("line", noktalar, renk, kalınlık)
+    def item_ops(self, i: int) -> list:
+        kind, ref = self.items[i]
+        if kind == "edge": return [("line", ref, LINE_COLOR, max(1,int(2*self.scale)))]
+        if kind == "box": return self._box_ops(ref)
+        return self._legend_ops() if self.legend_rect else []
+
+    def _box_ops(self, u):
+        scale, m = self.scale, self.model
+        x0,y0,x1,y1 = self.bboxes[u]
+        radius, bw = int(18*scale), max(1,int(2*scale))
+
+        pos_col = self._card_rgb(u)
+        if self.color_style != "stripe" and pos_col:   # "bg" ve ısı stilleri kartı boyar
+            fill_col = pos_col
+            txt_main = text_color_for(fill_col)
+            txt_sub  = text_color_for(tuple(min(255,int(c*1.1)) for c in fill_col))
+            ops = [("rrect", (x0+3,y0+3,x1+3,y1+3), radius, darker(fill_col,0.85), None, 1),
+                   ("rrect", (x0,y0,x1,y1), radius, fill_col, darker(pos_col, 0.75), bw)]
+        else:
+            ops = [("rrect", (x0+3,y0+3,x1+3,y1+3), radius, (225,230,240), None, 1),
+                   ("rrect", (x0,y0,x1,y1), radius, BOX_BG, BOX_BORDER, bw)]
+            txt_main, txt_sub = TEXT_COLOR, SUBTEXT
+            if pos_col and self.color_style == "stripe":
+                ops.append(("rrect", (x0,y0,x0+int(16*scale),y1), radius, pos_col, pos_col, 1))
+
+        if u == self.highlight:
+            ops.append(("rrect", (x0-2,y0-2,x1+2,y1+2), radius, None, HILIGHT, max(2,int(3*scale))))
+
+        pad = int(12*scale)
+        name = m.names[u] or m.users[u]
+        dept, mail = m.dept(u), m.mails[u]
+        line2 = m.title(u) + (f"  |  {dept}" if (self.show_dept and dept) else "")
+        line3 = mail if (self.show_mail and mail) else ""
+
+        max_name = 30 if scale>=1.0 else 24
+        max_sub  = 46 if scale>=1.0 else 36
+        ops.append(("text", (x0+pad, y0+int(10*scale)), wrap_text(name, max_name), self.font_title, txt_main))
+        ops.append(("text", (x0+pad, y0+int(36*scale)), wrap_text(line2, max_sub), self.font_sub, txt_sub))
+        if line3: ops.append(("text", (x0+pad, y0+int(58*scale)), line3, self.font_sub, txt_sub))
+        if u in self.collapsed: ops.extend(self._badge_ops(u))
+        elif self.badges and m.has_kids(u): ops.extend(self._badge_ops(u, self._team_text(u)))
+        return ops
+
+    def _team_text(self, u: int) -> str:
+        return f"{self.model.subtree_size(u) - 1} kişi"
+
+    def _badge_ops(self, u, text: Optional[str] = None):
+        """
+        Kartın alt kenarındaki rozet: katlanmışsa ortada gizli kişi sayısı ("+N"),
+        text verilirse sağda ekip rozeti (açık renkli).
+        """
+        scale = self.scale
+        x0,_,x1,y1 = self.bboxes[u]
+        team = text is not None
+        if not team: text = f"+{self.model.subtree_size(u) - 1}"
+        tw = int(self.font_sub.getlength(text)); h = int(22*scale); w = tw + int(18*scale)
+        bx0, by0 = (x1 - int(12*scale) - w if team else (x0+x1)//2 - w//2), y1 - h//2
+        fill, ink = ((255,255,255), BOX_BORDER) if team else (BOX_BORDER, (255,255,255))
+        return [("rrect", (bx0, by0, bx0+w, by0+h), h//2, fill, ink, max(1,int(2*scale))),
+                ("text", (bx0+int(9*scale), by0+int(4*scale)), text, self.font_sub, ink)]
+
+    def _legend_ops(self):
+        scale = self.scale
+        dfont = ensure_font(max(11,int(15*scale)))
+        sfont = ensure_font(max(10,int(12*scale)))
+        lx0,ly0,lx1,ly1 = self.legend_rect
+        ops = [("rrect", (lx0,ly0,lx1,ly1), int(12*scale), (255,255,255), (220,225,235), 1),
+               ("text", (lx0+int(12*scale), ly0+int(12*scale)), self.legend_title, dfont, (40,40,40))]
+        y = ly0 + int(40*scale)
+        for title, col in self.legend_items:
+            sz = int(18*scale)
+            ops.append(("rrect", (lx0+int(12*scale), y, lx0+int(12*scale)+sz, y+sz), int(6*scale), col, col, 1))
+            ops.append(("text", (lx0+int(12*scale)+sz+int(10*scale), y-2), title, sfont, (60,60,60)))
+            y += int(24*scale)
+        return ops
+
+def chart_roots(model: OrgModel, start_from: Optional[int]) -> List[int]:
+    """Çizilecek kökler: geçerli başlangıç düğümü, yoksa tüm kökler (hiç yoksa ilk kişi)."""
+    if start_from is not None and 0 <= start_from < len(model): return [start_from]
+    return model.roots or [0]
+
+@TRACE.traced("layout")
+def layout_forest(model: OrgModel, roots: List[int], compact=False, collapsed=()):
+    """
+    Her kök için compute_layout; [(layout, sütun_sayısı)] döner (ölçekten bağımsız,
+    önbelleklenebilir). Tek kişilik kökler pack_forest ile tek bir ızgara bloğundadır.
+    """
+    return pack_forest(model, roots, lambda r: _tree_layout(model, r, compact, collapsed))
+
+FOREST_PACK_MIN = 2   # en az bu kadar tek kişilik kök varsa ızgarada toplanır
+_COL_UNIT, _ROW_UNIT = BOX_W + COL_GAP, BOX_H + ROW_GAP   # yerleşim birimlerinin piksel oranı (ölçek 1)
+
+def pack_forest(model: OrgModel, roots: List[int], tree_layout) -> list:
+    """
+    Ormanı [(layout, sütun)] olarak dizer. Alt ağacı olan kökler tree_layout(r) ->
+    (layout, sütun, satır) ile normal yerleşir; bağlısı olmayan kökler (departman
+    süzgecinde yöneticisi dışarıda kalanlar, Üst Kademe'si boşlar) tek bir ızgara
+    bloğunda toplanır. Ağaçlar yan yana tek sıra ya da — tuval alanı daha küçükse —
+    yaklaşık kare genişlikte raflara (yüksekten alçağa) dizilir; ızgara en sağda ya da
+    en alttadır. Raflı düzen tek bir layout sözlüğüdür (çizim tarafında fark yoktur).
+    """
+    singles = [r for r in roots if not model.has_kids(r)] if len(roots) > 1 else []
+    if len(singles) < FOREST_PACK_MIN: singles = []
+    skip = set(singles)
+    trees = [tree_layout(r) for r in roots if r not in skip]
+    # tek sıra: ızgara ağaçların yüksekliğini kullanır, yetmezse kareye yakın uzar
+    depth = max([rows for _, _, rows in trees], default=1)
+    row = trees + ([_grid(singles, max(int((depth - 1) / STACK_STEP) + 1, _square_rows(len(singles))))] if singles else [])
+    row_w = sum(cols for _, cols, _ in row)
+    width = max(max([cols for _, cols, _ in trees], default=1),
+                math.ceil(math.sqrt((sum(cols * rows for _, cols, rows in trees) + len(singles) * STACK_STEP) * _ROW_UNIT / _COL_UNIT)))
+    if len(row) <= 1 or row_w <= width: return [(layout, cols) for layout, cols, _ in row]
+    # raflar (next-fit, yüksekten alçağa); ızgara en alt rafta, genişliği aşmadan
+    items = sorted(trees, key=lambda t: -t[2])
+    if singles: items.append(_grid(singles, -(-len(singles) // width)))
+    merged, x, y, shelf, used = {}, 0.0, 0.0, 0.0, 0.0
+    for layout, cols, rows in items:
+        if x > 0 and x + cols > width: y += shelf; x = shelf = 0.0
+        for u, (cx, cy) in layout.items(): merged[u] = (x + cx, y + cy)
+        x += cols; shelf = max(shelf, rows); used = max(used, x)
+    if used * (y + shelf) >= row_w * max(rows for _, _, rows in row): return [(layout, cols) for layout, cols, _ in row]
+    return [(merged, used)]
+
+def _square_rows(k: int) -> int:
+    """k tek kartlık ızgaranın piksel olarak kareye yakın olduğu satır sayısı."""
+    return math.ceil(math.sqrt(k * _COL_UNIT / (STACK_STEP * _ROW_UNIT)))
+
+def _grid(singles: List[int], per: int):
+    """Tek kartlar sütun sütun (tablo sırasıyla), sütunda en çok per kart; (layout, sütun, satır)."""
+    cols = -(-len(singles) // max(1, per)); per = -(-len(singles) // cols)
+    return ({u: (float(i // per), (i % per) * STACK_STEP) for i, u in enumerate(singles)}, cols,
+            (per - 1) * STACK_STEP + 1)
+
+def draw_chart(model, start_from, scale, title_colors, show_dept, show_mail, highlight, color_style, add_legend=True, compact=False):
+    """
+    build_tree'den geçmiş modeli çizer ve (img, bboxes) döner.
+    start_from/highlight: kişi id'si (model.index[username]) ya da None.
+    bboxes: {id: (x0,y0,x1,y1)} piksel koordinatları (render ölçeğinde)
+    """
+    scene = ChartScene(model, start_from, scale, title_colors, show_dept, show_mail, highlight, color_style, add_legend, compact)
+    return scene.render(), scene.bboxes
+
+class TileCache:
+    """
+    Ön-izleme karoları için LRU önbellek. Karo (tx,ty) görünüm koordinatındadır;
+    görünüm = sahne × ratio (hızlı ön-izlemede ratio != 1). Bellek kapasiteyle
+    sınırlıdır, kişi sayısıyla değil.
+
+    Hızlı zoom için çok çözünürlüklü piramit: k. düzeyin karoları sahne × 2^-k
+    ölçeğindedir. Düzey 0 sahneden çizilir; k > 0 bir alt düzeyin 2×2 karosundan
+    reduce(2) ile (mipmap); k = -1 iki kat ölçekli ikinci sahneden (build_pyramid).
+    ratio != 1 iken görünüm karosu en yakın ince düzeyden kesilip en çok 2 kat
+    küçültülür; sahne yeniden çizilmez. ratio değişince yalnız görünüm karoları
+    atılır, düzeyler sahne anahtarı değişene dek korunur. En kaba düzey (overview)
+    bütün şemanın şematik görüntüsüdür (mini harita).
+    """
+    def __init__(self, tile: int = TILE_SIZE, capacity: int = TILE_CACHE_MAX):
+        self.tile, self.capacity = tile, capacity
+        self.scene: Optional[ChartScene] = None
+        self._key = None
+        self.ratio = 1.0
+        self._tiles: "OrderedDict[Tuple[int,int], Image.Image]" = OrderedDict()
+        self._levels: "OrderedDict[Tuple[int,int,int], Image.Image]" = OrderedDict()   # (k, tx, ty)
+        self._hi: Optional[ChartScene] = None          # düzey -1 (2×)
+        self.overview: Optional[Image.Image] = None
+        self.overview_ratio = 0.0
+        self._lock = threading.RLock()   # build_pyramid arka planda karo ekler
+        self.drawn = 0
+
+    def set_scene(self, scene: Optional[ChartScene], ratio: float = 1.0):
+        """Sahne ayarları (anahtar) değişmediyse düzeyler, oran da değişmediyse görünüm karoları korunur."""
+        new = scene.key if scene is not None else None
+        with self._lock:
+            if new != self._key:
+                self._tiles.clear(); self._levels.clear(); self._hi = None; self.overview = None
+            elif ratio != self.ratio: self._tiles.clear()
+            self.scene, self.ratio, self._key = scene, ratio, new
+
+    def replace_scene(self, scene: ChartScene, rects) -> set:
+        """
+        Aynı ayarlı yeni sahne (yeniden okunan tablo; bkz. ChartScene.dirty_since): yalnız
+        rects ile kesişen karolar atılır, etkilenen görünüm karoları döner. Şema boyutu
+        değiştiyse kenardaki (kırpılmış) karolar da atılır; 2× sahne ve genel bakış yeniden kurulur.
+        """
+        rects = list(rects)
+        with self._lock:
+            old = self.scene
+            if old is not None and (old.width, old.height) != (scene.width, scene.height):
+                m = self.tile * 2**PYRAMID_MAX   # en kaba düzey karosunun sahnedeki kenarı
+                w, h = max(old.width, scene.width), max(old.height, scene.height)
+                rects += [(min(old.width, scene.width) - m, 0, w, h), (0, min(old.height, scene.height) - m, w, h)]
+            self.scene, self._key = scene, scene.key
+            keys = set()
+            for rect in rects:
+                keys.update(self._keys_for(rect)); self.invalidate(rect)
+            self._hi = None; self._drop_level(-1); self.overview = None
+        return keys
+
+    def needs_build(self) -> bool:
+        return self.scene is not None and (self._hi is None or self.overview is None)
+
+    def refresh(self, rects) -> set:
+        """
+        Sahne yerinde güncellendiğinde (geometri aynı) yalnızca rects ile kesişen
+        karoları düşürür; etkilenen karo indekslerini döner.
+        """
+        keys = set()
+        with self._lock:
+            for rect in rects:
+                keys.update(self._keys_for(rect)); self.invalidate(rect)
+            self._key = self.scene.key if self.scene is not None else None
+            self._sync_hi()
+        return keys
+
+    def _sync_hi(self):
+        """2× sahneyi ana sahnenin (vurgu/renk/görünüm) durumuna getirir; değişen bölgelerin karoları atılır."""
+        hi, sc = self._hi, self.scene
+        if hi is None: return
+        parts = [hi.set_display(sc.show_dept, sc.show_mail, sc.color_style, sc.badges), hi.set_colors(sc.title_colors), hi.set_highlight(sc.highlight)]
+        if any(p is None for p in parts):
+            self._hi = None; self._drop_level(-1); return
+        for x0,y0,x1,y1 in (r for p in parts for r in p): self._drop_level(-1, (x0/2, y0/2, x1/2, y1/2))
+        if parts[0] or parts[1]: self.overview = None
+
+    def _keys_for(self, rect):
+        r = self.ratio; x0,y0,x1,y1 = rect
+        return self.tiles_for(x0*r, y0*r, x1*r+1, y1*r+1)
+
+    def view_size(self) -> Tuple[int,int]:
+        if self.scene is None: return 0, 0
+        return max(1,int(self.scene.width*self.ratio)), max(1,int(self.scene.height*self.ratio))
+
+    def tiles_for(self, x0, y0, x1, y1) -> List[Tuple[int,int]]:
+        """Görünüm bölgesini kaplayan karo indeksleri."""
+        T = self.tile; vw, vh = self.view_size()
+        x0, y0 = max(0,int(x0)), max(0,int(y0)); x1, y1 = min(vw,int(x1)), min(vh,int(y1))
+        if x1 <= x0 or y1 <= y0: return []
+        return [(tx,ty) for ty in range(y0//T, (y1-1)//T+1) for tx in range(x0//T, (x1-1)//T+1)]
+
+    def get(self, tx: int, ty: int) -> Image.Image:
+        key = (tx, ty)
+        with self._lock:
+            img = self._tiles.get(key)
+            if img is not None:
+                self._tiles.move_to_end(key)
+                if TRACE.enabled: TRACE.count("tiles.hit")
+                return img
+        if TRACE.enabled:
+            TRACE.count("tiles.drawn")
+            with TRACE.span("tile", ratio=self.ratio): img = self._render(tx, ty)
+        else: img = self._render(tx, ty)
+        self.drawn += 1
+        with self._lock:
+            self._tiles[key] = img
+            while len(self._tiles) > self.capacity: self._tiles.popitem(last=False)
+        return img
+
+    def invalidate(self, rect=None):
+        """Sahne koordinatındaki rect ile kesişen karoları düşürür (None: hepsi)."""
+        with self._lock:
+            if rect is None: self._tiles.clear(); self._levels.clear(); return
+            for k in self._keys_for(rect): self._tiles.pop(k, None)
+            for k in range(0, PYRAMID_MAX+1): self._drop_level(k, rect)
+
+    # ---- piramit ----
+    def level_size(self, k: int) -> Tuple[int,int]:
+        """k. düzeyin piksel boyutu (k > 0: bir alt düzeyin yarısı, yukarı yuvarlanır)."""
+        if k < 0: return (self._hi.width, self._hi.height) if self._hi is not None else (1, 1)
+        w, h = self.scene.width, self.scene.height
+        for _ in range(k): w, h = (w+1)//2, (h+1)//2
+        return max(1,w), max(1,h)
+
+    def _level_keys(self, k: int, rect):
+        """Sahne koordinatındaki rect'i k. düzeyde kaplayan karolar."""
+        T, f = self.tile, 2.0**-k
+        (lw, lh), x0,y0,x1,y1 = self.level_size(k), *(v*f for v in rect)
+        x0, y0, x1, y1 = max(0,int(x0)), max(0,int(y0)), min(lw,int(x1)+1), min(lh,int(y1)+1)
+        return [(tx,ty) for ty in range(y0//T, (y1-1)//T+1) for tx in range(x0//T, (x1-1)//T+1)] if x1 > x0 and y1 > y0 else []
+
+    def _drop_level(self, k: int, rect=None):
+        if rect is None:
+            for key in [key for key in self._levels if key[0] == k]: del self._levels[key]
+            return
+        if k < 0 and self._hi is None: return
+        for tx,ty in self._level_keys(k, rect): self._levels.pop((k,tx,ty), None)
+
+    def level_tile(self, k: int, tx: int, ty: int) -> Image.Image:
+        key = (k, tx, ty)
+        with self._lock:
+            img = self._levels.get(key)
+            if img is not None: self._levels.move_to_end(key); return img
+            scene, skey, hi = self.scene, self._key, self._hi
+        if TRACE.enabled: TRACE.count(f"pyramid.drawn[{k}]")
+        T = self.tile
+        if k > 0:
+            # mipmap: bir alt düzeyin 2×2 karosu yarıya indirilir
+            img = self._level_region(k-1, 2*tx*T, 2*ty*T, 2*(tx+1)*T, 2*(ty+1)*T).reduce(2)
+        else:
+            src = hi if k < 0 else scene
+            if src is None: return Image.new("RGB", (T, T), CANVAS_BG)   # 2× sahne bu arada atıldı
+            lw, lh = src.width, src.height
+            img = src.render((tx*T, ty*T, min(lw, (tx+1)*T), min(lh, (ty+1)*T)))
+        self.drawn += 1
+        with self._lock:
+            # arka plandaki çizim sırasında sahne değiştiyse sonuç atılır
+            if self.scene is scene and self._key == skey and (k >= 0 or self._hi is hi):
+                self._levels[key] = img
+                while len(self._levels) > PYRAMID_TILES: self._levels.popitem(last=False)
+        return img
+
+    def _level_region(self, k: int, x0: int, y0: int, x1: int, y1: int) -> Image.Image:
+        """k. düzeyde [x0,x1)×[y0,y1) bölgesi (düzey dışına taşan kısım kırpılır) karolardan birleştirilir."""
+        T = self.tile; lw, lh = self.level_size(k)
+        x1, y1 = min(x1, lw), min(y1, lh)
+        out = Image.new("RGB", (max(1,x1-x0), max(1,y1-y0)), CANVAS_BG)
+        for ty in range(y0//T, (y1-1)//T+1):
+            for tx in range(x0//T, (x1-1)//T+1):
+                out.paste(self.level_tile(k, tx, ty), (tx*T-x0, ty*T-y0))
+        return out
+
+    def source_level(self, ratio: float) -> int:
+        """Görünüm oranı için en yakın ince düzey (oranı ≥ ratio; 2×'ten fazla küçültme gerekmez)."""
+        k = math.floor(-math.log2(ratio) + 1e-9)
+        return max(-1 if self._hi is not None else 0, min(PYRAMID_MAX, k))
+
+    def build_pyramid(self, scene: ChartScene, around=None):
+        """
+        Arka plan işi: genel bakış (en kaba düzey), 2× sahne ve — around (sahne
+        koordinatında bölge) verilirse — çevresindeki %50 / %200 düzey karoları.
+        """
+        k = 3
+        while scene.width*2.0**-k > OVERVIEW_SIZE[0] or scene.height*2.0**-k > OVERVIEW_SIZE[1]: k += 1
+        ov, hi = scene.overview(2.0**-k), scene.rescaled(2.0)
+        with self._lock:
+            if self.scene is not scene: return
+            self.overview, self.overview_ratio = ov, 2.0**-k
+            if self._hi is None: self._hi = hi; self._sync_hi()
+        if around is None: return
+        for lvl in (1, -1):
+            for tx,ty in self._level_keys(lvl, around):
+                if self.scene is not scene: return
+                self.level_tile(lvl, tx, ty)
+
+    def _render(self, tx, ty) -> Image.Image:
+        T, r = self.tile, self.ratio
+        vw, vh = self.view_size()
+        vx0, vy0 = tx*T, ty*T
+        w, h = min(T, vw-vx0), min(T, vh-vy0)
+        if r == 1.0: return self.level_tile(0, tx, ty)
+        k = self.source_level(r)
+        f = (self._hi.scale / self.scene.scale if k < 0 else 2.0**-k) / r   # görünüm -> düzey
+        bx0, by0, bx1, by1 = vx0*f, vy0*f, (vx0+w)*f, (vy0+h)*f
+        ix0, iy0 = int(bx0), int(by0)
+        src = self._level_region(k, ix0, iy0, max(ix0+1, math.ceil(bx1)), max(iy0+1, math.ceil(by1)))
+        box = (bx0-ix0, by0-iy0, min(src.width, bx1-ix0), min(src.height, by1-iy0))
+        return src.resize((w, h), Image.BILINEAR, box=box)
+
+def ppm_bytes(img: Image.Image) -> bytes:
+    """Sıkıştırmasız ikili PPM (P6): başlık + ham RGB baytları."""
+    if img.mode != "RGB": img = img.convert("RGB")
+    return b"P6 %d %d 255\n" % img.size + img.tobytes()
+
+PNG_BAND_BYTES = 32 * 2**20   # akışlı PNG şerit bütçesi; şerit yüksekliği = bütçe / (genişlik × 3)
+PNG_COMPRESS_LEVEL = 6   # zlib 0-9: düşük = hızlı/büyük dosya, yüksek = yavaş/küçük dosya
+
+def save_png(img: Image.Image, path: str, compress_level: int = PNG_COMPRESS_LEVEL):
+    img.save(path, "PNG", compress_level=compress_level)
+
+def _png_chunk(f, tag: bytes, data: bytes):
+    f.write(struct.pack(">I", len(data))); f.write(tag); f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+@TRACE.traced("export_png")
+def export_png(scene: "ChartScene", path: str, compress_level: int = PNG_COMPRESS_LEVEL, band: Optional[int] = None, progress=None):
+    """
+    Sahneyi yatay şeritler halinde çizip satır satır PNG'ye akıtır; tam görüntü
+    bellekte hiç oluşmaz. progress(oran) her şeritten sonra çağrılır (iptal için
+    istisna fırlatabilir; yarım dosya silinir). Tepe bellek ≈ şerit × genişlik × 3.
+    """
+    w, h = scene.width, scene.height
+    stride, z = w*3, zlib.compressobj(compress_level)
+    band = band or max(1, PNG_BAND_BYTES // stride)
+    try:
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))  # 8 bit RGB
+            for y in range(0, h, band):
+                raw = scene.render((0, y, w, min(h, y+band))).tobytes()
+                # her satırın başına filtre baytı (0 = yok)
+                out = z.compress(b"".join(b"\0" + raw[i:i+stride] for i in range(0, len(raw), stride)))
+                del raw
+                if out: _png_chunk(f, b"IDAT", out)
+                if progress: progress(min(h, y+band) / h)
+            _png_chunk(f, b"IDAT", z.flush())
+            _png_chunk(f, b"IEND", b"")
+    except BaseException:
+        try: os.remove(path)
+        except OSError: pass
+        raise
+
+def save_pdf(img: Image.Image, path: str): img.convert("RGB").save(path, "PDF", resolution=300.0)
+
+# -------------- Arka plan işleri --------------
+WORKER_POLL_MS = 50
+
+class JobCancelled(Exception):
+    """Aynı türden daha yeni bir iş geldiği için eski iş bırakıldı."""
+
+class Job:
+    __slots__ = ("kind", "seq", "fn", "on_done", "on_error", "_worker")
+    def __init__(self, kind, seq, fn, on_done, on_error, worker):
+        self.kind, self.seq, self.fn = kind, seq, fn
+        self.on_done, self.on_error, self._worker = on_done, on_error, worker
+
+    def check(self):
+        """Daha yeni bir iş geldiyse JobCancelled fırlatır (aşamalar arasında çağrılır)."""
+        if self._worker.is_stale(self): raise JobCancelled()
+
+    def progress(self, text: str):
+        self.check(); self._worker._events.put(("progress", self, text))
+
+class BackgroundWorker:
+    """
+    Ağır işleri (okuma, yerleşim, render, dışa aktarma) Tk döngüsü dışında koşturur.
+    Her iş türünün kendi iş parçacığı ve kuyruğu vardır; aynı türden yeni iş eskisini
+    geçersiz kılar (kuyruktakiler atlanır, çalışan iş ilk check() çağrısında durur).
+    Sonuçlar ve ilerleme mesajları UI tarafında poll() ile, after() döngüsünden alınır.
+    """
+    def __init__(self):
+        self._events: "queue.Queue" = queue.Queue()
+        self._lanes: Dict[str, "queue.Queue"] = {}
+        self._latest: Dict[str, int] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn, on_done, on_error=None) -> Job:
+        """fn(job) arka planda çalışır; on_done(sonuç)/on_error(hata) UI iş parçacığında çağrılır."""
+        with self._lock:
+            self._seq += 1
+            job = Job(kind, self._seq, fn, on_done, on_error, self)
+            self._latest[kind] = job.seq
+            lane = self._lanes.get(kind)
+            if lane is None:
+                lane = self._lanes[kind] = queue.Queue()
+                threading.Thread(target=self._run, args=(lane,), daemon=True, name=f"org-chart-{kind}").start()
+        lane.put(job)
+        return job
+
+    def is_stale(self, job: Job) -> bool:
+        return self._latest.get(job.kind) != job.seq
+
+    def _run(self, lane):
+        while True:
+            job = lane.get()
+            if self.is_stale(job): continue
+            try:
+                with TRACE.span("job." + job.kind): result = TRACE.profile_call(job.fn, job)
+            except JobCancelled: continue
+            except Exception as e: self._events.put(("error", job, e))
+            else: self._events.put(("done", job, result))
+
+    def poll(self):
+        """Bekleyen (ilerleme/bitti/hata) olayları üretir; eskimiş işlerinkiler atılır."""
+        while True:
+            try: ev, job, val = self._events.get_nowait()
+            except queue.Empty: return
+            if not self.is_stale(job): yield ev, job, val
+
+class ChartData:
+    """
+    Yüklü tablo ve ondan türeyen önbellekler (departman modelleri ve onların alt ağaç
+    toplamları — model.stats(), yerleşimler).
+    Yeni dosyada bütünüyle değiştirilir; hâlâ koşan eski işler eski nesneye yazar.
+    """
+    __slots__ = ("path", "table", "model_all", "models", "layouts", "_search", "cache")
+    def __init__(self, path: str, table: Table, model_all: OrgModel, cache=None):
+        self.path, self.table, self.model_all = path, table, model_all
+        self.cache = cache   # org_chart_cache.CacheEntry: yerleşimler diske de yazılır/okunur
+        self.models: Dict[str, OrgModel] = {}   # departman -> ağacı kurulmuş model
+        self.layouts: Dict[Tuple[str,Optional[int],bool], list] = {}
+        self._search: Optional[SearchIndex] = None
+
+    def report(self) -> HierarchyReport:
+        """Tüm tablonun hiyerarşi sorunları (ağaç ilk çağrıda kurulur)."""
+        return self.model_for(None).report
+
+    def search_index(self) -> SearchIndex:
+        """Tüm kişiler (model_all id'leri) üzerinde arama dizini; ilk çağrıda kurulur."""
+        if self._search is None: self._search = SearchIndex(self.model_all)
+        return self._search
+
+    def model_for(self, dept: Optional[str]) -> OrgModel:
+        """Departman başına model bir kez kurulur; sonrası sözlük araması."""
+        key = dept or "Tümü"
+        m = self.models.get(key)
+        if m is None:
+            m = self.model_all if dept is None else self.model_all.subset(self.model_all.dept_members(dept))
+            m = self.models[key] = build_tree(m)
+        return m
+
+    def layouts_for(self, dept: Optional[str], start_from: Optional[int], compact: bool) -> list:
+        """Yerleşim ölçekten bağımsız: (departman, başlangıç, kompakt) başına bir kez hesaplanır."""
+        key = (dept or "Tümü", start_from, compact)
+        lay = self.layouts.get(key)
+        if lay is not None: TRACE.count("layouts.memory")
+        elif self.cache is not None:
+            lay = self.cache.layouts(key)
+            if lay is not None: TRACE.count("layouts.disk")
+        if lay is None:
+            TRACE.count("layouts.computed")
+            model = self.model_for(dept)
+            lay = layout_forest(model, chart_roots(model, start_from), compact)
+            if self.cache is not None: self.cache.put_layouts(key, lay)
+        self.layouts[key] = lay
+        return lay
@@ -0,0 +1,419 @@
+# org_chart_server.py
+# -*- coding: utf-8 -*-
+"""
+Yerel HTTP şema servisi: masaüstü uygulaması olmayanlar şemayı tarayıcıda görür.
+Tablo bir kez okunur; şemalar PNG/SVG ve harita gibi yakınlaştırılan karolar olarak sunulur.
+
+    python org_chart_server.py personel.xlsx                      (yalnız bu makine: 127.0.0.1:8765)
+    python org_chart_server.py personel.xlsx --host 0.0.0.0 -j 4  (intranet)
+
+    /                                       görüntüleyici (sürükle / tekerlek ile yakınlaştır)
+    /chart.png?dept=Satış&root=ahmet.k&scale=0.5
+    /chart.svg?dept=Satış&levels=3
+    /tiles/{z}/{x}/{y}.png?dept=...         z = -1: %200, 0: %100, 1: %50 ... (256 px karolar)
+    /api/meta                               kişi sayısı, departmanlar, veri sorunları (JSON)
+    /api/chart?dept=...                     şema boyutu ve karo düzeyleri (JSON)
+
+Ortak parametreler: dept, root, compact=1, levels=N, style=bg|stripe|headcount|span, badges=1,
+dept_line=0, mail=0.
+
+Yanıtlar içerik anahtarıyla (tablo dosyasının blake2b özeti + normalleştirilmiş istek)
+sınırlı bir LRU'da tutulur. Anahtar aynı zamanda ETag'dir: If-None-Match tutarsa 304
+döner ve hiçbir şey çizilmez. Aynı anahtara eşzamanlı istekler tek çizimi bekler.
+Çizim süreç havuzundadır; her işçi modeli başlangıçta bir kez alır, sahneleri ve karo
+piramitlerini (TileCache) kendi içinde tutar. Dosya değişince (boyut/mtime) tablo
+yeniden okunur, havuz yeni modelle kurulur. Yalnız standart kütüphane (http.server).
+"""
+
+import os, io, re, sys, json, math, time, hashlib, argparse, tempfile, threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, astuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from org_chart_core import (
+    DEFAULT_SETTINGS_FILE, HEAT_STYLES, PYRAMID_MAX, TILE_SIZE, ChartData, ChartScene, TileCache, OrgModel,
+    load_table, build_people, load_title_colors, export_png, save_png,
+)
+from org_chart_cache import file_digest, load_table_cached
+from org_chart_cli import RenderOptions, chart_scene
+from org_chart_vector import export_svg
+from org_chart_trace import TRACE
+
+SERVER_PORT = 8765
+SERVER_CACHE_BYTES = 256 * 2**20    # yanıt önbelleği üst sınırı (LRU, bayt)
+SERVER_ITEM_MAX = 32 * 2**20        # bundan büyük yanıt önbelleğe alınmaz (yine gönderilir)
+CHART_MAX_PIXELS = 400_000_000      # /chart.png bundan büyükse 413 (karoları ya da SVG'yi kullanın)
+SCENES_PER_WORKER = 8               # işçi başına tutulan karo sahnesi (ve piramidi)
+RELOAD_CHECK_S = 2.0                # dosya değişikliği en çok bu sıklıkla yoklanır
+RENDER_VERSION = 1                  # çizim çıktısı değişince artar (eski ETag'ler tutmaz)
+TILE_PNG_LEVEL = 3                  # karo PNG sıkıştırması: hızlı, küçük karolarda fark az
+SCALE_RANGE = (0.05, 4.0)
+
+class ChartTooLarge(Exception):
+    pass
+
+@dataclass(frozen=True)
+class ChartView:
+    """Bir şemayı belirleyen istek parametreleri (ölçek hariç); önbellek anahtarının parçası."""
+    dept: Optional[str] = None
+    root: Optional[str] = None
+    compact: bool = False
+    levels: int = 0
+    style: str = "bg"
+    show_dept: bool = True
+    show_mail: bool = True
+    badges: bool = False
+
+    @classmethod
+    def from_query(cls, q: Dict[str, str]) -> "ChartView":
+        """Sorgu parametrelerinden; geçersiz değerde ValueError (400)."""
+        style = q.get("style", "bg")
+        if style not in ("bg", "stripe", *HEAT_STYLES): raise ValueError(f"style bg, stripe, headcount ya da span olmalı: {style}")
+        levels = int(q.get("levels", "0") or 0)
+        if levels < 0: raise ValueError("levels negatif olamaz")
+        return cls(q.get("dept") or None, q.get("root") or None, _flag(q, "compact", False), levels, style,
+                   _flag(q, "dept_line", True), _flag(q, "mail", True), _flag(q, "badges", False))
+
+    def options(self, scale: float, colors) -> RenderOptions:
+        return RenderOptions(scale=scale, style=self.style, badges=self.badges, show_dept=self.show_dept, show_mail=self.show_mail,
+                             compact=self.compact, levels=self.levels, title_colors=colors)
+
+def _flag(q: Dict[str, str], name: str, default: bool) -> bool:
+    v = q.get(name)
+    if v is None: return default
+    if v.lower() in ("1", "true", "yes", "evet", "on"): return True
+    if v.lower() in ("0", "false", "no", "hayır", "off", ""): return False
+    raise ValueError(f"{name} 0/1 olmalı: {v}")
+
+# ---- İşçi süreci ----
+_RENDERER: Optional["_Renderer"] = None
+
+class _Renderer:
+    """İşçi süreci durumu: ChartData (model/yerleşim önbellekleri) ve karo sahneleri (LRU)."""
+    def __init__(self, path: str, model_all: OrgModel, colors):
+        self.data, self.colors = ChartData(path, None, model_all), colors
+        self.scenes: "OrderedDict[ChartView, Tuple[ChartScene, TileCache]]" = OrderedDict()
+
+    def tiles(self, view: ChartView) -> Tuple[ChartScene, TileCache]:
+        hit = self.scenes.get(view)
+        if hit is not None: self.scenes.move_to_end(view); return hit
+        scene = chart_scene(self.data, view.dept, view.root, view.options(1.0, self.colors))
+        tiles = TileCache(); tiles.set_scene(scene)
+        hit = self.scenes[view] = (scene, tiles)
+        while len(self.scenes) > SCENES_PER_WORKER: self.scenes.popitem(last=False)
+        return hit
+
+    def render(self, kind: str, view: ChartView, arg) -> bytes:
+        if kind == "info":
+            scene, _ = self.tiles(view)
+            return json.dumps({"width": scene.width, "height": scene.height, "tile": TILE_SIZE,
+                               "zmin": -1, "zmax": _zmax(scene)}).encode("utf-8")
+        if kind == "tile": return self._tile(view, *arg)
+        scene = chart_scene(self.data, view.dept, view.root, view.options(arg, self.colors))
+        if kind == "png" and scene.width * scene.height > CHART_MAX_PIXELS:
+            raise ChartTooLarge(f"{scene.width}×{scene.height} px; daha küçük scale, karolar ya da SVG kullanın")
+        fd, tmp = tempfile.mkstemp(suffix="." + kind); os.close(fd)
+        try:
+            if kind == "png": export_png(scene, tmp)
+            else: export_svg(scene, tmp)
+            with open(tmp, "rb") as f: return f.read()
+        finally:
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def _tile(self, view: ChartView, z: int, tx: int, ty: int) -> bytes:
+        """
+        z <= PYRAMID_MAX: uygulamanın karo piramidi (-1: 2× sahne, 0: sahne, k: mipmap).
+        Daha uzak düzeyler şematiktir (overview: metinsiz kutular), sahneden doğrudan.
+        """
+        scene, tiles = self.tiles(view)
+        if not -1 <= z <= _zmax(scene): raise LookupError(f"z -1–{_zmax(scene)} arasında olmalı")
+        T, f = TILE_SIZE, 2.0 ** -z
+        if z < 0 and tiles.source_level(2.0) >= 0: tiles.build_pyramid(scene)   # 2× sahne henüz yok
+        if z <= PYRAMID_MAX: lw, lh = tiles.level_size(z)
+        else: lw, lh = max(1, math.ceil(scene.width * f)), max(1, math.ceil(scene.height * f))
+        if not (tx * T < lw and ty * T < lh): raise LookupError("karo şema dışında")
+        if z <= PYRAMID_MAX: img = tiles.level_tile(z, tx, ty)
+        else: img = scene.overview(f, (tx*T, ty*T, min(lw, (tx+1)*T), min(lh, (ty+1)*T)))
+        buf = io.BytesIO(); save_png(img, buf, TILE_PNG_LEVEL)
+        return buf.getvalue()
+
+def _zmax(scene: ChartScene) -> int:
+    """Şemanın tek karoya sığdığı en uzak düzey (/api/chart'ın zmax'ı)."""
+    return max(0, math.ceil(math.log2(max(scene.width, scene.height) / TILE_SIZE)))
+
+def _init_worker(path: str, model_all: OrgModel, colors):
+    global _RENDERER
+    _RENDERER = _Renderer(path, model_all, colors)
+
+def _render_task(kind: str, view: ChartView, arg) -> bytes:
+    return _RENDERER.render(kind, view, arg)
+
+# ---- Yanıt önbelleği ----
+class ResponseCache:
+    """
+    Anahtar -> bayt LRU'su (toplam bayt sınırlı). get_or_render aynı anahtarı bekleyen
+    eşzamanlı istekleri tek çizime bağlar; hata önbelleğe alınmaz.
+    """
+    def __init__(self, max_bytes: int = SERVER_CACHE_BYTES, item_max: int = SERVER_ITEM_MAX):
+        self.max_bytes, self.item_max = max_bytes, item_max
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.bytes = self.hits = self.misses = 0
+
+    def get_or_render(self, key: str, render) -> bytes:
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key); self.hits += 1
+                if TRACE.enabled: TRACE.count("server.hit")
+                return body
+            fut, owner = self._pending.get(key), False
+            if fut is None: fut, owner = self._pending.setdefault(key, Future()), True
+        if not owner: return fut.result()
+        try:
+            body = render()
+            fut.set_result(body)
+        except BaseException as e:
+            fut.set_exception(e); raise
+        finally:
+            with self._lock: self._pending.pop(key, None)
+        with self._lock:
+            self.misses += 1
+            if TRACE.enabled: TRACE.count("server.miss")
+            if len(body) <= self.item_max and key not in self._items:
+                self._items[key] = body; self.bytes += len(body)
+                while self.bytes > self.max_bytes and len(self._items) > 1:
+                    self.bytes -= len(self._items.popitem(last=False)[1])
+        return body
+
+# ---- Servis ----
+class ChartService:
+    """
+    Yüklü tablo, süreç havuzu ve yanıt önbelleği; HTTP'den bağımsız (handle ile sınanabilir).
+    Dosya değişince reload() yeni tabloyu okur ve havuzu yeni modelle kurar.
+    """
+    def __init__(self, path: str, jobs: Optional[int] = None, colors=None, use_cache: bool = True,
+                 cache_bytes: int = SERVER_CACHE_BYTES):
+        self.path, self.jobs, self.use_cache = os.path.abspath(path), jobs, use_cache
+        self.colors = dict(colors or {})
+        self.cache = ResponseCache(cache_bytes)
+        self._lock = threading.Lock()
+        self._checked, self._sig, self.pool = 0.0, None, None
+        self.reload()
+
+    def _signature(self):
+        st = os.stat(self.path); return st.st_size, st.st_mtime_ns
+
+    def reload(self):
+        """Tabloyu okur; içerik anahtarı, model ve havuz birlikte değişir (eski havuz işlerini bitirir)."""
+        sig = self._signature()
+        if self.use_cache: table, entry = load_table_cached(self.path)
+        else: table, entry = load_table(self.path), None
+        key = entry.key if entry is not None else file_digest(self.path)
+        data = ChartData(self.path, table, build_people(table), cache=entry)
+        report = data.report()
+        pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(self.path, data.model_all, self.colors))
+        colors_sig = hashlib.blake2b(repr(sorted(self.colors.items())).encode("utf-8"), digest_size=8).hexdigest()
+        with self._lock:
+            old, self.pool = self.pool, pool
+            self.data, self.report, self._sig = data, report, sig
+            self.data_key = f"{key}-{colors_sig}"
+        if old is not None: old.shutdown(wait=False)
+
+    def check_reload(self, now: float):
+        """En çok RELOAD_CHECK_S'de bir: dosyanın boyutu/mtime'ı değiştiyse reload."""
+        with self._lock:
+            if now - self._checked < RELOAD_CHECK_S: return
+            self._checked = now
+        try: changed = self._signature() != self._sig
+        except OSError: return   # dosya yazılırken geçici olarak yok olabilir
+        if changed: self.reload()
+
+    def close(self):
+        if self.pool is not None: self.pool.shutdown(wait=True)
+
+    def meta(self) -> bytes:
+        m = self.data.model_all
+        depts = sorted(d for d in m.dept_table if d and m.dept_members(d))
+        return json.dumps({"path": self.path, "people": len(m), "depts": depts, "data": self.data_key,
+                           "issues": self.report.summary() if self.report else ""}, ensure_ascii=False).encode("utf-8")
+
+    def etag(self, kind: str, view: ChartView, arg) -> str:
+        raw = repr((RENDER_VERSION, self.data_key, kind, astuple(view), arg)).encode("utf-8")
+        return '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+
+    def handle(self, target: str, if_none_match: Optional[str] = None) -> Tuple[int, str, bytes, Optional[str]]:
+        """
+        GET hedefi -> (durum, içerik türü, gövde, ETag). Hatalar düz metin gövdeyle:
+        400 geçersiz parametre, 404 bilinmeyen yol / kişi / departman / karo, 413 çok büyük.
+        """
+        self.check_reload(time.monotonic())
+        parts = urlsplit(target)
+        q = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        path = parts.path
+        try:
+            if path in ("/", "/index.html"):
+                return 200, "text/html; charset=utf-8", VIEWER_HTML, None
+            if path == "/api/meta":
+                return 200, "application/json; charset=utf-8", self.meta(), None
+            view = ChartView.from_query(q)
+            if path == "/api/chart": kind, arg, ctype = "info", None, "application/json; charset=utf-8"
+            elif path in ("/chart.png", "/chart.svg"):
+                scale = float(q.get("scale", "1") or 1)
+                if not SCALE_RANGE[0] <= scale <= SCALE_RANGE[1]: raise ValueError(f"scale {SCALE_RANGE[0]}–{SCALE_RANGE[1]} arasında olmalı")
+                kind, arg = path[-3:], round(scale, 4)
+                ctype = "image/png" if kind == "png" else "image/svg+xml"
+            elif (m := _TILE_PATH.fullmatch(path)):
+                z, tx, ty = (int(g) for g in m.groups())
+                if z < -1: raise LookupError("z en az -1")
+                kind, arg, ctype = "tile", (z, tx, ty), "image/png"
+            else: return 404, "text/plain; charset=utf-8", b"Bulunamadi", None
+        except ValueError as e: return 400, "text/plain; charset=utf-8", str(e).encode("utf-8"), None
+        except LookupError as e: return 404, "text/plain; charset=utf-8", str(e).encode("utf-8"), None
+        with self._lock: pool, etag = self.pool, self.etag(kind, view, arg)
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]):
+            if TRACE.enabled: TRACE.count("server.304")
+            return 304, ctype, b"", etag
+        try: body = self.cache.get_or_render(etag, lambda: pool.submit(_render_task, kind, view, arg).result())
+        except RuntimeError:   # havuz bu arada yeniden yüklemeyle kapandı; istemci yeniden dener
+            return 503, "text/plain; charset=utf-8", "Tablo yeniden yükleniyor".encode("utf-8"), None
+        except ChartTooLarge as e: return 413, "text/plain; charset=utf-8", str(e).encode("utf-8"), None
+        except (ValueError, LookupError) as e: return 404, "text/plain; charset=utf-8", str(e).encode("utf-8"), None
+        return 200, ctype, body, etag
+
+_TILE_PATH = re.compile(r"/tiles/(-?\d+)/(\d+)/(\d+)\.png")
+
+class _Handler(BaseHTTPRequestHandler):
+    service: ChartService = None   # make_server alt sınıfta atar
+    quiet = False
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self, head: bool = False):
+        try: status, ctype, body, etag = self.service.handle(self.path, self.headers.get("If-None-Match"))
+        except Exception as e:
+            status, ctype, body, etag = 500, "text/plain; charset=utf-8", f"{type(e).__name__}: {e}".encode("utf-8"), None
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        if etag: self.send_header("ETag", etag); self.send_header("Cache-Control", "no-cache")   # her seferinde ETag ile doğrula
+        if status != 304: self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head and status != 304: self.wfile.write(body)
+
+    def do_HEAD(self): self.do_GET(head=True)
+
+    def log_message(self, fmt, *args):
+        if not self.quiet: super().log_message(fmt, *args)
+
+def make_server(service: ChartService, host: str = "127.0.0.1", port: int = SERVER_PORT, quiet: bool = False) -> ThreadingHTTPServer:
+    """Servisi sunan HTTP sunucusu (port=0: boş bir port; server.server_address ile okunur)."""
+    handler = type("Handler", (_Handler,), {"service": service, "quiet": quiet})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+VIEWER_HTML = """<!doctype html>
+<html lang="tr"><head><meta charset="utf-8"><title>Organizasyon Şeması</title>
+<style>
+body{margin:0;font:14px 'Segoe UI',sans-serif;background:#f8fafc}
+#bar{display:flex;gap:8px;align-items:center;padding:8px 12px;background:#fff;border-bottom:1px solid #dde}
+#map{position:absolute;top:49px;left:0;right:0;bottom:0;overflow:hidden;cursor:grab}
+#map img{position:absolute;user-select:none;-webkit-user-drag:none}
+#info{margin-left:auto;color:#667}
+</style></head><body>
+<div id="bar">Departman: <select id="dept"><option value="">Tümü</option></select>
+Başlangıç: <input id="root" placeholder="kullanıcı adı" size="14">
+<label><input type="checkbox" id="compact"> Kompakt</label>
+<select id="style"><option value="">Pozisyon renkleri</option><option value="headcount">Ekip büyüklüğü</option><option value="span">Doğrudan bağlı</option></select>
+<label><input type="checkbox" id="badges"> Ekip rozeti</label>
+<button id="out">−</button><button id="in">+</button>
+<a id="png" target="_blank">PNG</a> <a id="svg" target="_blank">SVG</a><span id="info"></span></div>
+<div id="map"></div>
+<script>
+const $ = id => document.getElementById(id), map = $("map");
+let chart = null, z = 0, ox = 0, oy = 0, imgs = {};
+function query() {
+  const p = new URLSearchParams();
+  if ($("dept").value) p.set("dept", $("dept").value);
+  if ($("root").value.trim()) p.set("root", $("root").value.trim());
+  if ($("compact").checked) p.set("compact", "1");
+  if ($("style").value) p.set("style", $("style").value);
+  if ($("badges").checked) p.set("badges", "1");
+  return p.toString();
+}
+async function load() {
+  const r = await fetch("/api/chart?" + query());
+  if (!r.ok) { $("info").textContent = await r.text(); return; }
+  chart = await r.json(); map.innerHTML = ""; imgs = {};
+  z = 0; while (z < chart.zmax && chart.width * Math.pow(2, -z) > map.clientWidth) z++;
+  ox = 0; oy = 0;
+  $("png").href = "/chart.png?" + query() + "&scale=" + Math.max(0.05, Math.min(1, Math.sqrt(2e7 / (chart.width * chart.height)))).toFixed(2);
+  $("svg").href = "/chart.svg?" + query();
+  draw();
+}
+function draw() {
+  if (!chart) return;
+  const T = chart.tile, f = Math.pow(2, -z), w = Math.ceil(chart.width * f), h = Math.ceil(chart.height * f), q = query(), seen = {};
+  for (let ty = Math.max(0, Math.floor(-oy / T)); ty * T < h && ty * T + oy < map.clientHeight; ty++)
+    for (let tx = Math.max(0, Math.floor(-ox / T)); tx * T < w && tx * T + ox < map.clientWidth; tx++) {
+      const k = z + "/" + tx + "/" + ty; seen[k] = 1;
+      let im = imgs[k];
+      if (!im) { im = imgs[k] = new Image(); im.src = "/tiles/" + k + ".png?" + q; map.appendChild(im); }
+      im.style.left = (tx * T + ox) + "px"; im.style.top = (ty * T + oy) + "px";
+    }
+  for (const k in imgs) if (!seen[k]) { imgs[k].remove(); delete imgs[k]; }
+  $("info").textContent = Math.round(100 * f) + "%";
+}
+function zoom(d, cx, cy) {
+  const nz = Math.max(chart.zmin, Math.min(chart.zmax, z + d)); if (nz === z) return;
+  const k = Math.pow(2, z - nz); ox = cx - (cx - ox) * k; oy = cy - (cy - oy) * k; z = nz;
+  for (const k in imgs) imgs[k].remove(); imgs = {}; draw();
+}
+let drag = null;
+map.onpointerdown = e => { drag = [e.clientX - ox, e.clientY - oy]; map.setPointerCapture(e.pointerId); map.style.cursor = "grabbing"; };
+map.onpointermove = e => { if (drag) { ox = e.clientX - drag[0]; oy = e.clientY - drag[1]; draw(); } };
+map.onpointerup = () => { drag = null; map.style.cursor = "grab"; };
+map.onwheel = e => { e.preventDefault(); const r = map.getBoundingClientRect(); zoom(e.deltaY > 0 ? 1 : -1, e.clientX - r.left, e.clientY - r.top); };
+$("in").onclick = () => zoom(-1, map.clientWidth / 2, map.clientHeight / 2);
+$("out").onclick = () => zoom(1, map.clientWidth / 2, map.clientHeight / 2);
+$("dept").onchange = $("compact").onchange = $("root").onchange = $("style").onchange = $("badges").onchange = load;
+window.onresize = draw;
+fetch("/api/meta").then(r => r.json()).then(m => {
+  for (const d of m.depts) $("dept").add(new Option(d, d));
+  document.title = "Organizasyon Şeması (" + m.people + " kişi)"; load();
+});
+</script></body></html>
+""".encode("utf-8")
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="org_chart_server", description="Organizasyon şemasını yerel ağda HTTP ile sunar.")
+    ap.add_argument("input", help="Excel/CSV personel tablosu (değişince yeniden okunur)")
+    ap.add_argument("--host", default="127.0.0.1", help="dinlenecek adres; intranet için 0.0.0.0 (varsayılan: %(default)s)")
+    ap.add_argument("--port", type=int, default=SERVER_PORT, help="port (varsayılan: %(default)s)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="çizim süreci sayısı (varsayılan: CPU sayısı)")
+    ap.add_argument("--cache-mb", type=int, default=SERVER_CACHE_BYTES // 2**20, help="yanıt önbelleği (MB; varsayılan: %(default)s)")
+    ap.add_argument("--settings", default=DEFAULT_SETTINGS_FILE, help="renk ayar dosyası (varsayılan: %(default)s)")
+    ap.add_argument("--no-cache", action="store_true", help="disk önbelleğini kullanma (tablo her okunuşta ayrıştırılır)")
+    ap.add_argument("--quiet", action="store_true", help="istek günlüğünü yazma")
+    return ap
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try: service = ChartService(args.input, args.jobs, load_title_colors(args.settings), not args.no_cache, args.cache_mb * 2**20)
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr); return 2
+    httpd = make_server(service, args.host, args.port, args.quiet)
+    host, port = httpd.server_address[:2]
+    print(f"{len(service.data.model_all)} kişi | http://{'localhost' if host in ('127.0.0.1', '0.0.0.0') else host}:{port}/  (durdurmak için Ctrl+C)")
+    try: httpd.serve_forever()
+    except KeyboardInterrupt: pass
+    finally:
+        httpd.server_close(); service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
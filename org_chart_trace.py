@@ -0,0 +1,173 @@
+# org_chart_trace.py
+# -*- coding: utf-8 -*-
+"""
+Hafif ölçüm: zaman aralıkları (span), sayaçlar ve isteğe bağlı cProfile.
+
+    from org_chart_trace import TRACE
+    with TRACE.span("layout", people=len(model)): ...
+    @TRACE.traced("load_table")
+    def load_table(path): ...
+    TRACE.count("tiles.miss"); TRACE.gauge("scene.pixels", w*h)
+
+Kapalıyken (varsayılan) span() paylaşılan boş bir bağlam döndürür, count()/gauge()
+hemen döner; sık çağrılan yerlerde `if TRACE.enabled:` ile çağrı da atlanır.
+TRACE.enable() ya da ORG_CHART_TRACE=1 ortam değişkeniyle açılır. İz, Chrome/Perfetto
+"trace event" JSON'u olarak yazılır (chrome://tracing, ui.perfetto.dev).
+
+cProfile iş parçacığı başınadır: start_profile() çağıran iş parçacığını (arayüz) ve
+profile_call() ile sarılan arka plan işlerini ölçer; stop_profile() hepsini birleştirir.
+Bu modül org_chart_core'a bağımlı değildir.
+"""
+
+import io, os, json, time, pstats, cProfile, functools, threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+TRACE_EVENTS_MAX = 200_000   # iz tamponunda tutulan en fazla span (eskiler düşer)
+
+class _NullSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def set(self, **attrs): pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "t0")
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict):
+        self.tracer, self.name, self.attrs = tracer, name, attrs
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns(); return self
+
+    def set(self, **attrs):
+        """Span sürerken öğrenilen değerler (kişi sayısı, piksel...)."""
+        self.attrs.update(attrs)
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.t0, time.perf_counter_ns(), self.attrs)
+        return False
+
+class Tracer:
+    """Süreç geneli ölçüm kaydı; tüm yöntemler iş parçacığı güvenlidir."""
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._profiles: List[cProfile.Profile] = []
+        self._main_prof: Optional[cProfile.Profile] = None
+        self.profiling = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.events: "deque[tuple]" = deque(maxlen=TRACE_EVENTS_MAX)   # (ad, t0, t1, tid, özellikler)
+            self.stats: Dict[str, list] = {}      # ad -> [adet, toplam_ns, en_uzun_ns, son_ns, son_özellikler, son_bitiş_ns]
+            self.counters: Dict[str, float] = {}
+            self.origin = time.perf_counter_ns()
+
+    def enable(self, on: bool = True):
+        self.enabled = on
+
+    def span(self, name: str, **attrs):
+        if not self.enabled: return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    def traced(self, name: str):
+        """Dekoratör: her çağrı bir span. Kapalıyken yalnız tek bir bayrak denetimi eklenir."""
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                with _Span(self, name, {}): return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled: return
+        with self._lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        """Son değeri tutulan ölçü (düğüm sayısı, görüntü pikseli...)."""
+        if not self.enabled: return
+        with self._lock: self.counters[name] = value
+
+    def _record(self, name: str, t0: int, t1: int, attrs: dict):
+        dt = t1 - t0
+        with self._lock:
+            self.events.append((name, t0, t1, threading.get_ident(), attrs or None))
+            st = self.stats.get(name)
+            if st is None: self.stats[name] = [1, dt, dt, dt, attrs, t1]
+            else:
+                st[0] += 1; st[1] += dt; st[3] = dt; st[4] = attrs; st[5] = t1
+                if dt > st[2]: st[2] = dt
+
+    # ---- okuma ----
+    def summary(self) -> List[Tuple[str, int, float, float, float]]:
+        """(ad, adet, son ms, toplam ms, en uzun ms); toplam süreye göre azalan."""
+        with self._lock:
+            rows = [(n, c, last/1e6, tot/1e6, mx/1e6) for n, (c, tot, mx, last, _, _) in self.stats.items()]
+        return sorted(rows, key=lambda r: -r[3])
+
+    def last(self, *names: str) -> Optional[Tuple[str, float, dict]]:
+        """Adlardan en son biteninin son span'i: (ad, ms, özellikler) ya da None."""
+        with self._lock:
+            hits = [(st[5], n, st) for n in names for st in (self.stats.get(n),) if st]
+            if not hits: return None
+            _, n, st = max(hits, key=lambda h: h[0])
+            return n, st[3]/1e6, dict(st[4])
+
+    def counts(self) -> Dict[str, float]:
+        """Sayaç ve ölçülerin kopyası."""
+        with self._lock: return dict(self.counters)
+
+    def write_json(self, path: str):
+        """Chrome/Perfetto trace event biçimi ("X" olayları + son sayaç değerleri)."""
+        pid = os.getpid()
+        with self._lock:
+            events, counters, origin = list(self.events), dict(self.counters), self.origin
+        names = {t.ident: t.name for t in threading.enumerate()}
+        out = [{"name": n, "ph": "X", "ts": (t0 - origin) / 1e3, "dur": (t1 - t0) / 1e3, "pid": pid, "tid": tid,
+                **({"args": a} if a else {})} for n, t0, t1, tid, a in events]
+        out += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": names.get(tid, str(tid))}}
+                for tid in {e[3] for e in events}]
+        end = max([e[2] for e in events] + [origin])
+        out += [{"name": k, "ph": "C", "ts": (end - origin) / 1e3, "pid": pid, "args": {"value": v}} for k, v in sorted(counters.items())]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": out, "displayTimeUnit": "ms", "counters": counters}, f, ensure_ascii=False)
+
+    # ---- cProfile ----
+    def start_profile(self):
+        """Çağıran iş parçacığında (arayüz) profili başlatır; arka plan işleri profile_call ile eklenir."""
+        with self._lock:
+            if self.profiling: return
+            self._profiles.clear(); self.profiling = True
+            self._main_prof = cProfile.Profile()
+        self._main_prof.enable()
+
+    def profile_call(self, fn, *args):
+        """Profil açıkken fn'yi ayrı bir Profile ile koşturur (iş parçacığı başına)."""
+        if not self.profiling: return fn(*args)
+        prof = cProfile.Profile()
+        try: prof.enable()
+        except ValueError: return fn(*args)   # 3.12+: tek profil tüm iş parçacıklarını zaten kapsar
+        try: return fn(*args)
+        finally:
+            prof.disable()
+            with self._lock: self._profiles.append(prof)
+
+    def stop_profile(self, path: Optional[str] = None, top: int = 40) -> str:
+        """Profili durdurur; path verilirse pstats dosyası yazılır. Kümülatif süreye göre ilk `top` satır döner."""
+        with self._lock:
+            if not self.profiling: return ""
+            self.profiling = False
+            profs, main = list(self._profiles), self._main_prof
+            self._profiles.clear(); self._main_prof = None
+        main.disable()
+        buf = io.StringIO()
+        stats = pstats.Stats(main, *profs, stream=buf)
+        if path: stats.dump_stats(path)
+        stats.sort_stats("cumulative").print_stats(top)
+        return buf.getvalue()
+
+TRACE = Tracer(enabled=os.environ.get("ORG_CHART_TRACE", "") not in ("", "0"))
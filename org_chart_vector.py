@@ -0,0 +1,516 @@
+# org_chart_vector.py
+# -*- coding: utf-8 -*-
+"""
+Vektör çıktı (SVG / PDF). ChartScene'in raster çizimde kullandığı komut listesini
+(item_ops) aynen çizer: yuvarlak köşeli kutular, bağlantı çizgileri ve seçilebilir
+metin. Dosya boyutu kişi sayısıyla büyür, piksel alanıyla değil.
+
+PDF'te kullanılan TrueType font (ensure_font'un bulduğu) gömülür; Türkçe karakterler
+Identity-H kodlaması ve ToUnicode eşlemesiyle aranabilir/kopyalanabilir kalır.
+Dış bağımlılık yoktur.
+"""
+
+import os, re, zlib, struct
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from org_chart_core import CANVAS_BG, ChartScene, Image, ImageDraw, ensure_font
+from org_chart_trace import TRACE
+
+BEZIER_K = 0.4477      # 1 - 0.5523: çeyrek daireyi kübik Bézier ile yaklaşık çizme katsayısı
+PDF_MAX_PAGE = 14400   # PDF okuyucularının sayfa kenarı sınırı (pt); aşılırsa /UserUnit ile ölçeklenir
+PDF_COMPRESS_LEVEL = 1 # içerik akışı zlib düzeyi; komutlar çok tekrarlı, yüksek düzey az kazandırır
+
+@lru_cache(maxsize=1)
+def _measure():
+    """Metin ölçümü için 1×1 çizim yüzeyi (Pillow core'daki vekille ilk ölçümde yüklenir)."""
+    return ImageDraw.Draw(Image.new("L", (1, 1)))
+
+@lru_cache(maxsize=32)
+def _text_metrics(font) -> Tuple[int, int]:
+    """(ascent, satır aralığı) — PIL'in sol-üst çapalı çok satırlı yerleşimiyle aynı."""
+    one = _measure().textbbox((0, 0), "A", font=font)[3]
+    return font.getmetrics()[0], _measure().multiline_textbbox((0, 0), "A\nA", font=font)[3] - one
+
+def _font_size(font) -> int:
+    return getattr(font, "size", 10)
+
+def _text_lines(op):
+    """("text", ...) komutunu (x, taban_çizgisi_y, satır, font, renk) satırlarına açar."""
+    _, (x, y), text, font, col = op
+    asc, step = _text_metrics(font)
+    return [(x, y + asc + k*step, line, font, col) for k, line in enumerate(text.split("\n")) if line]
+
+def _rrect_geom(rect, r, w, stroked):
+    """
+    PIL rounded_rectangle köşeleri kapsayıcıdır (x1,y1 dahil) ve kenar içeri çizilir.
+    Kenarlı kutuda yol w/2 içeri alınır: dolgu + kontur birlikte aynı dış sınırı verir.
+    """
+    x0, y0, x1, y1 = rect; x1 += 1; y1 += 1
+    if stroked:
+        h = w / 2; x0 += h; y0 += h; x1 -= h; y1 -= h; r = max(0, r - h)
+    return x0, y0, x1, y1, max(0, min(r, (x1-x0)/2, (y1-y0)/2))
+
+def _items(scene: ChartScene):
+    for i in range(len(scene.items)): yield from scene.item_ops(i)
+
+# ---------------- SVG ----------------
+def _escape(text: str) -> str:
+    # xml.sax.saxutils.escape ile aynı; o modül urllib/http.client/ssl'i yükler (açılışı geciktirir)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def _hex(c) -> str: return "#%02x%02x%02x" % tuple(c[:3])
+
+@TRACE.traced("export_svg")
+def export_svg(scene: ChartScene, path: str):
+    w, h = scene.width, scene.height
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}" '
+           f'font-family="DejaVu Sans, Arial, sans-serif">\n',
+           f'<rect width="{w}" height="{h}" fill="{_hex(CANVAS_BG)}"/>\n']
+    for op in _items(scene):
+        kind = op[0]
+        if kind == "rrect":
+            _, rect, r, fill, outline, lw = op
+            x0, y0, x1, y1, r = _rrect_geom(rect, r, lw, outline is not None)
+            stroke = f' stroke="{_hex(outline)}" stroke-width="{lw}"' if outline is not None else ""
+            out.append('<rect x="%g" y="%g" width="%g" height="%g" rx="%g" fill="%s"%s/>\n'
+                       % (x0, y0, x1-x0, y1-y0, r, _hex(fill) if fill is not None else "none", stroke))
+        elif kind == "text":
+            for x, y, line, font, col in _text_lines(op):
+                out.append(f'<text x="{x}" y="{y}" font-size="{_font_size(font)}" fill="{_hex(col)}">{_escape(line)}</text>\n')
+        else:
+            _, pts, col, lw = op
+            out.append('<polyline points="%s" fill="none" stroke="%s" stroke-width="%d" stroke-linecap="square"/>\n'
+                       % (" ".join(f"{x},{y}" for x, y in pts), _hex(col), lw))
+    out.append("</svg>\n")
+    with open(path, "w", encoding="utf-8") as f: f.write("".join(out))
+
+# ---------------- TrueType (PDF'e gömmek için) ----------------
+class _TrueType:
+    """Gömme için gereken TrueType bilgileri: cmap, genişlikler, metrikler."""
+    __slots__ = ("path", "data", "units", "cmap", "advances", "ascent", "descent", "bbox", "name")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f: self.data = data = f.read()
+        if data[:4] == b"ttcf" or data[:4] == b"OTTO":
+            raise ValueError(f"PDF'e gömülebilir TrueType font gerekli (.ttf): {path}")
+        n = struct.unpack_from(">H", data, 4)[0]
+        tables = {}
+        for k in range(n):
+            tag, _, off, ln = struct.unpack_from(">4sIII", data, 12 + 16*k)
+            tables[tag.decode("latin-1")] = off
+        if "glyf" not in tables: raise ValueError(f"Font glyf tablosu içermiyor: {path}")
+        head, hhea = tables["head"], tables["hhea"]
+        self.units = struct.unpack_from(">H", data, head + 18)[0]
+        self.bbox = struct.unpack_from(">4h", data, head + 36)
+        self.ascent, self.descent = struct.unpack_from(">2h", data, hhea + 4)
+        nh = struct.unpack_from(">H", data, hhea + 34)[0]
+        self.advances = struct.unpack_from(f">{2*nh}H", data, tables["hmtx"])[0::2]  # (genişlik, lsb) çiftleri
+        self.cmap = self._read_cmap(tables["cmap"])
+        self.name = re.sub(r"[^A-Za-z0-9-]", "", os.path.splitext(os.path.basename(path))[0]) or "Font"
+
+    def _read_cmap(self, base: int) -> Dict[int, int]:
+        data = self.data
+        subs = {}
+        for k in range(struct.unpack_from(">H", data, base + 2)[0]):
+            pid, eid, off = struct.unpack_from(">HHI", data, base + 4 + 8*k)
+            subs[(pid, eid)] = base + off
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            o = subs.get(key)
+            if o is None: continue
+            fmt = struct.unpack_from(">H", data, o)[0]
+            if fmt == 12: return self._cmap12(o)
+            if fmt == 4: return self._cmap4(o)
+        raise ValueError(f"Desteklenen cmap tablosu yok: {self.path}")
+
+    def _cmap4(self, o: int) -> Dict[int, int]:
+        data = self.data
+        n2 = struct.unpack_from(">H", data, o + 6)[0]; n = n2 // 2
+        ends = struct.unpack_from(f">{n}H", data, o + 14)
+        starts = struct.unpack_from(f">{n}H", data, o + 16 + n2)
+        deltas = struct.unpack_from(f">{n}H", data, o + 16 + 2*n2)
+        ro_pos = o + 16 + 3*n2
+        ros = struct.unpack_from(f">{n}H", data, ro_pos)
+        cmap = {}
+        for i in range(n):
+            s, e, d, ro = starts[i], ends[i], deltas[i], ros[i]
+            for c in range(s, min(e, 0xFFFE) + 1):
+                if ro == 0: g = (c + d) & 0xFFFF
+                else:
+                    g = struct.unpack_from(">H", data, ro_pos + 2*i + ro + 2*(c - s))[0]
+                    if g: g = (g + d) & 0xFFFF
+                if g: cmap[c] = g
+        return cmap
+
+    def _cmap12(self, o: int) -> Dict[int, int]:
+        data = self.data
+        cmap = {}
+        for k in range(struct.unpack_from(">I", data, o + 12)[0]):
+            s, e, g = struct.unpack_from(">III", data, o + 16 + 12*k)
+            for c in range(s, e + 1): cmap[c] = g + c - s
+        return cmap
+
+    def width(self, gid: int) -> int:
+        adv = self.advances
+        return round(adv[gid if gid < len(adv) else -1] * 1000 / self.units)
+
+    def pdf(self, v: int) -> int: return round(v * 1000 / self.units)
+
+@lru_cache(maxsize=4)
+def _truetype(path: str) -> _TrueType:
+    return _TrueType(path)
+
+@lru_cache(maxsize=4)
+def _font_file(path: str) -> bytes:
+    return zlib.compress(_truetype(path).data, 6)
+
+class _PdfFont:
+    """Bir sayfada kullanılan glifleri toplar; metni 2 baytlık glif id'lerine (Identity-H) çevirir."""
+    def __init__(self, tt: _TrueType, res: str):
+        self.tt, self.res = tt, res
+        self.hexmap: Dict[str, str] = {}
+        self.used: Dict[int, str] = {}    # glif id -> karakter (ToUnicode)
+
+    def encode(self, s: str) -> str:
+        hm = self.hexmap
+        try: return "".join(map(hm.__getitem__, s))
+        except KeyError:
+            for c in s:
+                if c not in hm:
+                    g = self.tt.cmap.get(ord(c), 0)
+                    hm[c] = "%04x" % g
+                    self.used.setdefault(g, c)
+            return "".join(map(hm.__getitem__, s))
+
+# ---------------- PDF ----------------
+@lru_cache(maxsize=1024)
+def _rgb(c) -> str: return "%.3f %.3f %.3f" % (c[0]/255, c[1]/255, c[2]/255)
+
+def _rr_path(x0, y0, x1, y1, r) -> str:
+    if r <= 0: return "%.2f %.2f %.2f %.2f re" % (x0, y0, x1-x0, y1-y0)
+    k = r * BEZIER_K
+    return ("%.2f %.2f m %.2f %.2f l %.2f %.2f %.2f %.2f %.2f %.2f c %.2f %.2f l %.2f %.2f %.2f %.2f %.2f %.2f c "
+            "%.2f %.2f l %.2f %.2f %.2f %.2f %.2f %.2f c %.2f %.2f l %.2f %.2f %.2f %.2f %.2f %.2f c h") % (
+        x0+r, y0, x1-r, y0, x1-k, y0, x1, y0+k, x1, y0+r,
+        x1, y1-r, x1, y1-k, x1-k, y1, x1-r, y1,
+        x0+r, y1, x0+k, y1, x0, y1-k, x0, y1-r,
+        x0, y0+r, x0, y0+k, x0+k, y0, x0+r, y0)
+
+class _PdfPage:
+    """
+    Sayfa içeriğini toplar. Aynı boyuttaki yuvarlak kutular (tüm kartlar, gölgeler)
+    bir kez Form XObject olarak tanımlanır ve konumlarına taşınarak çağrılır; renk ve
+    çizgi kalınlığı çağıranın grafik durumundan gelir.
+    """
+    def __init__(self, fonts: Dict[str, _PdfFont]):
+        self.fonts = fonts
+        self.shapes: Dict[tuple, str] = {}   # (gen, yük, yarıçap, boyama) -> XObject adı
+        self.out: List[str] = []
+
+    def op(self, op):
+        kind, out = op[0], self.out
+        if kind == "rrect":
+            _, rect, r, fill, outline, lw = op
+            x0, y0, x1, y1, r = _rrect_geom(rect, r, lw, outline is not None)
+            if outline is None: col, paint = f"{_rgb(fill)} rg", "f"
+            elif fill is None: col, paint = f"{_rgb(outline)} RG {lw} w", "S"
+            else: col, paint = f"{_rgb(fill)} rg {_rgb(outline)} RG {lw} w", "B"
+            key = (round(x1-x0, 2), round(y1-y0, 2), round(r, 2), paint)
+            name = self.shapes.get(key)
+            if name is None: name = self.shapes[key] = f"S{len(self.shapes)+1}"
+            out.append(f"{col} q 1 0 0 1 {x0:g} {y0:g} cm /{name} Do Q\n")
+        elif kind == "text":
+            for x, y, line, font, col in _text_lines(op):
+                pf = self._font(font)
+                out.append(f"BT /{pf.res} {_font_size(font)} Tf {_rgb(col)} rg 1 0 0 -1 {x} {y} Tm <{pf.encode(line)}> Tj ET\n")
+        else:
+            _, pts, col, lw = op
+            out.append(f"{_rgb(col)} RG {lw} w " + " ".join(f"{x} {y} {'l' if j else 'm'}" for j, (x, y) in enumerate(pts)) + " S\n")
+
+    def _font(self, font) -> _PdfFont:
+        fp = getattr(font, "path", None)
+        if not isinstance(fp, str): raise ValueError("Vektör PDF için TrueType font bulunamadı")
+        pf = self.fonts.get(fp)
+        if pf is None: pf = self.fonts[fp] = _PdfFont(_truetype(fp), f"F{len(self.fonts)+1}")
+        return pf
+
+    def raw_text(self, x: float, y: float, text: str, font, col) -> str:
+        """Ölçeklenmemiş sayfa koordinatında (pt, y yukarı, taban çizgisi) tek satır metin."""
+        pf = self._font(font)
+        return f"BT /{pf.res} {_font_size(font)} Tf {_rgb(col)} rg {x:.2f} {y:.2f} Td <{pf.encode(text)}> Tj ET\n"
+
+    def shape_forms(self):
+        """(ad, BBox, içerik) — sayfa kaynaklarına eklenecek Form XObject'ler."""
+        for (w, h, r, paint), name in self.shapes.items():
+            yield name, f"-1 -1 {w+1:g} {h+1:g}", f"{_rr_path(0, 0, w, h, r)} {paint}".encode("latin-1")
+
+def _region_content(scene: ChartScene, page: _PdfPage, rect, k: float, page_h: float, margin: float = 0.0,
+                    before: str = "", after=()) -> bytes:
+    """
+    Sahnenin rect bölgesini sayfaya çizer: komutlar piksel biriminde, y aşağı doğru;
+    k (pt/px) ölçeğiyle sol-üst kenar boşluğuna oturtulup bölgeye kırpılır.
+    before: ölçeklenmemiş sayfa koordinatında ham komutlar (başlık vb.),
+    after: kırpma dışında (kenar boşluğuna taşabilen) sahne komutları (sayfa referansları).
+    """
+    x0, y0, x1, y1 = rect
+    page.out = [before, f"q {k:.6g} 0 0 {-k:.6g} {margin - x0*k:.4f} {page_h - margin + y0*k:.4f} cm 2 J\n"
+                        f"q {x0} {y0} {x1-x0} {y1-y0} re W n {_rgb(CANVAS_BG)} rg {x0} {y0} {x1-x0} {y1-y0} re f\n"]
+    for i in scene.items_in(rect):
+        for op in scene.item_ops(i): page.op(op)
+    page.out.append("Q\n")
+    for op in after: page.op(op)
+    page.out.append("Q\n")
+    return "".join(page.out).encode("latin-1")
+
+def _to_unicode(used: Dict[int, str]) -> bytes:
+    items = sorted(used.items())
+    body = []
+    for k in range(0, len(items), 100):
+        chunk = items[k:k+100]
+        body.append(f"{len(chunk)} beginbfchar\n" +
+                    "".join(f"<{g:04x}> <{c.encode('utf-16-be').hex()}>\n" for g, c in chunk) + "endbfchar\n")
+    return ("/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n"
+            "1 begincodespacerange <0000> <ffff> endcodespacerange\n" + "".join(body) +
+            "endcmap CMapName currentdict /CMap defineresource pop end end\n").encode("ascii")
+
+class _PdfWriter:
+    """
+    Akışlı, asgari PDF yazıcı: her nesne üretildiği anda dosyaya yazılır, bellekte yalnız
+    ofsetler kalır. Sayfalar tek ve ortak bir kaynak sözlüğüne (fontlar + şekil XObject'leri)
+    başvurur; kullanılan glifler ancak sonda bilindiği için o sözlük close()'da yazılır.
+    """
+    def __init__(self, path: str):
+        self.path, self.f = path, open(path, "wb")
+        self.f.write(b"%PDF-1.6\n%\xe2\xe3\xcf\xd3\n")
+        self.offs: List[int] = []
+        self.fonts: Dict[str, _PdfFont] = {}
+        self.page = _PdfPage(self.fonts)
+        self.pages_ref, self.res_ref = self.reserve(), self.reserve()
+        self.page_refs: List[int] = []
+
+    def reserve(self) -> int:
+        self.offs.append(0); return len(self.offs)
+
+    def add(self, body, ref: int = 0) -> int:
+        if not ref: ref = self.reserve()
+        f = self.f; self.offs[ref-1] = f.tell()
+        f.write(f"{ref} 0 obj\n".encode("latin-1"))
+        f.write(body if isinstance(body, bytes) else body.encode("latin-1")); f.write(b"\nendobj\n")
+        return ref
+
+    def stream(self, d: str, data: bytes, compress=True, ref: int = 0) -> int:
+        if compress: data = zlib.compress(data, PDF_COMPRESS_LEVEL); d += " /Filter /FlateDecode"
+        return self.add(f"<< {d} /Length {len(data)} >>\nstream\n".encode("latin-1") + data + b"\nendstream", ref)
+
+    def add_page(self, content: bytes, w: float, h: float, unit: float = 1.0, extra: str = "", ref: int = 0) -> int:
+        cont = self.stream("", content)
+        ref = self.add(f"<< /Type /Page /Parent {self.pages_ref} 0 R /MediaBox [0 0 {w/unit:.2f} {h/unit:.2f}] "
+                       + (f"/UserUnit {unit:.4f} " if unit > 1 else "")
+                       + f"/Resources {self.res_ref} 0 R /Contents {cont} 0 R {extra}>>", ref)
+        self.page_refs.append(ref)
+        return ref
+
+    def _font(self, pf: _PdfFont) -> int:
+        tt = pf.tt
+        f_file = self.stream(f"/Length1 {len(tt.data)} /Filter /FlateDecode", _font_file(tt.path), compress=False)
+        desc = self.add(f"<< /Type /FontDescriptor /FontName /{tt.name} /Flags 32 "
+                        f"/FontBBox [{' '.join(str(tt.pdf(v)) for v in tt.bbox)}] /ItalicAngle 0 "
+                        f"/Ascent {tt.pdf(tt.ascent)} /Descent {tt.pdf(tt.descent)} /CapHeight {tt.pdf(tt.ascent)} "
+                        f"/StemV 80 /FontFile2 {f_file} 0 R >>")
+        widths = " ".join(f"{g} [{tt.width(g)}]" for g in sorted(pf.used))
+        cid = self.add(f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{tt.name} "
+                       f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                       f"/FontDescriptor {desc} 0 R /CIDToGIDMap /Identity /W [{widths}] >>")
+        tu = self.stream("", _to_unicode(pf.used))
+        return self.add(f"<< /Type /Font /Subtype /Type0 /BaseFont /{tt.name} /Encoding /Identity-H "
+                        f"/DescendantFonts [{cid} 0 R] /ToUnicode {tu} 0 R >>")
+
+    def close(self):
+        fonts = " ".join(f"/{pf.res} {self._font(pf)} 0 R" for pf in self.fonts.values())
+        forms = " ".join(f"/{name} {self.stream(f'/Type /XObject /Subtype /Form /BBox [{bbox}]', body, compress=False)} 0 R"
+                         for name, bbox, body in self.page.shape_forms())
+        self.add(f"<< /Font << {fonts} >> /XObject << {forms} >> >>", self.res_ref)
+        self.add(f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in self.page_refs)}] /Count {len(self.page_refs)} >>",
+                 self.pages_ref)
+        catalog = self.add(f"<< /Type /Catalog /Pages {self.pages_ref} 0 R >>")
+        f = self.f; xref = f.tell()
+        f.write(f"xref\n0 {len(self.offs)+1}\n0000000000 65535 f \n".encode("latin-1"))
+        f.write("".join(f"{o:010d} 00000 n \n" for o in self.offs).encode("latin-1"))
+        f.write(f"trailer\n<< /Size {len(self.offs)+1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+        f.close()
+
+    def abort(self):
+        self.f.close()
+        try: os.remove(self.path)
+        except OSError: pass
+
+@TRACE.traced("export_pdf")
+def export_pdf(scene: ChartScene, path: str):
+    """Tek sayfalık vektör PDF; sayfa kenarı PDF_MAX_PAGE'i aşarsa /UserUnit ile küçültülür."""
+    w, h = scene.width, scene.height
+    unit = max(1.0, max(w, h) / PDF_MAX_PAGE)
+    pdf = _PdfWriter(path)
+    try:
+        pdf.add_page(_region_content(scene, pdf.page, (0, 0, w, h), 1 / unit, h / unit), w, h, unit)
+        pdf.close()
+    except BaseException:
+        pdf.abort(); raise
+
+# ---------------- Çok sayfalı (A4/A3) PDF ----------------
+PAPER_SIZES = {"A4": (595.28, 841.89), "A3": (841.89, 1190.55)}   # pt, dikey
+PAGE_MARGIN = 28.35     # 10 mm
+PAGE_HEADER = 14.0      # sayfa başlığı için üst boşluk (pt)
+PT_PER_PX = 0.75        # 96 DPI ekran pikseli -> pt
+PAGE_MIN_FILL = 0.7     # kesim, sayfanın en az bu oranı dolduktan sonra aranır
+LINK_COLOR = (39, 94, 254)
+
+def _cut_candidates(total: int, spans, segs, deepest: bool):
+    """
+    Kesim adayları ve puanları (küçük = iyi). Adaylar kartsız boşlukların ortaları ve kart
+    kenarlarıdır; puan (kesilen kart sayısı, bağlantı puanı). Bağlantı puanı x'te aday
+    noktayı kesen en derin yatay çizginin y'si (kardeşlerin arası ebeveynin çizgisiyle,
+    kuzenlerin arası daha üstteki çizgiyle kesilir; küçük değer büyük alt ağaçları ayırır),
+    y'de kesilen dikey çizgi sayısıdır.
+    """
+    gaps, cur = [], 0
+    for a, b in sorted(spans):
+        if a > cur: gaps.append((cur + a) / 2)
+        cur = max(cur, b)
+    if cur < total: gaps.append((cur + total) / 2)
+    pts = sorted(set(gaps) | {b for _, b in spans if b < total})
+    starts, ends = sorted(a for a, _ in spans), sorted(b for _, b in spans)
+    cut = [bisect_left(starts, p) - bisect_right(ends, p) for p in pts]
+    link = [-1.0] * len(pts)
+    if deepest:
+        for a, b, y in segs:
+            for i in range(bisect_left(pts, a), bisect_right(pts, b)):
+                if y > link[i]: link[i] = y
+    else:
+        diff = [0] * (len(pts) + 1)
+        for a, b, _ in segs:
+            i, j = bisect_left(pts, a), bisect_right(pts, b)
+            if i < j: diff[i] += 1; diff[j] -= 1
+        run = 0
+        for i in range(len(pts)): run += diff[i]; link[i] = run
+    return pts, list(zip(cut, link))
+
+def _cuts(total: int, size: float, pts, scores) -> List[float]:
+    """
+    Sayfa sınırları: her sayfada, doluluk PAGE_MIN_FILL'i geçtikten sonraki adaylardan
+    puanı en düşük olan seçilir (eşitlikte en sağdaki/alttaki); aday yoksa sayfa kenarı.
+    """
+    cuts, start, lo = [0.0], 0.0, 0
+    while total - start > size:
+        best = None
+        lo = bisect_left(pts, start + size*PAGE_MIN_FILL, lo)
+        for k in range(lo, bisect_right(pts, start + size)):
+            if best is None or scores[k] <= best[0]: best = (scores[k], pts[k])
+        start = best[1] if best else start + size
+        cuts.append(start)
+    cuts.append(float(total))
+    return cuts
+
+def _clip_point(pts, rect, reverse=False):
+    """Çoklu çizginin rect'ten çıktığı (reverse: rect'e girdiği) nokta ve kenar ('l','r','t','b')."""
+    x0, y0, x1, y1 = rect
+    pts = pts[::-1] if reverse else pts
+    for (ax, ay), (bx, by) in zip(pts, pts[1:]):
+        if x0 <= bx <= x1 and y0 <= by <= y1: continue
+        if bx > x1: return (x1, ay), "r"
+        if bx < x0: return (x0, ay), "l"
+        if by > y1: return (ax, y1), "b"
+        return (ax, y0), "t"
+    return None, None
+
+@TRACE.traced("export_pdf_pages")
+def export_pdf_pages(scene: ChartScene, path: str, paper: str = "A4", landscape: bool = True, progress=None) -> int:
+    """
+    Şemayı A4/A3 sayfalara böler. Kesimler kartların arasına, mümkünse alt ağaçların
+    arasına düşer; boş sayfalar atlanır. Sayfa dışına taşan bağlantıların ucuna hedef
+    sayfa numarası (tıklanabilir bağlantı) yazılır. Her sayfa ayrı çizilip dosyaya
+    akıtılır; progress(oran) her sayfadan sonra çağrılır. Sayfa sayısını döner.
+    """
+    pw, ph = PAPER_SIZES[paper]
+    if landscape: pw, ph = ph, pw
+    k = PT_PER_PX
+    size_x, size_y = (pw - 2*PAGE_MARGIN) / k, (ph - 2*PAGE_MARGIN - PAGE_HEADER) / k
+    W, H = scene.width, scene.height
+
+    # kart aralıkları (gölge payıyla) ve bağlantı parçaları; önce satır kesimleri,
+    # sonra her sayfa satırı için o satırdaki kartlara göre sütun kesimleri
+    boxes = list(scene.bboxes.values())
+    if scene.legend_rect: boxes.append(scene.legend_rect)
+    boxes = [(x0-4, y0-4, x1+6, y1+6) for x0, y0, x1, y1 in boxes]
+    edges = [ref for kind, ref in scene.items if kind == "edge"]
+    hsegs = [(min(a[0], b[0]), max(a[0], b[0]), a[1]) for pts in edges for a, b in zip(pts, pts[1:]) if a[1] == b[1]]
+    vsegs = [(min(a[1], b[1]), max(a[1], b[1]), a[0]) for pts in edges for a, b in zip(pts, pts[1:]) if a[0] == b[0]]
+    cuts_y = _cuts(H, size_y, *_cut_candidates(H, [(b[1], b[3]) for b in boxes], vsegs, False))
+    row_cuts = []
+    for ya, yb in zip(cuts_y, cuts_y[1:]):
+        spans = [(b[0], b[2]) for b in boxes if b[1] < yb and b[3] > ya]
+        segs = [sg for sg in hsegs if ya <= sg[2] < yb]
+        row_cuts.append(_cuts(W, size_x, *_cut_candidates(W, spans, segs, True)))
+
+    # kart (ya da legend) içeren sayfalar satır satır numaralanır; yalnız çizgi geçen sayfalar atlanır
+    cells = [(r, c) for r, cx in enumerate(row_cuts) for c in range(len(cx) - 1)]
+    rect_of = {(r, c): (row_cuts[r][c], cuts_y[r], row_cuts[r][c+1], cuts_y[r+1]) for r, c in cells}
+    def has_card(rect):
+        # öğe dikdörtgenleri gölge payını içerir; komşu sayfaya taşan gölge sayfayı numaralatmasın
+        x0, y0, x1, y1 = rect
+        for i in scene.items_in(rect):
+            kind, ref = scene.items[i]
+            if kind == "edge": continue
+            bx0, by0, bx1, by1 = scene.bboxes[ref] if kind == "box" else scene.legend_rect
+            if bx0 < x1 and bx1 > x0 and by0 < y1 and by1 > y0: return True
+        return False
+    numbered = [rc for rc in cells if has_card(rect_of[rc])]
+    number = {rc: n for n, rc in enumerate(numbered, 1)}
+    def page_of(x, y):
+        r = min(max(bisect_right(cuts_y, y) - 1, 0), len(cuts_y) - 2); cx = row_cuts[r]
+        return r, min(max(bisect_right(cx, x) - 1, 0), len(cx) - 2)
+
+    # sayfa dışına çıkan bağlantılar: yöneticinin sayfasında "→ s.N", astın sayfasında "↑ s.M"
+    refs: Dict[Tuple[int,int], Dict[tuple, int]] = {}
+    for pts in edges:
+        src, dst = page_of(*pts[0]), page_of(*pts[-1])
+        if src == dst or src not in number or dst not in number: continue
+        for page, target, rev, arrow in ((src, dst, False, "→"), (dst, src, True, "↑")):
+            pt, side = _clip_point(pts, rect_of[page], rev)
+            if pt: refs.setdefault(page, {})[(round(pt[0]), round(pt[1]), side, arrow)] = number[target]
+
+    font = ensure_font(max(10, int(12*scene.scale)))
+    lh = _text_metrics(font)[1]
+    body_h = ph - PAGE_HEADER          # bölge bu yüksekliğin üst kenar boşluğundan başlar
+    pdf = _PdfWriter(path)
+    try:
+        page_refs = {rc: pdf.reserve() for rc in numbered}
+        for n, rc in enumerate(numbered, 1):
+            rect = rect_of[rc]
+            labels, annots = [], []
+            for (x, y, side, arrow), target in sorted(refs.get(rc, {}).items()):
+                text = f"{arrow} s.{target}"
+                tw = _measure().textlength(text, font=font)
+                # yatay çıkış: satır arasında, çizginin üstünde; dikey çıkış: kenar boşluğunda
+                tx = x - tw - 4 if side == "r" else x + 4
+                ty = y + 2 if side == "b" else y - lh - 2
+                labels.append(("text", (int(tx), int(ty)), text, font, LINK_COLOR))
+                # bağlantı alanı sayfa koordinatında (pt, y yukarı)
+                ax0, ay1 = PAGE_MARGIN + (tx - rect[0])*k, body_h - PAGE_MARGIN - (ty - rect[1])*k
+                annots.append(pdf.add(f"<< /Type /Annot /Subtype /Link /Border [0 0 0] "
+                                      f"/Rect [{ax0:.2f} {ay1 - lh*k:.2f} {ax0 + tw*k:.2f} {ay1:.2f}] "
+                                      f"/Dest [{page_refs[numbered[target-1]]} 0 R /Fit] >>"))
+            head = pdf.page.raw_text(PAGE_MARGIN, ph - PAGE_MARGIN - 9,
+                                     f"Sayfa {n}/{len(numbered)}  ·  satır {rc[0]+1}, sütun {rc[1]+1}",
+                                     ensure_font(9), (120, 128, 140))
+            content = _region_content(scene, pdf.page, rect, k, body_h, PAGE_MARGIN, head, labels)
+            pdf.add_page(content, pw, ph, extra=f"/Annots [{' '.join(f'{a} 0 R' for a in annots)}] " if annots else "",
+                         ref=page_refs[rc])
+            if progress: progress(n / len(numbered))
+        pdf.close()
+    except BaseException:
+        pdf.abort(); raise
+    return len(numbered)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Disk önbelleği: tablo/yerleşim gidiş-dönüşü ve boyut sınırlı temizlik."""
+
+import os, sys, json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import org_chart_cache
+from org_chart_cache import DiskCache, load_table_cached
+from org_chart_core import REQ_COLS, build_people, build_tree, chart_roots, layout_forest
+
+def _write_csv(path, n, tag=""):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(REQ_COLS) + "\n")
+        for i in range(n):
+            f.write(f"u{i},Kişi {i}{tag},D{i % 3},T{i % 5},{f'u{(i - 1) // 4}' if i else ''},u{i}@f.com\n")
+
+def test_table_and_layout_round_trip(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "p.csv"); _write_csv(path, 50)
+    table, entry = load_table_cached(path, cache)
+    model = build_tree(build_people(table))
+    layouts = layout_forest(model, chart_roots(model, None))
+    entry.put_layouts(("Tümü", None, False), layouts)
+
+    def no_parse(p): raise AssertionError("önbellekteki tablo yeniden ayrıştırıldı")
+    monkeypatch.setattr(org_chart_cache, "load_table", no_parse)
+    again, entry2 = load_table_cached(path, cache)
+    assert entry2.key == entry.key
+    assert all(list(again[c]) == list(table[c]) for c in REQ_COLS)
+    assert entry2.layouts(("Tümü", None, False)) == layouts
+    assert entry2.layouts(("Tümü", None, True)) is None
+
+def test_changed_file_gets_new_key(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "p.csv"); _write_csv(path, 20)
+    _, a = load_table_cached(path, cache)
+    _write_csv(path, 21)
+    table, b = load_table_cached(path, cache)
+    assert a.key != b.key and len(table) == 21
+
+def test_evict_keeps_limit_and_prunes_index(tmp_path):
+    root = str(tmp_path / "cache")
+    cache = DiskCache(root, max_bytes=10**9)
+    entries = []
+    for k in range(6):
+        path = str(tmp_path / f"f{k}.csv"); _write_csv(path, 300, tag=f"-{k}")
+        entries.append(load_table_cached(path, cache)[1])
+        os.utime(entries[-1].dir, (1000 + k, 1000 + k))   # kullanım sırası: f0 en eski
+    size = sum(os.path.getsize(os.path.join(entries[0].dir, f)) for f in os.listdir(entries[0].dir))
+    cache.max_bytes = int(size * 3.5)   # korunan kayıt da sınıra sayılır
+    cache.evict(keep=entries[0].key)   # en eskisi olsa da korunur
+    dirs = {n for n in os.listdir(root) if os.path.isdir(os.path.join(root, n))}
+    assert dirs == {entries[0].key, entries[4].key, entries[5].key}
+    with open(os.path.join(root, "index.json"), encoding="utf-8") as f: index = json.load(f)
+    assert {v[2] for v in index.values()} == dirs
+
+def test_layout_writes_do_not_scan(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=1)
+    path = str(tmp_path / "p.csv"); _write_csv(path, 30)
+    table, entry = load_table_cached(path, cache)
+    model = build_tree(build_people(table))
+    layouts = layout_forest(model, chart_roots(model, None))
+    monkeypatch.setattr(DiskCache, "evict", lambda self, keep=None: (_ for _ in ()).throw(AssertionError("yazımda tarama")))
+    for compact in (False, True): entry.put_layouts(("Tümü", None, compact), layouts)
+    assert entry.layouts(("Tümü", None, True)) == layouts
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Arama dizini: Türkçe küçük harf, kelime öneki, kelime ortası ve accept/limit."""
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from org_chart_core import REQ_COLS, SearchIndex, Table, build_people, build_tree, fold_tr
+
+PEOPLE = [   # kullanıcı, ad soyad, departman, pozisyon, üst kademe, mail
+    ("ismail.isik", "İsmail Işık", "Satış", "Satış Müdürü", None, "ismail@f.com"),
+    ("ahmet.k", "Ahmet Kaya", "Satış", "Uzman", "ismail.isik", "ahmet@f.com"),
+    ("irmak.i", "Irmak İnce", "İK", "İK Uzmanı", "ismail.isik", "irmak@f.com"),
+    ("mehmet.a", "Mehmet Ahmetoğlu", "Satış", "Uzman", "ahmet.k", "mehmet@f.com"),
+]
+
+def _index():
+    table = Table({c: list(col) for c, col in zip(REQ_COLS, zip(*PEOPLE))})
+    model = build_tree(build_people(table))
+    return model, SearchIndex(model)
+
+def _users(model, ids): return {model.users[i] for i in ids}
+
+def test_fold_tr():
+    assert fold_tr("İSMAİL IŞIK") == "ismail ışık"
+    assert fold_tr("Irmak") == "ırmak"
+
+def test_turkish_case_insensitive():
+    model, idx = _index()
+    for q in ("ismail", "İSMAİL", "ışık", "IŞIK", "Işı"):
+        assert _users(model, idx.search(q)) == {"ismail.isik"}, q
+    assert _users(model, idx.search("ırmak")) == {"irmak.i"}
+    assert _users(model, idx.search("İNCE")) == {"irmak.i"}
+    assert idx.search("INCE") == [] and idx.search("ınce") == []   # Türkçede I küçüğü ı; ı ile i ayrı harf
+
+def test_prefix_words_intersect():
+    model, idx = _index()
+    assert _users(model, idx.search("ahm")) == {"ahmet.k", "mehmet.a"}   # "ahmetoğlu" da önekle eşleşir
+    assert _users(model, idx.search("uzman meh")) == {"mehmet.a"}
+    assert _users(model, idx.search("meh uzman")) == {"mehmet.a"}
+    assert _users(model, idx.search("satış")) == {"ismail.isik"}   # pozisyondan; departman dizinde değil
+    assert _users(model, idx.search("uzman ik")) == {"irmak.i"}
+    assert idx.search("zeynep") == []
+
+def test_mid_word_fallback():
+    model, idx = _index()
+    assert _users(model, idx.search("toğlu")) == {"mehmet.a"}   # hiçbir kelime böyle başlamaz
+
+def test_accept_and_limit():
+    model, idx = _index()
+    hide = model.index["ahmet.k"]
+    assert _users(model, idx.search("uzman", accept=lambda i: i != hide)) == {"mehmet.a", "irmak.i"}
+    assert len(idx.search("f", limit=2)) == 2
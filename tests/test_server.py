@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Sunucu denetimi: karo düzeyi sınırları (HTTP'siz, ChartService.handle ile)."""
+
+import os, sys, csv, json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from org_chart_server import ChartService
+
+def _write_chart(path, n=40):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Kullanıcı Adı", "Ad Soyad", "Departman", "Pozisyon", "Üst Kademe", "Mail"])
+        for i in range(n):
+            w.writerow([f"u{i}", f"Kişi {i}", f"D{i % 3}", f"T{i % 4}", f"u{(i - 1) // 3}" if i else "", f"u{i}@f.com"])
+
+def test_tile_zoom_bounds(tmp_path):
+    path = str(tmp_path / "chart.csv"); _write_chart(path)
+    svc = ChartService(path, jobs=1, use_cache=False)
+    try:
+        status, _, body, _ = svc.handle("/api/chart")
+        assert status == 200
+        zmax = json.loads(body)["zmax"]
+        for z in (-1, 0, zmax):
+            assert svc.handle(f"/tiles/{z}/0/0.png")[0] == 200, z
+        for z in (-2, zmax + 1, 99999):
+            assert svc.handle(f"/tiles/{z}/0/0.png")[0] == 404, z
+    finally:
+        svc.close()
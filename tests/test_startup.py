@@ -0,0 +1,35 @@
+# tests/test_startup.py
+# -*- coding: utf-8 -*-
+"""
+Açılış denetimi: org_chart_app yeni bir süreçte içe aktarılır (ekran varsa ilk pencere
+de çizilir); o ana dek ağır ya da gereksiz modüller yüklenmemiş olmalı. Süre ölçümü
+için: python bench_org_chart.py --startup
+"""
+
+import os, sys, json, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# pencere görünmeden yüklenmemeli: Excel/çizim kütüphaneleri, DnD, ağ (urllib/http.client ssl'i de yükler)
+STARTUP_FORBIDDEN = ("pandas", "numpy", "openpyxl", "PIL", "tkinterdnd2", "urllib", "http.client")
+
+_PROBE = r"""
+import sys, json
+import org_chart_app
+try:
+    app = org_chart_app.OrgChartApp(); app.update()
+except Exception:
+    app = None   # ekran yok: yalnız içe aktarma denetlenir
+mods = sorted(sys.modules)
+if app is not None: app.destroy()
+print(json.dumps(mods))
+"""
+
+def _startup_modules():
+    proc = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def test_no_heavy_imports_before_window():
+    mods = _startup_modules()
+    early = [m for m in STARTUP_FORBIDDEN if any(x == m or x.startswith(m + ".") for x in mods)]
+    assert not early, f"pencereden önce yüklendi: {', '.join(early)}"
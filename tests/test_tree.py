@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Ağaç kurulumu: döngü kırma, tablo farkı ve katlanabilir yerleşimin yeniden kurulması."""
+
+import os, sys, random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from org_chart_core import (
+    REQ_COLS, FoldableLayout, Table, build_people, build_tree, chart_roots, collapse_below, diff_models,
+)
+
+def _model(rows):
+    """rows: (kullanıcı, üst kademe[, ad]) -> kurulmuş OrgModel."""
+    full = [(r[0], r[2] if len(r) > 2 else r[0].upper(), "D", "T", r[1], "") for r in rows]
+    return build_tree(build_people(Table({c: list(col) for c, col in zip(REQ_COLS, zip(*full))})))
+
+def _reaches_root(model):
+    """Her kişiden yukarı yürüyüş bir köke varır (döngü kalmadı); yürünen yollar işaretlenir."""
+    ok = [False] * len(model)
+    for i in range(len(model)):
+        path, u = [], i
+        while u >= 0 and not ok[u]:
+            if len(path) > len(model): return False
+            path.append(u); u = model.parent[u]
+        for v in path: ok[v] = True
+    return True
+
+def test_break_cycles_report():
+    m = _model([("c", "a"), ("a", "b"), ("b", "c"), ("x", "b"), ("s", "s"), ("d", "yok"), ("k", None)])
+    r = m.report
+    assert r.cycles == [["a", "b", "c"]]   # en küçük kullanıcı adı kırılır, yönetici yönünde
+    assert r.self_managers == ["s"] and r.dangling == [("d", "yok")]
+    assert {m.users[i] for i in m.roots} == {"a", "s", "d", "k"}
+    assert m.users[m.parent[m.index["x"]]] == "b"   # döngüye bağlı kuyruk yerinde kalır
+    assert _reaches_root(m)
+
+def test_break_cycles_long_ring():
+    n = 50_000   # özyinelemesiz: uzun halka da tek geçişte kırılır
+    m = _model([(f"u{i:05d}", f"u{(i + 1) % n:05d}") for i in range(n)])
+    assert len(m.report.cycles) == 1 and len(m.report.cycles[0]) == n
+    assert [m.users[i] for i in m.roots] == ["u00000"]
+    assert _reaches_root(m)
+
+def _random_rows(rnd, n):
+    rows = [("p0000", None)]
+    for i in range(1, n): rows.append((f"p{i:04d}", f"p{rnd.randrange(max(0, i - 40), i):04d}"))
+    return rows
+
+def _edit(rnd, rows):
+    """Eklenen, çıkarılan (çocukları üst yöneticiye), taşınan ve adı değişen kişiler."""
+    mgr = {u: (m, u.upper()) for u, m, *_ in rows}
+    for u in rnd.sample(sorted(mgr)[1:], 5):
+        up = mgr.pop(u)[0]
+        for v, (m, name) in mgr.items():
+            if m == u: mgr[v] = (up, name)
+    users = sorted(mgr)
+    for u in rnd.sample(users[1:], 5):
+        m = rnd.choice(users[:users.index(u)]); mgr[u] = (m, mgr[u][1])
+    for u in rnd.sample(users, 5): mgr[u] = (mgr[u][0], "Yeni " + u)
+    for k in range(5): mgr[f"q{k}"] = (rnd.choice(users), f"Q{k}")
+    return [(u, m, name) for u, (m, name) in mgr.items()]
+
+def test_diff_models():
+    old = _model([("a", None), ("b", "a"), ("c", "a"), ("d", "b")])
+    new = _model([("a", None), ("b", "a", "Bee"), ("d", "a"), ("e", "d")])
+    diff = diff_models(old, new)
+    assert (diff.added, diff.removed, diff.moved, diff.edited) == (["e"], ["c"], ["d"], ["b"])
+    assert diff and not diff_models(old, old)
+
+def test_rebase_matches_fresh_layout():
+    rnd = random.Random(3)
+    for compact in (False, True):
+        rows = _random_rows(rnd, 400)
+        old = _model(rows)
+        fold = FoldableLayout(old, chart_roots(old, None), compact, collapse_below(old, old.roots, 3))
+        fold.toggle(next(iter(sorted(fold.collapsed))))
+        new = _model(_edit(rnd, rows))
+        roots = chart_roots(new, None)
+        carried = {new.index[old.users[u]] for u in fold.collapsed
+                   if old.users[u] in new.index and new.has_kids(new.index[old.users[u]])}
+        fresh = FoldableLayout(new, roots, compact, carried).layouts()
+        for diff in (None, diff_models(old, new)):
+            got = fold.rebase(new, roots, diff)
+            assert got.collapsed == carried
+            assert got.layouts() == fresh
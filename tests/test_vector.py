@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Sayfalı PDF: numaralanan her sayfada kart var, her kart bir sayfada."""
+
+import os, sys, random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import org_chart_vector
+from org_chart_core import REQ_COLS, ChartScene, Table, build_people, build_tree
+from org_chart_vector import export_pdf_pages
+
+def _scene(n, scale, seed=1):
+    rnd = random.Random(seed)
+    rows = [(f"u{i}", f"Kişi {i}", f"D{i % 4}", f"T{i % 6}", f"u{rnd.randrange(max(0, i - 8), i)}" if i else None, "")
+            for i in range(n)]
+    model = build_tree(build_people(Table({c: list(col) for c, col in zip(REQ_COLS, zip(*rows))})))
+    return ChartScene(model, None, scale, {"T1": (200, 30, 30)}, True, True, None, "bg")
+
+def _overlaps(a, b): return a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]
+
+def test_pages_hold_cards(tmp_path, monkeypatch):
+    region = org_chart_vector._region_content
+    for n, scale, paper, landscape in ((60, 1.7, "A4", False), (300, 1.0, "A3", False), (300, 1.7, "A4", True)):
+        scene, rects = _scene(n, scale), []
+        monkeypatch.setattr(org_chart_vector, "_region_content",
+                            lambda sc, page, rect, *a: (rects.append(rect), region(sc, page, rect, *a))[1])
+        pages = export_pdf_pages(scene, str(tmp_path / "s.pdf"), paper, landscape)
+        cards = list(scene.bboxes.values()) + ([scene.legend_rect] if scene.legend_rect else [])
+        assert pages == len(rects)
+        # gölge payı komşu sayfaya taşsa da o sayfa numaralanmaz
+        assert all(any(_overlaps(r, c) for c in cards) for r in rects), (n, scale, paper)
+        assert all(any(_overlaps(r, c) for r in rects) for c in cards), (n, scale, paper)